@@ -0,0 +1,492 @@
+from collections import deque
+from itertools import count
+from logging import getLogger
+import threading
+from time import monotonic, sleep
+
+import numpy as np
+import sounddevice as sd
+
+logger = getLogger("main")
+
+BLOCKSIZE = 1024
+RING_SECONDS = 2.0
+
+
+class AudioRingBuffer:
+    """Single-producer / single-consumer ring of float32 mono frames.
+
+    The producer only advances ``write_pos`` and the consumer only advances
+    ``read_pos``, so the audio callback never has to take a lock.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._buffer = np.zeros(self.capacity, dtype=np.float32)
+        self.write_pos = 0
+        self.read_pos = 0
+
+    def available_read(self) -> int:
+        return self.write_pos - self.read_pos
+
+    def available_write(self) -> int:
+        return self.capacity - self.available_read()
+
+    def write(self, frames: np.ndarray) -> int:
+        frames_count = min(len(frames), self.available_write())
+        if frames_count <= 0:
+            return 0
+
+        start = self.write_pos % self.capacity
+        first = min(frames_count, self.capacity - start)
+        self._buffer[start : start + first] = frames[:first]
+        if frames_count > first:
+            self._buffer[: frames_count - first] = frames[first:frames_count]
+        self.write_pos += frames_count
+        return frames_count
+
+    def write_silence(self, frames_count: int) -> int:
+        frames_count = min(int(frames_count), self.available_write())
+        if frames_count <= 0:
+            return 0
+
+        start = self.write_pos % self.capacity
+        first = min(frames_count, self.capacity - start)
+        self._buffer[start : start + first] = 0.0
+        if frames_count > first:
+            self._buffer[: frames_count - first] = 0.0
+        self.write_pos += frames_count
+        return frames_count
+
+    def read_into(self, out: np.ndarray) -> int:
+        frames_count = min(len(out), self.available_read())
+        if frames_count > 0:
+            start = self.read_pos % self.capacity
+            first = min(frames_count, self.capacity - start)
+            out[:first] = self._buffer[start : start + first]
+            if frames_count > first:
+                out[first:frames_count] = self._buffer[: frames_count - first]
+            self.read_pos += frames_count
+        out[frames_count:] = 0.0
+        return frames_count
+
+    def drop_until(self, position: int):
+        """Consumer side: discard frames written before ``position``"""
+        if self.read_pos < position:
+            self.read_pos = position
+
+
+class _ClipMarker:
+    """A clip's span on the timeline; without a clip id, only an end point"""
+
+    __slots__ = (
+        "clip_id",
+        "start",
+        "end",
+        "dequeued_at",
+        "backlog",
+        "started",
+        "on_start",
+        "on_end",
+    )
+
+    def __init__(
+        self,
+        clip_id,
+        start,
+        end,
+        dequeued_at=None,
+        backlog=0.0,
+        on_start=None,
+        on_end=None,
+    ):
+        self.clip_id = clip_id
+        self.start = start
+        self.end = end
+        self.dequeued_at = dequeued_at
+        self.backlog = backlog
+        self.started = False
+        self.on_start = on_start
+        self.on_end = on_end
+
+
+class HeadlessOutputStream:
+    """Stand-in for ``sounddevice.OutputStream`` that plays into nothing.
+
+    A thread pulls blocks from the callback either at the real-time pace of
+    the sample rate or, with ``realtime=False``, as fast as they come, so
+    benchmarks can drive the player without an audio device.
+    """
+
+    def __init__(
+        self,
+        samplerate,
+        channels=1,
+        dtype="float32",
+        blocksize=BLOCKSIZE,
+        callback=None,
+        realtime=True,
+        **kwargs,
+    ):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.dtype = dtype
+        self.blocksize = blocksize
+        self.callback = callback
+        self.realtime = realtime
+        self.frames_played = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and not self._stop_event.is_set()
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="headless_output_stream"
+        )
+        self._thread.start()
+
+    def abort(self):
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    stop = abort
+
+    def close(self):
+        self.abort()
+
+    def _run(self):
+        outdata = np.zeros((self.blocksize, self.channels), dtype=self.dtype)
+        block_seconds = self.blocksize / self.samplerate
+        next_block_at = monotonic()
+        while not self._stop_event.is_set():
+            self.callback(outdata, self.blocksize, None, None)
+            self.frames_played += self.blocksize
+            if self.realtime:
+                next_block_at += block_seconds
+                delay = next_block_at - monotonic()
+                if delay > 0:
+                    self._stop_event.wait(delay)
+                else:
+                    # Fell behind, e.g. the process was suspended; do not burst
+                    next_block_at = monotonic()
+            elif not outdata.any():
+                # Nothing buffered; idle briefly instead of spinning
+                sleep(0.001)
+
+
+class AudioPlayer:
+    """Long-lived output stream fed from a ring buffer.
+
+    The PortAudio callback takes no locks and runs no hooks: clip start and
+    end events are queued and delivered by the "audio_events" thread.
+    """
+
+    def __init__(
+        self,
+        samplerate: int,
+        on_clip_start=None,
+        on_clip_end=None,
+        on_error=None,
+        blocksize: int = BLOCKSIZE,
+        ring_seconds: float = RING_SECONDS,
+        stream_factory=None,
+    ):
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        # sounddevice.OutputStream unless a headless sink is plugged in
+        self.stream_factory = stream_factory
+        self.on_clip_start = on_clip_start
+        self.on_clip_end = on_clip_end
+        self.on_error = on_error
+
+        self.ring = AudioRingBuffer(int(samplerate * ring_seconds))
+        self.is_paused = False
+
+        self._stream = None
+        self._stream_lock = threading.Lock()
+        self._markers: deque[_ClipMarker] = deque()
+        self._clip_ids = count(1)
+        self.last_clip_id = 0
+        self.last_finished_clip_id = 0
+        self._space_available = threading.Event()
+        self._producer_waiting = False
+        # Producers and clear() only; the callback never takes it
+        self._write_lock = threading.Lock()
+        self._generation = 0
+        # write_pos at the last clear(), and how far the callback has dropped
+        self._clear_until = 0
+        self._cleared_until = 0
+        self._is_stopping = False
+
+        self._events: deque[tuple] = deque()
+        self._events_ready = threading.Event()
+        self._dispatcher_waiting = False
+        self._dispatcher = None
+
+        self._stats_lock = threading.Lock()
+        self.clips_started = 0
+        self.last_start_latency_ms = 0.0
+        self.total_start_latency_ms = 0.0
+        self.max_start_latency_ms = 0.0
+
+    # == Producer side ==
+
+    def write_clip(
+        self, audio: np.ndarray, dequeued_at: float | None = None, on_start=None
+    ):
+        """Append a clip to the timeline, blocking while the ring buffer is full.
+
+        ``on_start(started_at)`` is called from the event thread once the
+        clip's first frame has been played. Returns False if the clip was cut
+        short by clear() or close().
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32).reshape(-1)
+        if audio.size == 0:
+            return True
+
+        self._ensure_stream()
+        if dequeued_at is None:
+            dequeued_at = monotonic()
+
+        with self._write_lock:
+            generation = self._generation
+            self.last_clip_id = next(self._clip_ids)
+        marker = _ClipMarker(
+            clip_id=self.last_clip_id,
+            start=0,
+            end=0,
+            dequeued_at=dequeued_at,
+            on_start=on_start,
+        )
+        return self._write_frames(audio, generation, marker)
+
+    def mark_end(self, on_end):
+        """Call ``on_end(completed)`` once everything written so far has been
+        played, or ``on_end(False)`` if clear() drops it first"""
+        with self._write_lock:
+            position = self.ring.write_pos
+            self._markers.append(_ClipMarker(None, position, position, on_end=on_end))
+
+    def write_silence(self, seconds: float):
+        """Insert a gap on the audio timeline instead of sleeping"""
+        frames_count = int(max(0.0, seconds) * self.samplerate)
+        generation = self._generation
+        while frames_count > 0:
+            with self._write_lock:
+                if not self._can_write(generation):
+                    break
+                written = self.ring.write_silence(frames_count)
+            frames_count -= written
+            if written == 0:
+                self._wait_for_space()
+        return frames_count == 0
+
+    def buffered_seconds(self) -> float:
+        ring = self.ring
+        played = max(ring.read_pos, self._clear_until)
+        return max(0, ring.write_pos - played) / self.samplerate
+
+    def _write_frames(
+        self, audio: np.ndarray, generation: int, marker: _ClipMarker | None
+    ) -> bool:
+        offset = 0
+        while offset < audio.size:
+            # A clear() between the check and the write would let stale
+            # frames past the position it recorded
+            with self._write_lock:
+                if not self._can_write(generation):
+                    break
+                if marker is not None and self.ring.available_write() > 0:
+                    # Queued together with its first frames, so a clear() can
+                    # never leave behind a marker for a clip that was not written
+                    marker.start = self.ring.write_pos
+                    marker.end = marker.start + audio.size
+                    marker.backlog = self.buffered_seconds()
+                    self._markers.append(marker)
+                    marker = None
+                written = 0 if marker is not None else self.ring.write(audio[offset:])
+            offset += written
+            if written == 0:
+                self._wait_for_space()
+        return offset >= audio.size
+
+    def _can_write(self, generation: int) -> bool:
+        return not self._is_stopping and generation == self._generation
+
+    def _wait_for_space(self):
+        self._space_available.clear()
+        self._producer_waiting = True
+        is_woken = True
+        if self.ring.available_write() == 0:
+            is_woken = self._space_available.wait(timeout=0.5)
+        self._producer_waiting = False
+        # A stream that stopped mid-clip would leave the producer waiting forever
+        if not is_woken and not self._is_stopping and not self._is_stream_active():
+            self._ensure_stream()
+
+    def _is_stream_active(self) -> bool:
+        stream = self._stream
+        return stream is not None and stream.active
+
+    # == Control ==
+
+    def set_paused(self, value: bool):
+        self.is_paused = value
+
+    def clear(self):
+        """Drop everything queued on the timeline, including the current clip.
+
+        Only what was written before the call is dropped, so a clip written
+        right after it plays even if the callback has not caught up yet.
+        """
+        with self._write_lock:
+            self._generation += 1
+            self._clear_until = self.ring.write_pos
+        self._space_available.set()
+
+    def close(self):
+        self._is_stopping = True
+        self._space_available.set()
+        with self._stream_lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                stream.abort()
+                stream.close()
+            except Exception as e:
+                logger.error("Failed to close audio stream. %s", str(e))
+        self._events_ready.set()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            clips = max(1, self.clips_started)
+            return {
+                "clips": self.clips_started,
+                "last_start_latency_ms": self.last_start_latency_ms,
+                "avg_start_latency_ms": self.total_start_latency_ms / clips,
+                "max_start_latency_ms": self.max_start_latency_ms,
+                "buffered_seconds": self.buffered_seconds(),
+                "block_ms": self.blocksize / self.samplerate * 1000,
+            }
+
+    def _ensure_stream(self):
+        with self._stream_lock:
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch_events, daemon=True, name="audio_events"
+                )
+                self._dispatcher.start()
+            if self._stream is not None and self._stream.active:
+                return
+            if self._stream is not None:
+                try:
+                    self._stream.close()
+                except Exception:
+                    pass
+                self._stream = None
+
+            stream = (self.stream_factory or sd.OutputStream)(
+                samplerate=self.samplerate,
+                channels=1,
+                dtype="float32",
+                blocksize=self.blocksize,
+                latency="low",
+                callback=self._callback,
+            )
+            stream.start()
+            self._stream = stream
+
+    # == Event thread ==
+
+    def _dispatch_events(self):
+        while True:
+            while self._events:
+                handler, args = self._events.popleft()
+                try:
+                    handler(*args)
+                except Exception as e:
+                    logger.exception(e)
+            if self._is_stopping:
+                return
+            self._events_ready.clear()
+            self._dispatcher_waiting = True
+            # Re-checked after raising the flag, so a queued event is not missed
+            if not self._events:
+                self._events_ready.wait(timeout=0.5)
+            self._dispatcher_waiting = False
+
+    def _on_marker_started(self, marker: _ClipMarker, started_at: float):
+        latency_ms = max(0.0, started_at - marker.dequeued_at - marker.backlog) * 1000
+        with self._stats_lock:
+            self.clips_started += 1
+            self.last_start_latency_ms = latency_ms
+            self.total_start_latency_ms += latency_ms
+            self.max_start_latency_ms = max(self.max_start_latency_ms, latency_ms)
+        if marker.on_start is not None:
+            marker.on_start(started_at)
+        if self.on_clip_start is not None:
+            self.on_clip_start(marker.clip_id)
+
+    def _on_marker_ended(self, marker: _ClipMarker, completed: bool):
+        if marker.clip_id is not None and self.on_clip_end is not None:
+            self.on_clip_end(marker.clip_id, completed)
+        if marker.on_end is not None:
+            marker.on_end(completed)
+
+    # == Consumer side (PortAudio thread) ==
+
+    def _emit(self, handler, *args):
+        self._events.append((handler, args))
+        if self._dispatcher_waiting:
+            self._events_ready.set()
+
+    def _apply_clear(self):
+        clear_until = self._clear_until
+        if clear_until <= self._cleared_until:
+            return
+        self._cleared_until = clear_until
+        self.ring.drop_until(clear_until)
+        # Markers are ordered by position; later ones belong to new clips
+        while self._markers and (
+            self._markers[0].start < clear_until
+            or self._markers[0].end <= clear_until
+        ):
+            self._emit(self._on_marker_ended, self._markers.popleft(), False)
+
+    def _callback(self, outdata, frames, time_info, status):
+        out = outdata[:, 0]
+        self._apply_clear()
+
+        if self.is_paused:
+            out[:] = 0.0
+            return
+
+        self.ring.read_into(out)
+        self._advance_markers()
+
+        if self._producer_waiting:
+            self._space_available.set()
+
+    def _advance_markers(self):
+        read_pos = self.ring.read_pos
+        now = monotonic()
+        while self._markers:
+            marker = self._markers[0]
+            if marker.clip_id is not None and not marker.started:
+                if marker.start >= read_pos:
+                    return
+                marker.started = True
+                self._emit(self._on_marker_started, marker, now)
+
+            if marker.end > read_pos:
+                return
+
+            self._markers.popleft()
+            if marker.clip_id is not None:
+                self.last_finished_clip_id = marker.clip_id
+            self._emit(self._on_marker_ended, marker, True)
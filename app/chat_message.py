@@ -1,7 +1,10 @@
+from collections import OrderedDict
 import hashlib
+import json
 import os
 from html import escape
-from typing import TypedDict
+import tempfile
+from typing import Iterator, TypedDict
 
 from PyQt6 import sip
 from PyQt6.QtWidgets import QStyledItemDelegate, QListView
@@ -43,6 +46,15 @@ BUBBLE_PADDING = 10
 HEADER_SPACING = 4
 EMOJI_CACHE_SIZE = 32
 NETWORK_TRANSFER_TIMEOUT_MS = 15000
+# Rows kept in the model; older rows go to the archive
+MESSAGE_CAPACITY = 5000
+# Share of the capacity evicted at once, so the views relayout rarely
+EVICT_FRACTION = 0.1
+ARCHIVE_READ_SIZE = 64 * 1024
+# Measured heights are cheap to keep, documents only for rows likely on screen
+LAYOUT_CACHE_SIZE = 2 * MESSAGE_CAPACITY
+DOCUMENT_CACHE_SIZE = 256
+AVATAR_RADIUS = 8
 
 
 class ChatMessageSegment(TypedDict, total=False):
@@ -71,6 +83,8 @@ class _ChatEmojiStore(QObject):
         self._pending: dict[str, list[QListView]] = {}
         self._replies: dict[str, QNetworkReply] = {}
         self._cache_dir = get_emoji_cache_path()
+        # Bumped whenever a downloaded emoji appears, so cached layouts relayout
+        self.generation = 0
 
     def _cache_path(self, url: str) -> str:
         digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
@@ -164,6 +178,7 @@ class _ChatEmojiStore(QObject):
                             Qt.TransformationMode.SmoothTransformation,
                         )
                     self._cache[url] = image
+                    self.generation += 1
                     if self._cache_dir:
                         try:
                             image.save(self._cache_path(url), "PNG")
@@ -196,12 +211,37 @@ class _ChatAvatarStore(QObject):
         super().__init__()
         self._manager = QNetworkAccessManager(self)
         self._cache: dict[str, QPixmap] = {}
+        self._rounded: dict[tuple[str, int, float], QPixmap] = {}
         self._pending: dict[str, list[QListView]] = {}
         self._replies: dict[str, QNetworkReply] = {}
 
     def get(self, url: str) -> QPixmap | None:
         return self._cache.get(url)
 
+    def get_rounded(self, url: str, size: int, ratio: float) -> QPixmap | None:
+        """The avatar clipped to a rounded square, rendered once per size"""
+        key = (url, size, ratio)
+        pixmap = self._rounded.get(key)
+        if pixmap is not None:
+            return pixmap
+        source = self._cache.get(url)
+        if source is None:
+            return None
+
+        pixmap = _transparent_pixmap(size, ratio)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        path = QPainterPath()
+        path.addRoundedRect(
+            0.0, 0.0, float(size), float(size), AVATAR_RADIUS, AVATAR_RADIUS
+        )
+        painter.setClipPath(path)
+        painter.drawPixmap(0, 0, size, size, source)
+        painter.end()
+        self._rounded[key] = pixmap
+        return pixmap
+
     def ensure(self, url: str, view: QListView | None):
         if not url or url in self._cache:
             return
@@ -282,6 +322,63 @@ def _get_avatar_store() -> _ChatAvatarStore:
     return _avatar_store
 
 
+def _transparent_pixmap(size: int, ratio: float) -> QPixmap:
+    pixmap = QPixmap(max(1, round(size * ratio)), max(1, round(size * ratio)))
+    pixmap.setDevicePixelRatio(ratio)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    return pixmap
+
+
+_platform_icons: dict[tuple[str, int, float], QPixmap | None] = {}
+
+
+def _platform_pixmap(platform: str, size: int, ratio: float) -> QPixmap | None:
+    key = (platform, size, ratio)
+    if key not in _platform_icons:
+        icon_path = PLATFORM_ICON.get(platform)
+        icon = QIcon(resource_path(icon_path)) if icon_path else QIcon()
+        _platform_icons[key] = (
+            None if icon.isNull() else icon.pixmap(QSize(size, size), ratio)
+        )
+    return _platform_icons[key]
+
+
+def _has_images(message: ChatMessage) -> bool:
+    return any(
+        not isinstance(segment, str) and segment.get("url")
+        for segment in message.get("segments") or ()
+    )
+
+
+class _MessageLayout:
+    """Measured geometry of one message at one width and font"""
+
+    __slots__ = (
+        "message",
+        "key",
+        "emoji_generation",
+        "has_images",
+        "bubble_width",
+        "bubble_height",
+        "item_height",
+        "header_height",
+        "header_text",
+        "document",
+    )
+
+    def __init__(self, message, key, emoji_generation):
+        self.message = message
+        self.key = key
+        self.emoji_generation = emoji_generation
+        self.has_images = _has_images(message)
+        self.bubble_width = 0
+        self.bubble_height = 0
+        self.item_height = 0
+        self.header_height = 0
+        self.header_text: str | None = None
+        self.document: QTextDocument | None = None
+
+
 def _normalize_http_avatar_url(url: str | None) -> str | None:
     avatar_url = str(url or "").strip()
     if not avatar_url:
@@ -365,12 +462,86 @@ def _build_body_document(
     return document
 
 
+class ChatMessageArchive:
+    """Append-only JSON-lines spill file for rows evicted from the model.
+
+    The file is an anonymous temporary file, so it goes away with the
+    process and never outlives the session.
+    """
+
+    def __init__(self):
+        self._file = None
+        self.count = 0
+
+    def append(self, messages: list[ChatMessage]):
+        if not messages:
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile("w+b", prefix="chat_history_")
+        self._file.seek(0, os.SEEK_END)
+        self._file.write(
+            b"".join(
+                json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+                for message in messages
+            )
+        )
+        self.count += len(messages)
+
+    def __iter__(self) -> Iterator[ChatMessage]:
+        """Archived rows, oldest first, as they were when iteration started"""
+        file = self._file
+        if file is None:
+            return
+        file.flush()
+        end = file.seek(0, os.SEEK_END)
+        position = 0
+        tail = b""
+        while position < end:
+            # Appends may happen between reads, so always seek to our own spot
+            file.seek(position)
+            chunk = file.read(min(ARCHIVE_READ_SIZE, end - position))
+            if not chunk:
+                break
+            position += len(chunk)
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                if line:
+                    yield json.loads(line)
+
+    def clear(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.count = 0
+
+
 class ChatMessageListModel(QAbstractListModel):
+    """Chat rows for the overlay, bounded to ``capacity`` rows.
+
+    The oldest rows are evicted in batches and, with ``spill_to_disk``,
+    appended to a ChatMessageArchive so exports still see the whole session.
+
+    Every row has a key that stays the same while the row lives and is never
+    reused. PyQt hands out a new dict for each MessageRole lookup, so the
+    key is what identifies a row across calls.
+    """
+
     MessageRole = Qt.ItemDataRole.UserRole + 1
+    KeyRole = Qt.ItemDataRole.UserRole + 2
 
-    def __init__(self, parent=None):
+    def __init__(
+        self,
+        parent=None,
+        capacity: int = MESSAGE_CAPACITY,
+        spill_to_disk: bool = True,
+    ):
         super().__init__(parent)
-        self._messages = []
+        self._messages: list[ChatMessage] = []
+        # Rows only leave from the front, so row N has key _first_key + N
+        self._first_key = 0
+        self.capacity = max(1, int(capacity))
+        self.archive = ChatMessageArchive() if spill_to_disk else None
 
     def rowCount(self, parent=QModelIndex()):
         if parent.isValid():
@@ -392,33 +563,74 @@ class ChatMessageListModel(QAbstractListModel):
             )
         if role == self.MessageRole:
             return message
+        if role == self.KeyRole:
+            return self.row_key(row)
         return None
 
+    def row_key(self, row: int) -> int:
+        return self._first_key + row
+
     def add_message(self, message: ChatMessage):
-        message = ChatMessage(
-            time=message["time"],
-            platform=message["platform"],
-            author=message["author"],
-            text=message["text"],
-            color=message["color"],
-            background=message["background"],
-            segments=message["segments"],
-            avatar_url=_normalize_http_avatar_url(message.get("avatar_url")),
-        )
+        self.add_messages([message])
+
+    def add_messages(self, messages: list[ChatMessage]):
+        """Append a burst of messages as one row insertion"""
+        messages = [
+            ChatMessage(
+                time=message["time"],
+                platform=message["platform"],
+                author=message["author"],
+                text=message["text"],
+                color=message["color"],
+                background=message["background"],
+                segments=message["segments"],
+                avatar_url=_normalize_http_avatar_url(message.get("avatar_url")),
+            )
+            for message in messages
+        ]
+        if not messages:
+            return
+        overflow = len(self._messages) + len(messages) - self.capacity
+        if overflow > 0:
+            self._evict(max(overflow, int(self.capacity * EVICT_FRACTION)))
+            if len(messages) > self.capacity:
+                # The head of a burst larger than the model never gets a row
+                if self.archive is not None:
+                    self.archive.append(messages[: -self.capacity])
+                messages = messages[-self.capacity :]
         row = len(self._messages)
-        self.beginInsertRows(QModelIndex(), row, row)
-        self._messages.append(message)
+        self.beginInsertRows(QModelIndex(), row, row + len(messages) - 1)
+        self._messages.extend(messages)
         self.endInsertRows()
 
+    def _evict(self, count: int):
+        count = min(count, len(self._messages))
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        evicted = self._messages[:count]
+        del self._messages[:count]
+        self._first_key += count
+        self.endRemoveRows()
+        if self.archive is not None:
+            self.archive.append(evicted)
+
     def clear(self):
+        if self.archive is not None:
+            self.archive.clear()
         if not self._messages:
             return
         self.beginResetModel()
+        self._first_key += len(self._messages)
         self._messages.clear()
         self.endResetModel()
 
-    def messages(self):
-        return list(self._messages)
+    def messages(self) -> Iterator[ChatMessage]:
+        """Every message of the session, archived ones first, streamed"""
+        live = list(self._messages)
+        if self.archive is not None:
+            yield from self.archive
+        yield from live
 
 
 class ChatMessageDelegate(QStyledItemDelegate):
@@ -430,6 +642,7 @@ class ChatMessageDelegate(QStyledItemDelegate):
         hide_system_msg: bool = False,
         with_avatar: bool = True,
         is_transparent: bool = True,
+        layout_cache_size: int = LAYOUT_CACHE_SIZE,
     ):
         self.only_system_msg = only_system_msg
         self.hide_system_msg = hide_system_msg
@@ -437,19 +650,32 @@ class ChatMessageDelegate(QStyledItemDelegate):
         self.avatar_size = AVATAR_SIZE if with_avatar else 0
         self.spacing = SPACING if with_avatar else 0
         self.color = COLORS_RGBA if is_transparent else COLORS_SOLID
+        # 0 measures every row on every sizeHint and paint
+        self.layout_cache_size = max(0, layout_cache_size)
+        self.document_cache_size = min(DOCUMENT_CACHE_SIZE, self.layout_cache_size)
+        # Row key -> layout; the layout keeps the row's message for paint
+        self._layouts: OrderedDict[int, _MessageLayout] = OrderedDict()
+        self._documents: OrderedDict[int, None] = OrderedDict()
+        self._fonts: dict[str, tuple[QFont, QFontMetrics, QFont]] = {}
+        # QFont.key() builds a new string per call; it is kept for the last font
+        self._font: QFont | None = None
+        self._font_key = ""
+        self._letter_avatars: dict[tuple, QPixmap] = {}
 
         super().__init__(parent)
+        view = self.parent()
+        self._list_view = view if isinstance(view, QListView) else None
         self._sync_hidden_rows()
 
-        view = self.parent()
         if view is not None and hasattr(view, "model"):
             model = view.model()
             if model is not None:
-                model.rowsInserted.connect(self._sync_hidden_rows)
-                model.rowsRemoved.connect(self._sync_hidden_rows)
+                # Removed rows take their hidden state with them, so only new
+                # and changed rows are checked; a reset or relayout rescans
+                model.rowsInserted.connect(self._on_rows_inserted)
+                model.dataChanged.connect(self._on_data_changed)
                 model.modelReset.connect(self._sync_hidden_rows)
                 model.layoutChanged.connect(self._sync_hidden_rows)
-                model.dataChanged.connect(self._sync_hidden_rows)
 
     def _is_hidden_message(self, message: ChatMessage | None) -> bool:
         if not message:
@@ -467,6 +693,17 @@ class ChatMessageDelegate(QStyledItemDelegate):
         return False
 
     def _sync_hidden_rows(self, *_args):
+        self._sync_hidden_range(0, None)
+
+    def _on_rows_inserted(self, _parent, first: int, last: int):
+        # New rows start visible
+        if self.hide_system_msg or self.only_system_msg:
+            self._sync_hidden_range(first, last)
+
+    def _on_data_changed(self, top_left, bottom_right, *_roles):
+        self._sync_hidden_range(top_left.row(), bottom_right.row())
+
+    def _sync_hidden_range(self, first: int, last: int | None):
         view = self.parent()
         if (
             view is None
@@ -479,28 +716,97 @@ class ChatMessageDelegate(QStyledItemDelegate):
         if model is None:
             return
 
-        for row in range(model.rowCount()):
+        if last is None:
+            last = model.rowCount() - 1
+        for row in range(max(0, first), last + 1):
             index = model.index(row, 0)
             message = index.data(ChatMessageListModel.MessageRole)
-            view.setRowHidden(row, self._is_hidden_message(message))
+            is_hidden = self._is_hidden_message(message)
+            if is_hidden != view.isRowHidden(row):
+                view.setRowHidden(row, is_hidden)
 
     def _bubble_width(self, option):
-        width = option.rect.width()
-        view = self.parent()
-        if width <= 0 and hasattr(view, "viewport"):
-            width = view.viewport().width()
+        view = self._list_view
+        if view is not None:
+            # sizeHint gets the viewport rect and paint the item rect, which is
+            # narrower by the spacing; both must measure the same width
+            width = view.viewport().width() - 2 * view.spacing()
+            if width <= 0:
+                width = view.viewport().width()
+        else:
+            width = option.rect.width()
         if width <= 0:
             width = 900
         content_width = max(260, width - (2 * OUTER_MARGIN))
         return max(140, content_width - self.avatar_size - self.spacing)
 
-    def _measure(self, option, message: ChatMessage):
-        bubble_width = self._bubble_width(option)
+    def _font_key_of(self, font: QFont) -> str:
+        if self._font is None or font != self._font:
+            self._font = QFont(font)
+            self._font_key = font.key()
+        return self._font_key
+
+    def _header_fonts(self, font: QFont) -> tuple[QFont, QFontMetrics, QFont]:
+        font_key = self._font_key_of(font)
+        fonts = self._fonts.get(font_key)
+        if fonts is None:
+            header_font = QFont(font)
+            header_font.setBold(True)
+            avatar_font = QFont(font)
+            avatar_font.setBold(True)
+            avatar_font.setPointSize(max(font.pointSize() + 6, 16))
+            fonts = self._fonts[font_key] = (
+                header_font,
+                QFontMetrics(header_font),
+                avatar_font,
+            )
+        return fonts
 
-        header_font = QFont(option.font)
-        header_font.setBold(True)
-        header_height = QFontMetrics(header_font).height()
+    def _measure(self, option, index, with_document: bool = True):
+        """Layout of a row, from the cache unless width, font or emoji changed.
 
+        None for an empty or hidden row.
+        """
+        bubble_width = self._bubble_width(option)
+        key = (bubble_width, self._font_key_of(option.font))
+        emoji_generation = _get_emoji_store().generation
+        model = index.model()
+        if isinstance(model, ChatMessageListModel):
+            # Skips a round trip through data() on every sizeHint
+            row_key = model.row_key(index.row())
+        else:
+            row_key = index.data(ChatMessageListModel.KeyRole)
+
+        layout = self._layouts.get(row_key) if row_key is not None else None
+        if (
+            layout is not None
+            and layout.key == key
+            and (layout.emoji_generation == emoji_generation or not layout.has_images)
+        ):
+            self._layouts.move_to_end(row_key)
+            if layout.document is not None:
+                self._documents.move_to_end(row_key)
+                return layout
+            if not with_document:
+                return layout
+        else:
+            if layout is not None:
+                message = layout.message
+                self._documents.pop(row_key, None)
+            else:
+                message = index.data(ChatMessageListModel.MessageRole)
+                if not message or self._is_hidden_message(message):
+                    return None
+            layout = _MessageLayout(message, key, emoji_generation)
+            layout.bubble_width = bubble_width
+            if row_key is not None:
+                self._layouts[row_key] = layout
+                while len(self._layouts) > self.layout_cache_size:
+                    evicted_key, _evicted = self._layouts.popitem(last=False)
+                    self._documents.pop(evicted_key, None)
+
+        message = layout.message
+        header_height = self._header_fonts(option.font)[1].height()
         body_width = max(20, bubble_width - (2 * BUBBLE_PADDING))
         view = self.parent() if isinstance(self.parent(), QListView) else None
         text_color = to_color(message["color"], self.color["WHITE"])
@@ -509,34 +815,84 @@ class ChatMessageDelegate(QStyledItemDelegate):
         )
         body_height = max(1, int(document.size().height()))
 
-        bubble_height = (
+        layout.header_height = header_height
+        layout.bubble_height = (
             BUBBLE_PADDING
             + header_height
             + HEADER_SPACING
             + body_height
             + BUBBLE_PADDING
         )
-        item_height = max(self.avatar_size, bubble_height)
-        return bubble_width, bubble_height, item_height, header_height, document
+        layout.item_height = max(self.avatar_size, layout.bubble_height)
+        layout.header_text = None
+        if with_document:
+            layout.document = document
+            if row_key in self._layouts:
+                self._documents[row_key] = None
+            while len(self._documents) > self.document_cache_size:
+                evicted_key, _evicted = self._documents.popitem(last=False)
+                evicted = self._layouts.get(evicted_key)
+                if evicted is not None:
+                    evicted.document = None
+        return layout
+
+    def _letter_avatar(self, message: ChatMessage, font: QFont, ratio: float):
+        avatar_bg, avatar_fg = avatar_colors_from_name(message["author"])
+        avatar_bg = to_color(avatar_bg, self.color["GRAY"])
+        avatar_fg = to_color(avatar_fg, self.color["WHITE"])
+        letter = message["author"][:1].upper()
+        font_key = self._font_key_of(font)
+        key = (letter, avatar_bg.rgba(), avatar_fg.rgba(), font_key, ratio)
+        pixmap = self._letter_avatars.get(key)
+        if pixmap is not None:
+            return pixmap
+
+        pixmap = _transparent_pixmap(self.avatar_size, ratio)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(avatar_bg)
+        painter.drawRoundedRect(
+            0, 0, self.avatar_size, self.avatar_size, AVATAR_RADIUS, AVATAR_RADIUS
+        )
+        painter.setFont(self._header_fonts(font)[2])
+        painter.setPen(avatar_fg)
+        painter.drawText(
+            0,
+            0,
+            self.avatar_size,
+            self.avatar_size,
+            int(Qt.AlignmentFlag.AlignCenter),
+            letter,
+        )
+        painter.end()
+        self._letter_avatars[key] = pixmap
+        return pixmap
 
     def sizeHint(self, option, index):
-        message = index.data(ChatMessageListModel.MessageRole)
-        if not message or self._is_hidden_message(message):
+        layout = self._measure(option, index, with_document=False)
+        if layout is None:
             return QSize(0, 0)
-        bubble_width, _, item_height, _, _ = self._measure(option, message)
         total_width = (
-            OUTER_MARGIN + self.avatar_size + self.spacing + bubble_width + OUTER_MARGIN
+            OUTER_MARGIN
+            + self.avatar_size
+            + self.spacing
+            + layout.bubble_width
+            + OUTER_MARGIN
         )
-        return QSize(total_width, item_height + (2 * OUTER_MARGIN))
+        return QSize(total_width, layout.item_height + (2 * OUTER_MARGIN))
 
     def paint(self, painter: QPainter, option, index):
-        message = index.data(ChatMessageListModel.MessageRole)
-        if not message or self._is_hidden_message(message):
+        layout = self._measure(option, index)
+        if layout is None:
             return
 
-        bubble_width, bubble_height, item_height, header_height, document = (
-            self._measure(option, message)
-        )
+        message = layout.message
+        bubble_width = layout.bubble_width
+        bubble_height = layout.bubble_height
+        header_height = layout.header_height
+        document = layout.document
+        ratio = painter.device().devicePixelRatioF()
 
         item_top = option.rect.y() + OUTER_MARGIN
         avatar_y = item_top
@@ -550,47 +906,17 @@ class ChatMessageDelegate(QStyledItemDelegate):
 
         if self.with_avatar:
             avatar_url = str(message.get("avatar_url", "") or "")
-            avatar_pixmap = _get_avatar_store().get(avatar_url) if avatar_url else None
+            avatar_store = _get_avatar_store()
+            avatar_pixmap = (
+                avatar_store.get_rounded(avatar_url, self.avatar_size, ratio)
+                if avatar_url
+                else None
+            )
             if avatar_pixmap is None and avatar_url:
-                _get_avatar_store().ensure(avatar_url, view)
-
-            if avatar_pixmap is not None:
-                path = QPainterPath()
-                path.addRoundedRect(
-                    float(avatar_x),
-                    float(avatar_y),
-                    float(self.avatar_size),
-                    float(self.avatar_size),
-                    8.0,
-                    8.0,
-                )
-                painter.setClipPath(path)
-                painter.drawPixmap(avatar_x, avatar_y, avatar_pixmap)
-                painter.setClipping(False)
-            else:
-                avatar_bg, avatar_fg = avatar_colors_from_name(message["author"])
-                avatar_bg = to_color(avatar_bg, self.color["GRAY"])
-                avatar_fg = to_color(avatar_fg, self.color["WHITE"])
-
-                painter.setPen(Qt.PenStyle.NoPen)
-                painter.setBrush(avatar_bg)
-                painter.drawRoundedRect(
-                    avatar_x, avatar_y, self.avatar_size, self.avatar_size, 8, 8
-                )
-
-                avatar_font = QFont(option.font)
-                avatar_font.setBold(True)
-                avatar_font.setPointSize(max(option.font.pointSize() + 6, 16))
-                painter.setFont(avatar_font)
-                painter.setPen(avatar_fg)
-                painter.drawText(
-                    avatar_x,
-                    avatar_y,
-                    self.avatar_size,
-                    self.avatar_size,
-                    int(Qt.AlignmentFlag.AlignCenter),
-                    message["author"][:1].upper(),
-                )
+                avatar_store.ensure(avatar_url, view)
+            if avatar_pixmap is None:
+                avatar_pixmap = self._letter_avatar(message, option.font, ratio)
+            painter.drawPixmap(avatar_x, avatar_y, avatar_pixmap)
 
         painter.setPen(Qt.PenStyle.NoPen)
         painter.setBrush(bubble_color)
@@ -600,31 +926,26 @@ class ChatMessageDelegate(QStyledItemDelegate):
         text_top = bubble_y + BUBBLE_PADDING
         text_width = max(20, bubble_width - (2 * BUBBLE_PADDING))
 
-        icon = QIcon(resource_path(PLATFORM_ICON[message["platform"]]))
-        header_text = f"{message['author']} [{message['time']}]"
-        header_font = QFont(option.font)
-        header_font.setBold(True)
-        header_metrics = QFontMetrics(header_font)
+        header_font, header_metrics, _avatar_font = self._header_fonts(option.font)
         painter.setFont(header_font)
         painter.setPen(self.color["WHITE"])
         icon_size = header_metrics.height()
         header_text_left = text_left
         header_text_width = text_width
-        if not icon.isNull():
+        icon_pixmap = _platform_pixmap(message["platform"], icon_size, ratio)
+        if icon_pixmap is not None:
             icon_y = text_top + max(0, (header_height - icon_size) // 2)
-            painter.drawPixmap(
-                text_left,
-                icon_y,
-                icon.pixmap(icon_size, icon_size),
-            )
+            painter.drawPixmap(text_left, icon_y, icon_pixmap)
             header_text_left += icon_size + HEADER_SPACING
             header_text_width = max(20, text_width - icon_size - HEADER_SPACING)
+        if layout.header_text is None:
+            layout.header_text = header_metrics.elidedText(
+                f"{message['author']} [{message['time']}]",
+                Qt.TextElideMode.ElideRight,
+                header_text_width,
+            )
         painter.drawText(
-            header_text_left,
-            text_top + header_metrics.ascent(),
-            header_metrics.elidedText(
-                header_text, Qt.TextElideMode.ElideRight, header_text_width
-            ),
+            header_text_left, text_top + header_metrics.ascent(), layout.header_text
         )
 
         body_top = text_top + header_height + HEADER_SPACING
@@ -29,6 +29,11 @@ logger = Logger("ChatOverlay")
 # logger.addHandler(handler)
 
 TRANSPARENT_BLACK = "rgba(0, 0, 0, 150)"
+# Rows are laid out in batches between events, so a relayout of the whole
+# model never blocks the UI thread for more than a frame or so
+LAYOUT_BATCH_SIZE = 500
+# Chat inserts are spaced out by this much so a batched layout can finish
+INSERT_INTERVAL_MS = 50
 
 
 class ChatOverlayWindow(QWidget):
@@ -51,6 +56,7 @@ class ChatOverlayWindow(QWidget):
         self._drag_offset = None
         self._resize_origin = None
         self._resize_size = None
+        self._follow_bottom = True
         self.lang = lang
         self.show_avatars = show_avatars
         self.show_sys_msg = show_sys_msg
@@ -120,6 +126,8 @@ class ChatOverlayWindow(QWidget):
         self.chat_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
         self.chat_view.setWordWrap(True)
         self.chat_view.setUniformItemSizes(False)
+        self.chat_view.setLayoutMode(QListView.LayoutMode.Batched)
+        self.chat_view.setBatchSize(LAYOUT_BATCH_SIZE)
         self.chat_view.setSpacing(4)
         self.chat_view.setFrameShape(QFrame.Shape.NoFrame)
         self.chat_view.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
@@ -139,8 +147,21 @@ class ChatOverlayWindow(QWidget):
                 is_transparent=self.is_transparent,
             )
         )
+        self.chat_view.verticalScrollBar().rangeChanged.connect(
+            self._on_scroll_range_changed
+        )
         self.root_layout.addWidget(self.chat_view)
 
+    def set_follow_bottom(self, value: bool):
+        """Keep the newest message in view while the batched layout grows"""
+        self._follow_bottom = value
+        if value:
+            self.chat_view.scrollToBottom()
+
+    def _on_scroll_range_changed(self, _minimum, maximum):
+        if self._follow_bottom:
+            self.chat_view.verticalScrollBar().setValue(maximum)
+
     def setup_footer(self):
         resize_layout = QHBoxLayout()
         self.always_on_top_button = QPushButton("^")
@@ -280,6 +301,8 @@ class ChatOverlayWindow(QWidget):
     def _set_model_delegate(
         self, show_sys_msg=None, show_avatars=None, is_transparent=None
     ):
+        # The replaced delegate would keep syncing hidden rows with old settings
+        old_delegate = self.chat_view.itemDelegate()
         self.chat_view.setItemDelegate(
             ChatMessageDelegate(
                 self.chat_view,
@@ -290,3 +313,5 @@ class ChatOverlayWindow(QWidget):
                 is_transparent=is_transparent or self.is_transparent,
             )
         )
+        if old_delegate is not None:
+            old_delegate.deleteLater()
@@ -0,0 +1,167 @@
+import gzip
+import json
+from logging import getLogger
+import threading
+from time import monotonic, time
+from types import SimpleNamespace
+from typing import Iterator
+
+logger = getLogger("main")
+
+RECORDING_SUFFIX = ".jsonl.gz"
+FLUSH_INTERVAL = 1.0
+# Marks an attribute object (a pytchat item or its author) in a recording
+OBJECT_KEY = "__object__"
+
+
+def to_record_data(value):
+    """JSON-ready copy of a raw chat event; objects keep their public attributes"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): to_record_data(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_record_data(item) for item in value]
+    if hasattr(value, "__dict__"):
+        return {
+            OBJECT_KEY: {
+                key: to_record_data(item)
+                for key, item in vars(value).items()
+                if not key.startswith("_") and not callable(item)
+            }
+        }
+    return str(value)
+
+
+def from_record_data(value):
+    """Rebuild a recorded event; recorded objects come back as namespaces"""
+    if isinstance(value, list):
+        return [from_record_data(item) for item in value]
+    if isinstance(value, dict):
+        if len(value) == 1 and OBJECT_KEY in value:
+            return SimpleNamespace(
+                **{
+                    key: from_record_data(item)
+                    for key, item in value[OBJECT_KEY].items()
+                }
+            )
+        return {key: from_record_data(item) for key, item in value.items()}
+    return value
+
+
+class ChatRecorder:
+    """Append-only gzip JSON-lines log of raw chat events.
+
+    Each line holds the source ("twitch" IRC line or "youtube" pytchat
+    item) and the arrival time in seconds since the recorder was opened.
+    Every session starts with a "start" line, so one file can collect
+    several sessions and still replay with continuous timing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._started = monotonic()
+        self._flushed_at = self._started
+        self._file = gzip.open(path, "at", encoding="utf-8")
+        self._write({"source": "start", "wall": time()})
+
+    def record(self, source: str, data):
+        event = {
+            "t": round(monotonic() - self._started, 6),
+            "source": source,
+            "data": to_record_data(data),
+        }
+        with self._lock:
+            if self._file is None:
+                return
+            self._write(event)
+            self.count += 1
+            if monotonic() - self._flushed_at >= FLUSH_INTERVAL:
+                self._file.flush()
+                self._flushed_at = monotonic()
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.close()
+            except Exception as e:
+                logger.error("Failed to close chat recording %s. %s", self.path, str(e))
+            self._file = None
+
+    def _write(self, event: dict):
+        self._file.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def read_recording(path: str) -> Iterator[tuple[float, str, object]]:
+    """Yield (seconds, source, data) with sessions laid end to end"""
+    offset = 0.0
+    last_t = 0.0
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event.get("source") == "start":
+                    offset = last_t
+                    continue
+                last_t = offset + float(event.get("t", 0.0))
+                yield last_t, event["source"], event.get("data")
+        except (EOFError, json.JSONDecodeError) as e:
+            # A recording cut off by a crash still replays up to the damage
+            logger.error("Chat recording %s is truncated. %s", path, str(e))
+
+
+class ChatReplay:
+    """Feeds a recording into chat handlers at its own pace, N times faster,
+    or as fast as possible with ``speed=0``.
+
+    ``handlers`` maps a source to a callable taking the recorded data.
+    """
+
+    def __init__(self, path: str, handlers: dict, speed: float = 1.0, on_finish=None):
+        self.path = path
+        self.handlers = handlers
+        self.speed = max(0.0, float(speed))
+        self.on_finish = on_finish
+        self.count = 0
+        self.elapsed = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def run(self):
+        self._thread = threading.Thread(target=self.replay, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def replay(self):
+        started = monotonic()
+        try:
+            for t, source, data in read_recording(self.path):
+                if self._stop_event.is_set():
+                    break
+                if self.speed:
+                    delay = t / self.speed - (monotonic() - started)
+                    if delay > 0 and self._stop_event.wait(delay):
+                        break
+                handler = self.handlers.get(source)
+                if handler is None:
+                    continue
+                handler(data)
+                self.count += 1
+        except Exception as e:
+            logger.error("Failed to replay chat recording %s. %s", self.path, str(e))
+        finally:
+            self.elapsed = monotonic() - started
+            if self.on_finish is not None:
+                self.on_finish(self)
@@ -57,11 +57,38 @@ DEFAULTS = {
     "min_text_length": 2,
     "max_text_length": 300,
     "toxic_sense": 0.6,
+    "toxic_batch_size": 8,
+    "toxic_batch_wait_ms": 15,
     "ban_limit": 5,
     "font_size": 12,
     "volume": 100,
     "speech_rate": "medium",
     "speech_delay": 1.5,
+    "tts_cache_mb": 64,
+    "tts_disk_cache": False,
+    "tts_disk_cache_mb": 512,
+    "stream_synthesis": True,
+    "tts_replicas": 2,
+    "speculative_synthesis": False,
+    "speech_max_wait": 120,
+    "max_backlog_seconds": 90,
+    "speech_tier_weights": {
+        "donation": 16,
+        "owner": 8,
+        "moderator": 6,
+        "sponsor": 4,
+        "regular": 2,
+    },
+    # 0 - unbounded, the regular tier is capped by buffer_maxsize
+    "speech_tier_caps": {
+        "donation": 0,
+        "owner": 20,
+        "moderator": 20,
+        "sponsor": 20,
+    },
+    "speech_chunk_length": 120,
+    "record_chat": False,
+    "latency_tracing": False,
     "chat_overlay_autoscroll": True,
     "chat_overlay_show_avatars": False,
     "chat_overlay_show_sys_msg": False,
@@ -0,0 +1,78 @@
+from time import monotonic
+
+# Platforms re-deliver a message within seconds to a few minutes of the original
+DEDUP_WINDOW_SECONDS = 600
+DEDUP_MAX_IDS = 50_000
+
+
+class RecentIds:
+    """Message IDs seen within a time window, bounded by age and by count.
+
+    Two generations of exact sets are kept: lookups check both, inserts go
+    to the current one, and the current one is rotated into the previous
+    when it is half a window old or holds half of ``max_ids``. Memory is
+    flat however long the session runs and an ID is never reported as seen
+    when it was not, so the false-positive rate is zero. The cost is that an
+    ID is only guaranteed to be remembered for half the window, or fewer
+    under a count-triggered rotation; those rotations are counted.
+
+    Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = DEDUP_WINDOW_SECONDS,
+        max_ids: int = DEDUP_MAX_IDS,
+    ):
+        self.window_seconds = window_seconds
+        self.max_ids = max(2, int(max_ids))
+        self._current: set[str] = set()
+        self._previous: set[str] = set()
+        self._rotated_at = monotonic()
+        self.rotations = 0
+        self.early_rotations = 0
+        self.duplicates = 0
+
+    def __len__(self) -> int:
+        return len(self._current) + len(self._previous)
+
+    def __contains__(self, msg_id) -> bool:
+        return msg_id in self._current or msg_id in self._previous
+
+    def add(self, msg_id: str, now: float | None = None) -> bool:
+        """Remember the ID; return True when it was already seen"""
+        if msg_id in self._current or msg_id in self._previous:
+            self.duplicates += 1
+            return True
+        self._maybe_rotate(monotonic() if now is None else now)
+        self._current.add(msg_id)
+        return False
+
+    def clear(self):
+        self._current = set()
+        self._previous = set()
+        self._rotated_at = monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self),
+            "max_ids": self.max_ids,
+            "window_seconds": self.window_seconds,
+            "rotations": self.rotations,
+            "early_rotations": self.early_rotations,
+            "duplicates": self.duplicates,
+            # Exact sets never confuse two IDs
+            "false_positive_rate": 0.0,
+        }
+
+    def _maybe_rotate(self, now: float):
+        by_age = now - self._rotated_at >= self.window_seconds / 2
+        by_count = len(self._current) >= self.max_ids // 2
+        if not by_age and not by_count:
+            return
+        if by_count and not by_age:
+            self.early_rotations += 1
+        self.rotations += 1
+        self._previous = self._current
+        self._current = set()
+        self._rotated_at = now
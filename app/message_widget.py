@@ -1,7 +1,16 @@
+from collections import deque
 from datetime import datetime
 
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QFrame, QScrollArea
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QListView, QStyledItemDelegate
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize
+from PyQt6.QtGui import (
+    QAbstractTextDocumentLayout,
+    QColor,
+    QFont,
+    QPainter,
+    QPalette,
+    QTextDocument,
+)
 
 MSG_STATUS_COLOR = {
     "default": "#444444",
@@ -9,102 +18,191 @@ MSG_STATUS_COLOR = {
     "error": "#641111",
     "success": "#175a00",
 }
+# Older system messages are dropped; a reconnect loop can log thousands
+LOG_CAPACITY = 1000
+LOG_EVICT_FRACTION = 0.1
+PADDING_X = 10
+PADDING_Y = 6
+BUBBLE_RADIUS = 8
 
 
-class MessageItem(QFrame):
-    def __init__(self, author: str, text: str, status: str, font_size: int):
-        super().__init__()
+class LogEntry:
+    """One system message with the layout it was last measured with"""
 
-        self.font_size = font_size
+    __slots__ = ("html", "color", "layout_key", "document", "height")
 
-        color = MSG_STATUS_COLOR.get(status, MSG_STATUS_COLOR["default"])
+    def __init__(self, author: str, text: str, status: str | None):
         time = datetime.now().strftime("%H:%M:%S")
+        self.html = f"<b>{time} | {author}</b> - {text}"
+        self.color = QColor(MSG_STATUS_COLOR.get(status, MSG_STATUS_COLOR["default"]))
+        self.layout_key = None
+        self.document: QTextDocument | None = None
+        self.height = 0
 
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(10, 6, 10, 6)
 
-        self.label = QLabel(f"<b>{time} | {author}</b> - {text}")
-        self.label.setWordWrap(True)
+class MessageLogModel(QAbstractListModel):
+    EntryRole = Qt.ItemDataRole.UserRole + 1
 
-        layout.addWidget(self.label)
-
-        self.setStyleSheet(f"""
-            QFrame {{
-                background-color: {color};
-                border-radius: 8px;
-            }}
-        """)
-
-        self.update_font()
-
-    def update_font(self):
-        self.label.setStyleSheet(f"color: white; font-size: {self.font_size}px;")
+    def __init__(self, parent=None, capacity: int = LOG_CAPACITY):
+        super().__init__(parent)
+        self.capacity = max(1, capacity)
+        self._entries: deque[LogEntry] = deque()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._entries):
+            return None
+        entry = self._entries[index.row()]
+        if role == self.EntryRole:
+            return entry
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.html
+        return None
+
+    def add_entry(self, entry: LogEntry):
+        if len(self._entries) >= self.capacity:
+            count = min(
+                len(self._entries),
+                max(1, int(self.capacity * LOG_EVICT_FRACTION)),
+            )
+            self.beginRemoveRows(QModelIndex(), 0, count - 1)
+            for _ in range(count):
+                self._entries.popleft()
+            self.endRemoveRows()
+        row = len(self._entries)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._entries.append(entry)
+        self.endInsertRows()
 
-    def set_font_size(self, size: int):
-        self.font_size = size
-        self.update_font()
+    def clear(self):
+        if not self._entries:
+            return
+        self.beginResetModel()
+        self._entries.clear()
+        self.endResetModel()
+
+
+class MessageLogDelegate(QStyledItemDelegate):
+    """Paints a log entry as a rounded bubble of white rich text.
+
+    The text document is laid out once per width and font and kept on the
+    entry, so scrolling only paints.
+    """
+
+    def _layout(self, option, entry: LogEntry) -> LogEntry:
+        width = option.rect.width()
+        view = self.parent()
+        if width <= 0 and isinstance(view, QListView):
+            width = view.viewport().width()
+        text_width = max(40, width - 2 * PADDING_X)
+        key = (text_width, option.font.key())
+        if entry.layout_key != key:
+            document = QTextDocument()
+            document.setDocumentMargin(0)
+            document.setDefaultFont(option.font)
+            document.setHtml(entry.html)
+            document.setTextWidth(text_width)
+            entry.document = document
+            entry.height = int(document.size().height()) + 2 * PADDING_Y
+            entry.layout_key = key
+        return entry
+
+    def sizeHint(self, option, index):
+        entry = index.data(MessageLogModel.EntryRole)
+        if entry is None:
+            return QSize(0, 0)
+        entry = self._layout(option, entry)
+        return QSize(entry.layout_key[0] + 2 * PADDING_X, entry.height)
+
+    def paint(self, painter: QPainter, option, index):
+        entry = index.data(MessageLogModel.EntryRole)
+        if entry is None:
+            return
+        entry = self._layout(option, entry)
+        rect = option.rect
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(entry.color)
+        painter.drawRoundedRect(
+            rect.x(),
+            rect.y(),
+            entry.layout_key[0] + 2 * PADDING_X,
+            entry.height,
+            BUBBLE_RADIUS,
+            BUBBLE_RADIUS,
+        )
+
+        painter.translate(rect.x() + PADDING_X, rect.y() + PADDING_Y)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.ColorRole.Text, QColor("white"))
+        entry.document.documentLayout().draw(painter, context)
+        painter.restore()
 
 
 class MessageWidget(QWidget):
     def __init__(self, parent=None, font_size: int = 14):
         super().__init__(parent)
 
-        self.font_size = font_size + 4
         self._auto_scroll = True
 
         main_layout = QVBoxLayout(self)
 
-        self.container = QWidget()
-        self.messages_layout = QVBoxLayout(self.container)
-        self.messages_layout.setSpacing(6)
-        self.messages_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setWidget(self.container)
-
-        self.scroll.setStyleSheet("""
-            QScrollArea {
+        self.model = MessageLogModel(self)
+        self.view = QListView()
+        self.view.setModel(self.model)
+        self.view.setItemDelegate(MessageLogDelegate(self.view))
+        self.view.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.view.setResizeMode(QListView.ResizeMode.Adjust)
+        self.view.setUniformItemSizes(False)
+        self.view.setWordWrap(True)
+        self.view.setSpacing(3)
+
+        self.view.setStyleSheet("""
+            QListView {
                 background-color: #333333;
                 border: 1px solid rgba(0, 0, 0, 45);
             }
         """)
+        self.set_font_size(font_size)
 
-        main_layout.addWidget(self.scroll)
+        main_layout.addWidget(self.view)
 
-        self.scroll.verticalScrollBar().valueChanged.connect(self._on_scroll)
+        bar = self.view.verticalScrollBar()
+        bar.valueChanged.connect(self._on_scroll)
+        bar.rangeChanged.connect(self._on_range_changed)
 
     def _on_scroll(self):
-        bar = self.scroll.verticalScrollBar()
+        bar = self.view.verticalScrollBar()
         self._auto_scroll = bar.value() >= bar.maximum() - 5
 
+    def _on_range_changed(self, _minimum, _maximum):
+        # Rows are laid out after the insert, so follow the range instead
+        if self._auto_scroll:
+            self.scroll_to_bottom()
+
     def clear(self):
-        while self.messages_layout.count():
-            item = self.messages_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
+        self.model.clear()
 
     def add_message(self, author: str, text: str, status: str = None):
-        msg = MessageItem(author, text, status, self.font_size)
-        self.messages_layout.addWidget(msg)
-
-        if self._auto_scroll:
-            QTimer.singleShot(0, self.scroll_to_bottom)
+        self.model.add_entry(LogEntry(author, text, status))
 
     def scroll_to_bottom(self):
-        self.container.adjustSize()
-        bar = self.scroll.verticalScrollBar()
+        bar = self.view.verticalScrollBar()
         bar.setValue(bar.maximum())
 
     def set_font_size(self, size: int):
         self.font_size = size + 4
-
-        for i in range(self.messages_layout.count()):
-            item = self.messages_layout.itemAt(i)
-            widget = item.widget()
-
-            if isinstance(widget, MessageItem):
-                widget.set_font_size(self.font_size)
+        # Rows relayout lazily with the view's font
+        font = QFont(self.view.font())
+        font.setPixelSize(self.font_size)
+        self.view.setFont(font)
 
     def set_autoscroll(self, value: bool):
         self._auto_scroll = value
@@ -5,6 +5,14 @@ class MessageStatsTD(TypedDict):
     messages_count: int
     spoken_count: int
     spam_count: int
+    filtered_count: int
+    stale_count: int
+    shed_count: int
+    speculative_count: int
+    speculative_wasted_count: int
+    speculative_wasted_seconds: float
+    speculative_saved_count: int
+    purged_count: int
 
 
 class TwitchCredentialsTD(TypedDict):
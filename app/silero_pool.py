@@ -0,0 +1,138 @@
+import copy
+from logging import getLogger
+import os
+import threading
+from time import monotonic
+
+from app.utils import torch_no_grad
+
+logger = getLogger("main")
+
+
+def default_tts_threads(replicas: int) -> int:
+    return max(1, (os.cpu_count() or 1) // max(1, replicas))
+
+
+class SileroReplica:
+    """One Silero wrapper and its synthesis counters"""
+
+    def __init__(self, index: int, model, threads: int):
+        self.index = index
+        self.model = model
+        self.threads = threads
+
+        self.clips = 0
+        self.synth_seconds = 0.0
+        self.audio_seconds = 0.0
+
+    def rtf(self) -> float:
+        if self.audio_seconds <= 0:
+            return 0.0
+        return self.synth_seconds / self.audio_seconds
+
+
+class SileroPool:
+    """Pool of Silero replicas sharing one set of read-only weights.
+
+    Replicas are shallow copies of the loaded wrapper, so the TorchScript
+    module and its tensors are shared and only the Python-side state is
+    per replica. The torch intra-op thread count is process-wide, so it is
+    set once whenever the pool is sized, to the cores divided by the
+    replicas; several short lines then render in parallel instead of one
+    line using every core.
+    """
+
+    def __init__(self, replicas: int = 1, threads_per_replica: int | None = None):
+        self.replicas_count = max(1, int(replicas))
+        self.threads_per_replica = threads_per_replica
+
+        self.model = None
+        self._replicas: list[SileroReplica] = []
+        self._idle: list[SileroReplica] = []
+        self._cond = threading.Condition()
+        self._generation = 0
+
+    def set_model(self, model):
+        with self._cond:
+            self.model = model
+            self._generation += 1
+            self._build_replicas()
+            self._cond.notify_all()
+
+    def resize(self, replicas: int, threads_per_replica: int | None = None):
+        with self._cond:
+            self.replicas_count = max(1, int(replicas))
+            self.threads_per_replica = threads_per_replica
+            self._generation += 1
+            self._build_replicas()
+            self._cond.notify_all()
+
+    def apply_tts(self, sample_rate: int, **kwargs):
+        """Synthesize on the first idle replica, blocking while all are busy"""
+        replica, generation = self._acquire()
+        if replica is None:
+            return None
+
+        started = monotonic()
+        audio = None
+        try:
+            no_grad = torch_no_grad()
+            with no_grad():
+                audio = replica.model.apply_tts(sample_rate=sample_rate, **kwargs)
+            return audio
+        finally:
+            elapsed = monotonic() - started
+            with self._cond:
+                if audio is not None:
+                    replica.clips += 1
+                    replica.synth_seconds += elapsed
+                    replica.audio_seconds += len(audio) / sample_rate
+                if generation == self._generation:
+                    self._idle.append(replica)
+                    self._cond.notify()
+
+    def stats(self) -> list[dict]:
+        with self._cond:
+            return [
+                {
+                    "index": replica.index,
+                    "threads": replica.threads,
+                    "clips": replica.clips,
+                    "rtf": replica.rtf(),
+                    "busy": replica not in self._idle,
+                }
+                for replica in self._replicas
+            ]
+
+    def _acquire(self) -> tuple[SileroReplica | None, int]:
+        with self._cond:
+            while self.model is not None and not self._idle:
+                self._cond.wait()
+            if self.model is None:
+                return None, self._generation
+            return self._idle.pop(), self._generation
+
+    def _build_replicas(self):
+        self._replicas = []
+        self._idle = []
+        if self.model is None:
+            return
+
+        threads = self.threads_per_replica or default_tts_threads(self.replicas_count)
+        for index in range(self.replicas_count):
+            model = self.model
+            if index > 0:
+                try:
+                    model = copy.copy(self.model)
+                except Exception as e:
+                    logger.error("Failed to copy Silero model. %s", str(e))
+                    break
+            self._replicas.append(SileroReplica(index, model, threads))
+        self._idle = list(reversed(self._replicas))
+
+        try:
+            from torch import set_num_threads
+
+            set_num_threads(threads)
+        except Exception as e:
+            logger.error("Failed to set torch threads. %s", str(e))
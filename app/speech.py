@@ -0,0 +1,219 @@
+from collections import deque
+import threading
+from time import monotonic
+from typing import Iterator
+
+import numpy as np
+
+# Seconds of speech per character at the "medium" rate, before any clip is measured
+DEFAULT_SECONDS_PER_CHAR = {
+    "ru": 0.075,
+    "en": 0.065,
+}
+SPEECH_RATE_FACTOR = {
+    "x-slow": 1.5,
+    "slow": 1.25,
+    "medium": 1.0,
+    "fast": 0.8,
+    "x-fast": 0.65,
+}
+
+
+class SpeechDurationEstimator:
+    """Projects the spoken duration of text before it is synthesized.
+
+    Starts from per-language defaults and follows measured clip durations
+    with an exponential moving average, normalized to the "medium" rate so
+    one measurement serves every rate.
+    """
+
+    def __init__(self, smoothing: float = 0.2):
+        self.smoothing = smoothing
+        self._seconds_per_char: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def estimate(self, text_length: int, language: str, speech_rate: str) -> float:
+        with self._lock:
+            seconds_per_char = self._seconds_per_char.get(language)
+        if seconds_per_char is None:
+            seconds_per_char = DEFAULT_SECONDS_PER_CHAR.get(language, 0.07)
+        rate_factor = SPEECH_RATE_FACTOR.get(speech_rate, 1.0)
+        return text_length * seconds_per_char * rate_factor
+
+    def observe(
+        self, text_length: int, language: str, speech_rate: str, seconds: float
+    ):
+        if text_length <= 0 or seconds <= 0:
+            return
+        rate_factor = SPEECH_RATE_FACTOR.get(speech_rate, 1.0)
+        seconds_per_char = seconds / text_length / rate_factor
+        with self._lock:
+            previous = self._seconds_per_char.get(language)
+            if previous is None:
+                self._seconds_per_char[language] = seconds_per_char
+            else:
+                self._seconds_per_char[language] = previous + self.smoothing * (
+                    seconds_per_char - previous
+                )
+
+
+class SpeechItem:
+    """One accepted chat message on its way to the speaker.
+
+    The item is queued as text and rendered just in time; the audio is then
+    streamed chunk by chunk from synthesis to the player.
+    """
+
+    def __init__(
+        self,
+        platform: str = "",
+        author: str = "",
+        text: str = "",
+        is_donate: bool = False,
+        received_at: float | None = None,
+        max_wait: float = 0.0,
+        tier: str = "regular",
+        msg_id: str = "",
+        author_key: str = "",
+        connection_token: int | None = None,
+        trace=None,
+    ):
+        self.platform = platform
+        self.author = author
+        self.text = text
+        self.is_donate = is_donate
+        self.tier = tier
+        # Identity of the chat message, the author is the raw "platform:login"
+        self.msg_id = msg_id
+        self.author_key = author_key
+        self.connection_token = connection_token
+        # MessageTrace while latency tracing is on
+        self.trace = trace
+        self.received_at = monotonic() if received_at is None else received_at
+        self.enqueued_at = self.received_at
+        self.deadline = self.received_at + max_wait if max_wait > 0 else None
+        self.estimated_seconds = 0.0
+        # Set by the audio thread when the first frame of the item is heard
+        self.audio_started_at: float | None = None
+        self.is_rendering = False
+        self.cancelled = False
+        # Called once when the item is played out or cancelled
+        self.on_finish = None
+
+        self._chunks: deque[np.ndarray] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._finished = False
+
+    @property
+    def text_length(self) -> int:
+        return len(self.text) + len(self.author)
+
+    def is_stale(self, now: float | None = None) -> bool:
+        if self.deadline is None:
+            return False
+        return (monotonic() if now is None else now) > self.deadline
+
+    def mark_audio_started(self, started_at: float | None = None):
+        if self.audio_started_at is None:
+            self.audio_started_at = monotonic() if started_at is None else started_at
+            if self.trace is not None:
+                self.trace.mark("playback_start", self.audio_started_at)
+
+    def push(self, audio: np.ndarray):
+        with self._cond:
+            if self._closed:
+                return
+            self._chunks.append(audio)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def cancel(self):
+        with self._cond:
+            self.cancelled = True
+            self._closed = True
+            self._chunks.clear()
+            self._cond.notify_all()
+        self._finish()
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """Yield chunks as they are synthesized until the item is closed"""
+        while True:
+            with self._cond:
+                while not self._chunks and not self._closed:
+                    self._cond.wait()
+                if not self._chunks:
+                    break
+                audio = self._chunks.popleft()
+            yield audio
+        self._finish()
+
+    def _finish(self):
+        with self._cond:
+            if self._finished:
+                return
+            self._finished = True
+            on_finish = self.on_finish
+        if on_finish is not None:
+            on_finish(self)
+
+
+class SpeechIndex:
+    """Live speech items by message, author, connection and platform.
+
+    Every key but the connection one also holds the token, so a purge from
+    one connection leaves a replay or a newer connection alone. A purge pops
+    one key and touches only the items under it, however many other messages
+    are queued. Not thread-safe; callers hold their own lock.
+    """
+
+    def __init__(self):
+        self._items: dict[tuple, set[SpeechItem]] = {}
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def keys(item: SpeechItem) -> tuple:
+        return (
+            ("message", item.connection_token, item.platform, item.msg_id),
+            ("author", item.connection_token, item.author_key),
+            ("connection", item.connection_token),
+            ("platform", item.connection_token, item.platform),
+        )
+
+    def add(self, item: SpeechItem):
+        for key in self.keys(item):
+            self._items.setdefault(key, set()).add(item)
+        self._count += 1
+
+    def discard(self, item: SpeechItem):
+        is_tracked = False
+        for key in self.keys(item):
+            items = self._items.get(key)
+            if items is None or item not in items:
+                continue
+            is_tracked = True
+            items.discard(item)
+            if not items:
+                del self._items[key]
+        if is_tracked:
+            self._count -= 1
+
+    def pop(self, key: tuple) -> set[SpeechItem]:
+        items = self._items.pop(key, set())
+        for item in items:
+            for other_key in self.keys(item):
+                others = self._items.get(other_key)
+                if others is None:
+                    continue
+                others.discard(item)
+                if not others:
+                    del self._items[other_key]
+        self._count -= len(items)
+        return items
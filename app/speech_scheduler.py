@@ -0,0 +1,209 @@
+from bisect import bisect_left
+from collections import deque
+import threading
+from time import monotonic
+
+SPEECH_TIERS = ("donation", "owner", "moderator", "sponsor", "regular")
+# Translation keys shared with the read filter
+SPEECH_TIER_NAMES = {
+    "donation": "Donation",
+    "owner": "Author",
+    "moderator": "Moderator",
+    "sponsor": "Sponsor",
+    "regular": "Regular",
+}
+
+WAIT_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64)
+
+
+def speech_tier(
+    is_donate=False, is_owner=False, is_staff=False, is_sponsor=False
+) -> str:
+    if is_donate:
+        return "donation"
+    if is_owner:
+        return "owner"
+    if is_staff:
+        return "moderator"
+    if is_sponsor:
+        return "sponsor"
+    return "regular"
+
+
+def tier_settings(value, defaults: dict[str, int], minimum: int = 0) -> dict:
+    """Per-tier integers from the settings file merged over the defaults.
+
+    Unknown tiers and values that are not numbers are ignored.
+    """
+    merged = dict(defaults)
+    if not isinstance(value, dict):
+        return merged
+    for name, number in value.items():
+        if name not in defaults or isinstance(number, bool):
+            continue
+        if isinstance(number, (int, float)):
+            merged[name] = max(minimum, int(number))
+    return merged
+
+
+class Histogram:
+    """Fixed-bucket histogram; the last bucket collects everything above the bounds"""
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.total:
+            return 0.0
+        target = q * self.total
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.bounds[idx] if idx < len(self.bounds) else float("inf")
+        return float("inf")
+
+
+class _Tier:
+    __slots__ = ("name", "weight", "cap", "items", "pass_value", "waits", "depths")
+
+    def __init__(self, name: str, weight: int, cap: int):
+        self.name = name
+        self.weight = max(1, int(weight))
+        self.cap = max(0, int(cap))
+        self.items: deque = deque()
+        self.pass_value = 0.0
+        self.waits = Histogram(WAIT_BUCKETS)
+        self.depths = Histogram(DEPTH_BUCKETS)
+
+
+class SpeechScheduler:
+    """Weighted priority queue of speech items with FIFO order inside a tier.
+
+    Tiers are picked by stride scheduling: every pop advances the chosen
+    tier by 1 / weight, so a heavier tier is served proportionally more
+    often without starving the lighter ones. A cap of 0 means unbounded;
+    a full tier drops its oldest item, keeping the latest messages.
+
+    The scheduler never blocks; callers wait on their own condition.
+    """
+
+    def __init__(self, weights: dict[str, int], caps: dict[str, int]):
+        self._lock = threading.Lock()
+        self._tiers = {
+            name: _Tier(name, weights.get(name, 1), caps.get(name, 0))
+            for name in SPEECH_TIERS
+        }
+
+    def put(self, item, tier: str) -> list:
+        """Append an item to its tier and return the items dropped to make room"""
+        dropped = []
+        with self._lock:
+            queue = self._tiers[tier]
+            if not queue.items:
+                # An idle tier rejoins at the current pass instead of catching up
+                queue.pass_value = max(queue.pass_value, self._min_pass())
+            item.enqueued_at = monotonic()
+            queue.items.append(item)
+            while queue.cap and len(queue.items) > queue.cap:
+                dropped.append(queue.items.popleft())
+            queue.depths.observe(len(queue.items))
+        return dropped
+
+    def pop(self):
+        with self._lock:
+            candidates = [queue for queue in self._tiers.values() if queue.items]
+            if not candidates:
+                return None
+            queue = min(
+                candidates,
+                key=lambda q: (q.pass_value, SPEECH_TIERS.index(q.name)),
+            )
+            queue.pass_value += 1 / queue.weight
+            item = queue.items.popleft()
+            queue.waits.observe(monotonic() - item.enqueued_at)
+            if len(candidates) == 1 and not queue.items:
+                for tier in self._tiers.values():
+                    tier.pass_value = 0.0
+            return item
+
+    def drop_oldest(self, tier: str):
+        with self._lock:
+            queue = self._tiers[tier]
+            return queue.items.popleft() if queue.items else None
+
+    def remove(self, items) -> int:
+        """Take the given items out of their tiers; one pass per affected tier"""
+        removed = 0
+        with self._lock:
+            for name in {item.tier for item in items}:
+                queue = self._tiers.get(name)
+                if queue is None or not queue.items:
+                    continue
+                kept = [item for item in queue.items if item not in items]
+                removed += len(queue.items) - len(kept)
+                queue.items = deque(kept)
+        return removed
+
+    def set_weight(self, tier: str, weight: int):
+        with self._lock:
+            self._tiers[tier].weight = max(1, int(weight))
+
+    def set_cap(self, tier: str, cap: int) -> list:
+        dropped = []
+        with self._lock:
+            queue = self._tiers[tier]
+            queue.cap = max(0, int(cap))
+            while queue.cap and len(queue.items) > queue.cap:
+                dropped.append(queue.items.popleft())
+        return dropped
+
+    def clear(self, tiers=SPEECH_TIERS) -> list:
+        dropped = []
+        with self._lock:
+            for name in tiers:
+                dropped.extend(self._tiers[name].items)
+                self._tiers[name].items.clear()
+        return dropped
+
+    def depth(self, tier: str | None = None) -> int:
+        with self._lock:
+            if tier is not None:
+                return len(self._tiers[tier].items)
+            return sum(len(queue.items) for queue in self._tiers.values())
+
+    def has_pending(self) -> bool:
+        return self.depth() > 0
+
+    def items(self) -> list:
+        with self._lock:
+            return [item for queue in self._tiers.values() for item in queue.items]
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                name: {
+                    "depth": len(queue.items),
+                    "weight": queue.weight,
+                    "cap": queue.cap,
+                    "served": queue.waits.total,
+                    "wait_p50": queue.waits.quantile(0.5),
+                    "wait_p95": queue.waits.quantile(0.95),
+                    "wait_histogram": list(queue.waits.counts),
+                    "depth_p95": queue.depths.quantile(0.95),
+                    "depth_histogram": list(queue.depths.counts),
+                }
+                for name, queue in self._tiers.items()
+            }
+
+    def _min_pass(self) -> float:
+        active = [queue.pass_value for queue in self._tiers.values() if queue.items]
+        return min(active) if active else 0.0
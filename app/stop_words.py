@@ -0,0 +1,100 @@
+from typing import Iterable
+
+# Shorter stop words only match whole words, longer ones also match inside words
+MIN_SUBSTRING_LENGTH = 4
+
+
+class StopWordMatcher:
+    """Stop-word list compiled once into a word set and an Aho–Corasick automaton.
+
+    Iterates and sizes like the plain word list, so it can be shown in the
+    editor and saved back as is.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.words = tuple(words)
+        self.word_set = frozenset(self.words)
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        # Length of the longest stop word ending in each state
+        self._out: list[int] = [0]
+        self._build(
+            word for word in self.word_set if len(word) >= MIN_SUBSTRING_LENGTH
+        )
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word) -> bool:
+        return word in self.word_set
+
+    def find_spans(self, text: str) -> list[tuple[int, int]]:
+        """Overlapping hits of the long stop words in one pass over the text.
+
+        Hits are searched both in the text itself and in the text with spaces
+        removed; the latter are mapped back to positions in ``text``.
+        """
+        spans = []
+        if len(self._goto) == 1:
+            return spans
+
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        state = 0
+        joined_state = 0
+        joined_index = []
+
+        for idx, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                spans.append((idx + 1 - out[state], idx + 1))
+
+            if char == " ":
+                continue
+            joined_index.append(idx)
+            while joined_state and char not in goto[joined_state]:
+                joined_state = fail[joined_state]
+            joined_state = goto[joined_state].get(char, 0)
+            length = out[joined_state]
+            if length:
+                spans.append((joined_index[-length], idx + 1))
+
+        return spans
+
+    def contains(self, text: str) -> bool:
+        if any(word in self.word_set for word in text.split()):
+            return True
+        return bool(self.find_spans(text))
+
+    def _build(self, words: Iterable[str]):
+        goto = self._goto
+        out = self._out
+        for word in words:
+            state = 0
+            for char in word:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    out.append(0)
+                state = next_state
+            out[state] = max(out[state], len(word))
+
+        fail = self._fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                out[next_state] = max(out[next_state], out[fail[next_state]])
@@ -0,0 +1,151 @@
+from collections import deque
+from logging import getLogger
+import threading
+from time import monotonic
+
+logger = getLogger("main")
+
+
+class _ToxicityRequest:
+    __slots__ = ("text", "result", "error", "done", "submitted_at")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.result: dict | None = None
+        self.error: Exception | None = None
+        self.done = threading.Event()
+        self.submitted_at = monotonic()
+
+    def wait(self) -> dict | None:
+        """Scores of the text; raises if they could not be predicted, so a
+        failed model never lets a message through unchecked"""
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class ToxicityBatcher:
+    """Micro-batching collector in front of Detoxify.predict()"""
+
+    def __init__(self, model, max_batch_size: int = 8, max_wait_ms: int = 15):
+        self.model = model
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0, int(max_wait_ms))
+
+        self._pending: deque[_ToxicityRequest] = deque()
+        self._cond = threading.Condition()
+        self._is_stopping = False
+
+        self._stats_lock = threading.Lock()
+        self.batches_count = 0
+        self.items_count = 0
+        self.last_batch_size = 0
+        self.max_seen_batch_size = 0
+        self.last_latency_ms = 0.0
+        self.total_latency_ms = 0.0
+        self.total_inference_ms = 0.0
+
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="toxicity_batcher"
+        )
+        self._thread.start()
+
+    def predict(self, text: str) -> dict | None:
+        """Score a single text, blocking until its batch has been predicted"""
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts: list[str]) -> list[dict | None]:
+        requests = self.submit_many(texts)
+        return [request.wait() for request in requests]
+
+    def submit(self, text: str) -> _ToxicityRequest:
+        """Queue a text without waiting; call ``wait()`` on the result later"""
+        return self.submit_many([text])[0]
+
+    def submit_many(self, texts: list[str]) -> list[_ToxicityRequest]:
+        requests = [_ToxicityRequest(text) for text in texts]
+        if not requests:
+            return []
+
+        with self._cond:
+            if self._is_stopping:
+                for request in requests:
+                    request.error = RuntimeError("Toxicity batcher is stopped")
+                    request.done.set()
+                return requests
+            self._pending.extend(requests)
+            self._cond.notify_all()
+        return requests
+
+    def stop(self):
+        with self._cond:
+            self._is_stopping = True
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            batches = max(1, self.batches_count)
+            items = max(1, self.items_count)
+            return {
+                "batches": self.batches_count,
+                "items": self.items_count,
+                "last_batch_size": self.last_batch_size,
+                "max_batch_size": self.max_seen_batch_size,
+                "avg_batch_size": self.items_count / batches,
+                "last_latency_ms": self.last_latency_ms,
+                "avg_latency_ms": self.total_latency_ms / items,
+                "avg_inference_ms": self.total_inference_ms / batches,
+            }
+
+    def _collect(self) -> list[_ToxicityRequest] | None:
+        with self._cond:
+            while not self._pending and not self._is_stopping:
+                self._cond.wait()
+
+            if not self._pending:
+                return None
+
+            deadline = self._pending[0].submitted_at + self.max_wait_ms / 1000
+            while len(self._pending) < self.max_batch_size and not self._is_stopping:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch_size = min(len(self._pending), self.max_batch_size)
+            return [self._pending.popleft() for _ in range(batch_size)]
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self._predict_batch(batch)
+
+    def _predict_batch(self, batch: list[_ToxicityRequest]):
+        started = monotonic()
+        try:
+            scores = self.model.predict([request.text for request in batch])
+            for idx, request in enumerate(batch):
+                request.result = {
+                    label: float(values[idx]) for label, values in scores.items()
+                }
+        except Exception as e:
+            logger.exception(e)
+            for request in batch:
+                request.error = e
+        finally:
+            finished = monotonic()
+            with self._stats_lock:
+                self.batches_count += 1
+                self.items_count += len(batch)
+                self.last_batch_size = len(batch)
+                self.max_seen_batch_size = max(self.max_seen_batch_size, len(batch))
+                self.total_inference_ms += (finished - started) * 1000
+                for request in batch:
+                    latency_ms = (finished - request.submitted_at) * 1000
+                    self.total_latency_ms += latency_ms
+                    self.last_latency_ms = latency_ms
+            for request in batch:
+                request.done.set()
@@ -0,0 +1,262 @@
+from collections import deque
+from itertools import count
+import json
+import threading
+from time import monotonic, time
+
+from app.speech_scheduler import Histogram
+
+# Moments a message passes on its way from the platform to the speaker
+TRACE_STAGES = (
+    "sent",
+    "received",
+    "dequeued",
+    "normalized",
+    "classified",
+    "enqueued",
+    "rendering",
+    "synthesized",
+    "playback_start",
+    "playback_end",
+)
+# Reported intervals: name, start stage, end stage
+TRACE_SPANS = (
+    ("platform", "sent", "received"),
+    ("ingest", "received", "dequeued"),
+    ("normalize", "dequeued", "normalized"),
+    ("classify", "normalized", "classified"),
+    ("queue", "enqueued", "rendering"),
+    ("synthesize", "rendering", "synthesized"),
+    ("playback_wait", "synthesized", "playback_start"),
+    ("playback", "playback_start", "playback_end"),
+    ("total", "received", "playback_start"),
+)
+_SPANS_BY_END = {
+    stage: tuple((name, start) for name, start, end in TRACE_SPANS if end == stage)
+    for stage in TRACE_STAGES
+}
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    120,
+)
+TRACE_WINDOW_SECONDS = 600
+TRACE_MAX_MESSAGES = 50_000
+HISTOGRAM_SLOT_SECONDS = 60
+HISTOGRAM_WINDOW_SECONDS = 300
+
+
+class MessageTrace:
+    """Monotonic timestamps of one chat message; a stage marked twice keeps the last"""
+
+    __slots__ = ("trace_id", "msg_id", "platform", "marks", "_tracer")
+
+    def __init__(self, tracer, trace_id: int, msg_id: str, platform: str):
+        self.trace_id = trace_id
+        self.msg_id = msg_id
+        self.platform = platform
+        self.marks: dict[str, float] = {}
+        self._tracer = tracer
+
+    def mark(self, stage: str, at: float | None = None):
+        at = monotonic() if at is None else at
+        self.marks[stage] = at
+        for span, start_stage in _SPANS_BY_END[stage]:
+            started_at = self.marks.get(start_stage)
+            # Speculative synthesis can render before the item is queued
+            if started_at is not None and at >= started_at:
+                self._tracer.observe(span, at - started_at)
+
+    def mark_once(self, stage: str):
+        if stage not in self.marks:
+            self.mark(stage)
+
+
+class LatencyTracer:
+    """Keeps traces of recent messages and rolling per-span histograms.
+
+    While disabled ``start`` returns None, so traced code only pays for an
+    ``is not None`` check.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        window_seconds: float = TRACE_WINDOW_SECONDS,
+        max_messages: int = TRACE_MAX_MESSAGES,
+        histogram_window_seconds: float = HISTOGRAM_WINDOW_SECONDS,
+    ):
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+        self.histogram_window_seconds = histogram_window_seconds
+        self._traces: deque[MessageTrace] = deque(maxlen=max_messages)
+        self._ids = count(1)
+        # (slot, {span: Histogram}), one slot per HISTOGRAM_SLOT_SECONDS
+        self._slots: deque[tuple[int, dict[str, Histogram]]] = deque()
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        msg_id,
+        platform: str,
+        received_at: float | None = None,
+        sent_at: float | None = None,
+    ) -> MessageTrace | None:
+        """Open a trace; ``sent_at`` is the platform's wall-clock send time"""
+        if not self.enabled:
+            return None
+        trace = MessageTrace(self, next(self._ids), str(msg_id), platform)
+        received_at = monotonic() if received_at is None else received_at
+        if sent_at:
+            trace.marks["sent"] = sent_at - (time() - monotonic())
+        trace.mark("received", received_at)
+        with self._lock:
+            self._traces.append(trace)
+            cutoff = received_at - self.window_seconds
+            while self._traces and self._traces[0].marks["received"] < cutoff:
+                self._traces.popleft()
+        return trace
+
+    def observe(self, span: str, seconds: float):
+        slot = int(monotonic() // HISTOGRAM_SLOT_SECONDS)
+        with self._lock:
+            if not self._slots or self._slots[-1][0] != slot:
+                self._slots.append((slot, {}))
+                oldest = slot - self.histogram_window_seconds // HISTOGRAM_SLOT_SECONDS
+                while self._slots[0][0] <= oldest:
+                    self._slots.popleft()
+            histograms = self._slots[-1][1]
+            histogram = histograms.get(span)
+            if histogram is None:
+                histogram = histograms[span] = Histogram(LATENCY_BUCKETS)
+            histogram.observe(seconds)
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+            self._slots.clear()
+
+    def stats(self) -> dict:
+        """Per-span counts and bucket quantiles over the histogram window"""
+        oldest = (
+            int(monotonic() // HISTOGRAM_SLOT_SECONDS)
+            - self.histogram_window_seconds // HISTOGRAM_SLOT_SECONDS
+        )
+        merged: dict[str, Histogram] = {}
+        with self._lock:
+            for slot, histograms in self._slots:
+                if slot <= oldest:
+                    continue
+                for span, histogram in histograms.items():
+                    total = merged.get(span)
+                    if total is None:
+                        total = merged[span] = Histogram(LATENCY_BUCKETS)
+                    for idx, bucket_count in enumerate(histogram.counts):
+                        total.counts[idx] += bucket_count
+                    total.total += histogram.total
+
+        result = {}
+        for span, _start, _end in TRACE_SPANS:
+            histogram = merged.get(span)
+            if histogram is None:
+                continue
+            result[span] = {
+                "count": histogram.total,
+                "p50": histogram.quantile(0.5),
+                "p95": histogram.quantile(0.95),
+                "p99": histogram.quantile(0.99),
+                "histogram": list(histogram.counts),
+            }
+        return result
+
+    def chrome_trace(self, seconds: float | None = None) -> dict:
+        """Traces received in the last ``seconds`` in the Chrome trace event format.
+
+        Every message is an async track named after its platform and id,
+        with one nested slice per span; Perfetto and chrome://tracing open
+        the file as is.
+        """
+        now = monotonic()
+        cutoff = now - (self.window_seconds if seconds is None else seconds)
+        with self._lock:
+            traces = [
+                trace for trace in self._traces if trace.marks["received"] >= cutoff
+            ]
+
+        events = [
+            {
+                "ph": "M",
+                "pid": 1,
+                "name": "process_name",
+                "args": {"name": "Chat to speech"},
+            }
+        ]
+        for trace in traces:
+            # The dict may still grow while the message is being processed
+            marks = dict(trace.marks)
+            first = min(marks.values())
+            last = max(marks.values())
+            track = {
+                "cat": "message",
+                "id": trace.trace_id,
+                "pid": 1,
+                "tid": 1,
+            }
+            events.append(
+                {
+                    **track,
+                    "ph": "b",
+                    "name": f"{trace.platform} {trace.msg_id}",
+                    "ts": _to_us(first),
+                    "args": {"msg_id": trace.msg_id, "platform": trace.platform},
+                }
+            )
+            for span, start_stage, end_stage in TRACE_SPANS:
+                if span == "total":
+                    continue
+                started_at = marks.get(start_stage)
+                ended_at = marks.get(end_stage)
+                if started_at is None or ended_at is None or ended_at < started_at:
+                    continue
+                events.append(
+                    {**track, "ph": "b", "name": span, "ts": _to_us(started_at)}
+                )
+                events.append(
+                    {**track, "ph": "e", "name": span, "ts": _to_us(ended_at)}
+                )
+            events.append(
+                {
+                    **track,
+                    "ph": "e",
+                    "name": f"{trace.platform} {trace.msg_id}",
+                    "ts": _to_us(last),
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str, seconds: float | None = None) -> int:
+        """Write chrome_trace() to ``path``; returns the number of messages"""
+        trace = self.chrome_trace(seconds)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False)
+        return sum(
+            1
+            for event in trace["traceEvents"]
+            if event["ph"] == "b" and "args" in event
+        )
+
+
+def _to_us(seconds: float) -> float:
+    return round(seconds * 1_000_000, 1)
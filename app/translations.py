@@ -2,6 +2,7 @@ import asyncio
 import inspect
 import locale
 import multiprocessing
+import re
 
 from googletrans import Translator
 
@@ -226,6 +227,73 @@ TRANSLATIONS = {
         "Search": "Поиск",
         "Clear list": "Очистить список",
         "Clear banned list?": "Очистить список заблокированных?",
+        "Toxicity batch size": "Размер пакета проверки токсичности",
+        "Toxicity batch wait (ms)": "Ожидание пакета проверки токсичности (мс)",
+        "batches": "пакетов",
+        "avg batch": "средний пакет",
+        "max": "макс",
+        "latency": "задержка",
+        "inference": "инференс",
+        "Playback": "Воспроизведение",
+        "start latency": "задержка старта",
+        "last": "последняя",
+        "buffer": "буфер",
+        "Cache": "Кэш",
+        "hits": "попаданий",
+        "misses": "промахов",
+        "evicted": "вытеснено",
+        "Speech cache": "Кэш озвучки",
+        "from disk": "с диска",
+        "on disk": "на диске",
+        "Cache speech on disk": "Кэшировать озвучку на диске",
+        "Speech cache size (MB)": "Размер кэша озвучки (МБ)",
+        "Stream speech by sentences": "Озвучивать по предложениям",
+        "Speech synthesis replicas": "Параллельных копий синтеза речи",
+        "Synthesis": "Синтез",
+        "replica": "копия",
+        "threads": "потоков",
+        "clips": "фрагментов",
+        "Synthesize during toxicity check": "Синтезировать во время проверки токсичности",
+        "Speculative synthesis": "Упреждающий синтез",
+        "wasted": "впустую",
+        "skipped": "пропущено",
+        "Skip messages waiting longer than (s)": "Пропускать сообщения, ждущие дольше (с)",
+        "Skipped as stale": "Пропущено как устаревшие",
+        "over backlog": "сверх лимита очереди",
+        "Maximum backlog (s)": "Максимальная очередь (с)",
+        "sec": "с",
+        "in queue": "в очереди",
+        "wait": "ожидание",
+        "played": "озвучено",
+        "Duplicates": "Дубликаты",
+        "remembered IDs": "запомнено ID",
+        "min": "мин",
+        "false positives": "ложные совпадения",
+        "removed": "удалено",
+        "Chat recording": "Запись чата",
+        "Record chat": "Записывать чат",
+        "Replay recording": "Воспроизвести запись",
+        "Stop replay": "Остановить воспроизведение",
+        "Max": "Макс.",
+        "Chat recording error": "Ошибка записи чата",
+        "Chat recording saved": "Запись чата сохранена",
+        "Replay started": "Воспроизведение записи",
+        "Replay finished": "Воспроизведение завершено",
+        "Latency tracing": "Трассировка задержек",
+        "Trace latency": "Трассировать задержки",
+        "Export trace": "Экспорт трассы",
+        "Trace export error": "Ошибка экспорта трассы",
+        "Trace exported": "Трасса сохранена",
+        "Latency": "Задержка",
+        "platform": "платформа",
+        "ingest": "приём",
+        "normalize": "нормализация",
+        "classify": "классификация",
+        "queue": "очередь",
+        "synthesize": "синтез",
+        "playback_wait": "ожидание воспроизведения",
+        "playback": "воспроизведение",
+        "total": "итого",
     },
 }
 
@@ -357,6 +425,27 @@ _LAT_TO_CYR = {
     "&": " и ",
 }
 _LAT_TO_CYR_MAX_KEY_LEN = max(len(key) for key in _LAT_TO_CYR)
+# Longest key first, so the alternation picks the same chunk as the greedy scan
+_LAT_TO_CYR_RE = re.compile(
+    "|".join(re.escape(key) for key in sorted(_LAT_TO_CYR, key=len, reverse=True))
+)
+
+
+def _cyr_to_lat_table() -> dict[int, str]:
+    table = {}
+    for key, base in _CYR_TO_LAT.items():
+        table[ord(key)] = base
+        upper = key.upper()
+        if upper != key and len(upper) == 1 and upper.lower() == key:
+            table[ord(upper)] = base[:1].upper() + base[1:]
+    return table
+
+
+_CYR_TO_LAT_TABLE = _cyr_to_lat_table()
+_SYMBOLS_TABLES = {
+    lang: str.maketrans({char: names[lang] for char, names in _SYMBOLS.items()})
+    for lang in ("ru", "en")
+}
 
 
 def _map_char_with_case(ch: str, mapping: dict[str, str]) -> str:
@@ -371,14 +460,7 @@ def _map_char_with_case(ch: str, mapping: dict[str, str]) -> str:
 
 
 def map_symbols(text: str, lang: str) -> str:
-    src = str(text or "")
-    string = ""
-    for char in src:
-        if char in _SYMBOLS.keys():
-            string += _SYMBOLS[char][lang]
-        else:
-            string += char
-    return string
+    return str(text or "").translate(_SYMBOLS_TABLES[lang])
 
 
 def transliteration(text: str, lang: str) -> str:
@@ -391,8 +473,20 @@ def transliteration(text: str, lang: str) -> str:
     src = str(text or "")
     target = str(lang or "").strip().lower()
     if target == "en":
-        return "".join(_map_char_with_case(ch, _CYR_TO_LAT) for ch in src)
+        return src.translate(_CYR_TO_LAT_TABLE)
     if target == "ru":
+        lowered = src.lower()
+        if len(lowered) == len(src):
+            out = []
+            last_end = 0
+            for match in _LAT_TO_CYR_RE.finditer(lowered):
+                start, end = match.span()
+                out.append(src[last_end:start])
+                out.append(_lat_to_cyr_chunk(src[start:end], match.group()))
+                last_end = end
+            out.append(src[last_end:])
+            return "".join(out)
+        # Lowercasing changed the length, fall back to the per-position scan
         out = []
         i = 0
         n = len(src)
@@ -418,6 +512,13 @@ def transliteration(text: str, lang: str) -> str:
     return src
 
 
+def _lat_to_cyr_chunk(chunk: str, key: str) -> str:
+    mapped = _LAT_TO_CYR[key]
+    if chunk.isalpha() and chunk.isupper():
+        mapped = mapped[:1].upper() + mapped[1:]
+    return mapped
+
+
 def _(lang, key):
     """Simple translation helper"""
     return TRANSLATIONS.get(lang, {}).get(key, key)
@@ -0,0 +1,218 @@
+from collections import OrderedDict
+import hashlib
+import json
+from logging import getLogger
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+logger = getLogger("main")
+
+
+def tts_cache_key(
+    ssml_text: str,
+    speaker: str,
+    language: str,
+    add_accents: bool,
+    speech_rate: str,
+    sample_rate: int,
+) -> str:
+    payload = json.dumps(
+        [ssml_text, speaker, language, bool(add_accents), speech_rate, sample_rate],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Byte-bounded LRU of synthesized float32 clips with an optional disk tier"""
+
+    def __init__(
+        self,
+        max_bytes: int,
+        cache_dir: str | None = None,
+        max_disk_bytes: int = 0,
+    ):
+        self.max_bytes = max(0, int(max_bytes))
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max(0, int(max_disk_bytes))
+
+        self._items: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._disk_bytes = self._scan_disk()
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            audio = self._items.get(key)
+            if audio is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        audio = self._load_from_disk(key)
+        with self._lock:
+            if audio is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._store(key, audio)
+        return audio
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            if key in self._items:
+                return True
+        return self.cache_dir is not None and os.path.isfile(self._disk_path(key))
+
+    def put(self, key: str, audio) -> np.ndarray:
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        with self._lock:
+            self._store(key, audio)
+        self._save_to_disk(key, audio)
+        return audio
+
+    def resize(self, max_bytes: int):
+        with self._lock:
+            self.max_bytes = max(0, int(max_bytes))
+            self._evict()
+
+    def set_cache_dir(self, cache_dir: str | None):
+        self.cache_dir = cache_dir
+        disk_bytes = self._scan_disk()
+        with self._lock:
+            self._disk_bytes = disk_bytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "items": len(self._items),
+                "bytes": self._bytes,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    # == Memory tier ==
+
+    def _store(self, key: str, audio: np.ndarray):
+        previous = self._items.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        if audio.nbytes > self.max_bytes:
+            return
+        self._items[key] = audio
+        self._bytes += audio.nbytes
+        self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._items:
+            _key, audio = self._items.popitem(last=False)
+            self._bytes -= audio.nbytes
+            self.evictions += 1
+
+    # == Disk tier ==
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def _scan_disk(self) -> int:
+        if not self.cache_dir or not os.path.isdir(self.cache_dir):
+            return 0
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".npy"):
+                total += entry.stat().st_size
+        return total
+
+    def _load_from_disk(self, key: str) -> np.ndarray | None:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        if not os.path.isfile(path):
+            return None
+        try:
+            # A full copy: a memmap would keep the file open, so it could not
+            # be trimmed on Windows, and its size would not be resident memory
+            audio = np.load(path)
+            os.utime(path)
+            return audio
+        except Exception as e:
+            logger.error("Failed to load cached speech %s. %s", path, str(e))
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _save_to_disk(self, key: str, audio: np.ndarray):
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        if os.path.isfile(path):
+            return
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Unique per writer, two workers can render the same key at once
+            with tempfile.NamedTemporaryFile(
+                dir=self.cache_dir, suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                np.save(f, audio)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except OSError as e:
+            logger.error("Failed to save cached speech %s. %s", path, str(e))
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+
+        with self._lock:
+            self._disk_bytes += size
+            is_over = self.max_disk_bytes and self._disk_bytes > self.max_disk_bytes
+        if is_over:
+            self._trim_disk()
+
+    def _trim_disk(self):
+        entries = [
+            entry
+            for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and entry.name.endswith(".npy")
+        ]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        target = self.max_disk_bytes * 0.9
+        removed = 0
+        for entry in entries:
+            if total <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+                removed += size
+            except OSError:
+                pass
+        # Concurrent saves keep counting while the directory is scanned
+        with self._lock:
+            self._disk_bytes = max(0, self._disk_bytes - removed)
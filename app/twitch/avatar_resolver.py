@@ -0,0 +1,236 @@
+import json
+from logging import getLogger
+import os
+import threading
+from time import time
+
+import requests
+
+logger = getLogger("main")
+
+HELIX_USERS_URL = "https://api.twitch.tv/helix/users"
+# Helix accepts up to 100 login parameters per request
+BATCH_SIZE = 100
+# Time to collect more logins before a request goes out
+BATCH_DELAY = 0.25
+REQUEST_TIMEOUT = 10
+AVATAR_TTL = 7 * 24 * 60 * 60
+# Users without an avatar or an account are asked for again sooner
+MISSING_TTL = 60 * 60
+SAVE_DELAY = 5
+
+
+def _normalize_login(username: str | None) -> str:
+    return str(username or "").strip().lower()
+
+
+def _normalize_avatar_url(url: str | None) -> str | None:
+    avatar_url = str(url or "").strip()
+    if not avatar_url:
+        return None
+
+    return avatar_url
+
+
+class TwitchAvatarResolver:
+    """Resolves chatter avatars in the background with batched Helix lookups.
+
+    ``get`` never touches the network: it returns the cached URL, or None
+    while the login waits for the next batch. Resolved URLs are kept in a
+    JSON file with a TTL so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        access_token: str,
+        cache_path: str | None = None,
+        ttl: float = AVATAR_TTL,
+        url: str = HELIX_USERS_URL,
+    ):
+        self.client_id = client_id
+        self.access_token = access_token
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.url = url
+
+        self._cache: dict[str, tuple[str | None, float]] = {}
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._is_stopping = False
+        self._is_dirty = False
+        self._saved_at = 0.0
+        self._thread = None
+        self._session = requests.Session()
+
+        self.requests_count = 0
+        self.resolved_count = 0
+        self.failed_count = 0
+
+        self._load()
+
+    def start(self):
+        if self._thread is not None or self._is_stopping:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Signal the resolver thread, which saves the cache on its way out"""
+        with self._wakeup:
+            self._is_stopping = True
+            self._wakeup.notify_all()
+        if self._thread is None:
+            self.save()
+            self._session.close()
+
+    def set_access_token(self, access_token: str):
+        with self._lock:
+            self.access_token = access_token
+
+    def get(self, username: str | None) -> str | None:
+        login = _normalize_login(username)
+        if not login:
+            return None
+
+        with self._wakeup:
+            cached = self._cache.get(login)
+            if cached is not None:
+                avatar_url, expires_at = cached
+                if expires_at > time():
+                    return avatar_url
+            # Without credentials, e.g. replaying a recording, only the cache is read
+            if login not in self._pending and self.client_id and self.access_token:
+                self._pending.add(login)
+                self._wakeup.notify()
+            return cached[0] if cached is not None else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached": len(self._cache),
+                "pending": len(self._pending),
+                "requests": self.requests_count,
+                "resolved": self.resolved_count,
+                "failed": self.failed_count,
+            }
+
+    def save(self):
+        if not self.cache_path:
+            return
+        with self._lock:
+            if not self._is_dirty:
+                return
+            now = time()
+            payload = {
+                login: [avatar_url, expires_at]
+                for login, (avatar_url, expires_at) in self._cache.items()
+                if expires_at > now
+            }
+            self._is_dirty = False
+            self._saved_at = now
+
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.cache_path)
+        except Exception as e:
+            logger.error("Failed to save avatar cache %s. %s", self.cache_path, str(e))
+
+    def _load(self):
+        if not self.cache_path:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error("Failed to load avatar cache %s. %s", self.cache_path, str(e))
+            return
+
+        now = time()
+        for login, entry in payload.items():
+            try:
+                avatar_url, expires_at = entry
+            except (TypeError, ValueError):
+                continue
+            if isinstance(expires_at, (int, float)) and expires_at > now:
+                self._cache[login] = (_normalize_avatar_url(avatar_url), expires_at)
+
+    def _run(self):
+        try:
+            self._resolve_loop()
+        finally:
+            self.save()
+            self._session.close()
+
+    def _resolve_loop(self):
+        while True:
+            with self._wakeup:
+                while not self._pending and not self._is_stopping:
+                    self._wakeup.wait(timeout=SAVE_DELAY)
+                    if self._is_dirty and time() - self._saved_at >= SAVE_DELAY:
+                        break
+                if self._is_stopping:
+                    return
+                if self._pending:
+                    # Let a burst of new chatters share one request
+                    self._wakeup.wait(timeout=BATCH_DELAY)
+                    if self._is_stopping:
+                        return
+                batch = sorted(self._pending)[:BATCH_SIZE]
+                access_token = self.access_token
+
+            if batch:
+                self._resolve(batch, access_token)
+            if time() - self._saved_at >= SAVE_DELAY:
+                self.save()
+
+    def _resolve(self, logins: list[str], access_token: str):
+        avatars = None
+        try:
+            response = self._session.get(
+                self.url,
+                params=[("login", login) for login in logins],
+                headers={
+                    "Client-ID": self.client_id,
+                    "Authorization": f"Bearer {access_token}",
+                },
+                timeout=REQUEST_TIMEOUT,
+            )
+            if response.status_code == 200:
+                avatars = {
+                    _normalize_login(user.get("login")): _normalize_avatar_url(
+                        user.get("profile_image_url")
+                    )
+                    for user in response.json().get("data", [])
+                }
+            else:
+                logger.error(
+                    "Failed to fetch Twitch avatars. HTTP %s", response.status_code
+                )
+        except Exception as e:
+            logger.error("Failed to fetch Twitch avatars. %s", str(e))
+
+        now = time()
+        with self._lock:
+            self.requests_count += 1
+            self._pending.difference_update(logins)
+            if avatars is None:
+                # Keep the placeholder for a while instead of retrying every message
+                self.failed_count += len(logins)
+                for login in logins:
+                    avatar_url = self._cache.get(login, (None, 0))[0]
+                    self._cache[login] = (avatar_url, now + MISSING_TTL)
+                return
+
+            for login in logins:
+                avatar_url = avatars.get(login)
+                ttl = self.ttl if avatar_url else MISSING_TTL
+                self._cache[login] = (avatar_url, now + ttl)
+                if avatar_url:
+                    self.resolved_count += 1
+            self._is_dirty = True
@@ -5,33 +5,25 @@ import socket
 from threading import Thread
 from time import sleep, time
 from urllib.parse import urlparse
-import requests
 
 from app.translations import _, translate_text
 from app.twitch.auth_worker import AuthWorker
+from app.twitch.avatar_resolver import TwitchAvatarResolver
+from app.twitch.irc_parser import (
+    CHAT_COMMANDS,
+    DONATION_MSG_IDS,
+    MODERATION_COMMANDS,
+    parse_message,
+)
 
 logger = getLogger("main")
 
 TIMEOUT = 5
+# One recv drains a whole burst of tagged lines instead of 4 KB slices
+RECV_BUFFER_SIZE = 65536
 MAX_RETRIES = 10
 SERVER = "irc.chat.twitch.tv"
 PORT = 6667
-DONATION_MSG_IDS = frozenset(
-    {
-        "sub",
-        "resub",
-        "subgift",
-        "anonsubgift",
-        "submysterygift",
-        "anonsubmysterygift",
-        "giftpaidupgrade",
-        "anongiftpaidupgrade",
-        "primepaidupgrade",
-        "standardpayforward",
-        "communitypayforward",
-    }
-)
-
 SOCKET_BROKEN_ERRORS = frozenset(
     {
         # Connection reset by peer
@@ -54,8 +46,6 @@ SOCKET_BROKEN_ERRORS = frozenset(
     }
 )
 
-_avatar_url_cache: dict[str, str | None] = {}
-
 
 class TwitchChatListener:
     def __init__(
@@ -73,6 +63,9 @@ class TwitchChatListener:
         on_expiries_access,
         on_expiries_refresh,
         lang="en",
+        avatar_cache_path=None,
+        on_purge=None,
+        on_record=None,
     ):
         self.client_id = client_id
         self.access = access
@@ -86,6 +79,8 @@ class TwitchChatListener:
         self.on_expiries_access = on_expiries_access
         self.on_expiries_refresh = on_expiries_refresh
         self.on_reconnect = on_reconnect
+        self.on_purge = on_purge
+        self.on_record = on_record
         self.lang = lang
 
         self.sock = None
@@ -94,6 +89,11 @@ class TwitchChatListener:
         self.last_ping = time()
         self._is_stopping = False
         self.connect_attempt = 0
+        self.avatar_resolver = TwitchAvatarResolver(
+            client_id=client_id,
+            access_token=access,
+            cache_path=avatar_cache_path,
+        )
 
     def disconnect(self):
         self._is_stopping = True
@@ -101,8 +101,10 @@ class TwitchChatListener:
             self.on_disconnect()
             self.is_connected = False
         self._close_socket()
+        self.avatar_resolver.stop()
 
     def run(self):
+        self.avatar_resolver.start()
         self.listen_thread = Thread(target=self._connect, daemon=True)
         self.listen_thread.start()
 
@@ -234,7 +236,7 @@ class TwitchChatListener:
     def _listen_chat(self):
         timeout_errors = 0
         data_empty = 0
-        buffer = ""
+        buffer = bytearray()
         while (
             self.sock and not self._is_stopping and self.connect_attempt < MAX_RETRIES
         ):
@@ -247,7 +249,8 @@ class TwitchChatListener:
                         pass
 
                 try:
-                    data = self.sock.recv(4096).decode("utf-8", errors="ignore")
+                    # Blocks until the socket is readable or TIMEOUT passes
+                    data = self.sock.recv(RECV_BUFFER_SIZE)
                 except socket.timeout:
                     timeout_errors += 1
                     if timeout_errors > 5:
@@ -256,7 +259,13 @@ class TwitchChatListener:
                             f"{_(self.lang, 'error_fetch_messages')}. {_(self.lang, 'Too many timeouts in a row')}. {_(self.lang, 'Reconnect')} {self.connect_attempt}/{MAX_RETRIES}"
                         )
                         return
-                    sleep(timeout_errors)
+                    # A quiet channel is not a dead one: the PONG resets the count
+                    if time() - self.last_ping > TIMEOUT:
+                        try:
+                            self._send_command("PING")
+                            self.last_ping = time()
+                        except Exception:
+                            pass
                     continue
 
                 if not data:
@@ -267,16 +276,10 @@ class TwitchChatListener:
                             f"{_(self.lang, 'error_fetch_messages')}. {_(self.lang, 'Too many empty data in a row')}. {_(self.lang, 'Reconnect')} {self.connect_attempt}/{MAX_RETRIES}"
                         )
                         return
-                    sleep(data_empty)
                     continue
 
                 buffer += data
-
-                if "\r\n" not in buffer:
-                    continue
-
-                lines = buffer.split("\r\n")
-                buffer = lines.pop()
+                lines = _split_lines(buffer)
 
                 for line in lines:
                     if self._is_stopping:
@@ -285,65 +288,22 @@ class TwitchChatListener:
                     if not line:
                         continue
 
+                    if self.on_record is not None:
+                        self.on_record("twitch", line)
+
                     if line.startswith("PING"):
                         try:
-                            self._send_command("PONG")
+                            self._send_command(f"PONG{line[4:]}")
                             self.last_ping = time()
                             continue
                         except:
                             pass
 
-                    msg_data = _parse_message(line)
-
-                    if msg_data:
-                        badges = msg_data.get("badges", "")
-                        tags = msg_data.get("tags", {})
-                        badge_names = {
-                            badge.split("/", 1)[0]
-                            for badge in badges.split(",")
-                            if badge
-                        }
-
-                        is_owner = (
-                            "broadcaster" in badge_names
-                            or tags.get("user-id") == tags.get("room-id")
-                            or str(msg_data["username"]).lower() == self.channel
-                        )
-                        is_staff = msg_data["mod"] or "moderator" in badge_names
-                        is_sponsor = (
-                            tags.get("subscriber") == "1"
-                            or "subscriber" in badge_names
-                            or "founder" in badge_names
-                        )
-                        bits = tags.get("bits")
-                        paid_amount = tags.get("pinned-chat-paid-amount")
-                        notice_event = tags.get("msg-id")
-                        is_donate = (
-                            (bits and bits != "0")
-                            or (paid_amount and paid_amount != "0")
-                            or notice_event in DONATION_MSG_IDS
-                        )
-
-                        self.on_message(
-                            msg_id=msg_data["id"],
-                            author=msg_data["username"],
-                            msg=msg_data["message"],
-                            msg_ex=_parse_emote_segments(msg_data["message"], tags),
-                            is_sponsor=is_sponsor,
-                            is_staff=is_staff,
-                            is_owner=is_owner,
-                            is_donate=is_donate,
-                            avatar_url=_get_avatar_url(
-                                msg_data["username"],
-                                client_id=self.client_id,
-                                access_token=self.access,
-                            ),
-                        )
+                    self.handle_line(line)
 
                 self.connect_attempt = 0
                 timeout_errors = 0
                 data_empty = 0
-                sleep(1)
 
             except socket.error as e:
                 if self._is_stopping:
@@ -368,6 +328,59 @@ class TwitchChatListener:
                 )
                 sleep(self.connect_attempt)
 
+    def handle_line(self, line: str):
+        """Dispatch one IRC line; replayed recordings come in here as well"""
+        msg_data = parse_message(line)
+
+        if msg_data and msg_data["command"] in MODERATION_COMMANDS:
+            if self.on_purge is not None:
+                # CLEARMSG names one message, CLEARCHAT a user or nobody
+                self.on_purge(
+                    author=msg_data["username"],
+                    msg_id=msg_data.get("target_msg_id"),
+                )
+            return
+
+        if msg_data and msg_data["command"] in CHAT_COMMANDS:
+            badges = msg_data.get("badges", "")
+            tags = msg_data.get("tags", {})
+            badge_names = {
+                badge.split("/", 1)[0] for badge in badges.split(",") if badge
+            }
+
+            is_owner = (
+                "broadcaster" in badge_names
+                or tags.get("user-id") == tags.get("room-id")
+                or str(msg_data["username"]).lower() == self.channel
+            )
+            is_staff = msg_data["mod"] or "moderator" in badge_names
+            is_sponsor = (
+                tags.get("subscriber") == "1"
+                or "subscriber" in badge_names
+                or "founder" in badge_names
+            )
+            bits = tags.get("bits")
+            paid_amount = tags.get("pinned-chat-paid-amount")
+            notice_event = tags.get("msg-id")
+            is_donate = (
+                (bits and bits != "0")
+                or (paid_amount and paid_amount != "0")
+                or notice_event in DONATION_MSG_IDS
+            )
+
+            self.on_message(
+                msg_id=msg_data["id"],
+                author=msg_data["username"],
+                msg=msg_data["message"],
+                msg_ex=_parse_emote_segments(msg_data["message"], tags),
+                is_sponsor=is_sponsor,
+                is_staff=is_staff,
+                is_owner=is_owner,
+                is_donate=is_donate,
+                avatar_url=self.avatar_resolver.get(msg_data["username"]),
+                sent_at=_parse_sent_at(tags.get("tmi-sent-ts")),
+            )
+
     def _on_expiries_access(self):
         try:
             access, refresh = AuthWorker.ensure_valid_access_token(
@@ -378,106 +391,35 @@ class TwitchChatListener:
             )
             self.access = access
             self.refresh = refresh
+            self.avatar_resolver.set_access_token(access)
             self.on_expiries_access(self.access, self.refresh)
             return True
         except Exception:
             return False
 
 
-def _parse_message(line):
+def _parse_sent_at(value) -> float | None:
+    """Wall-clock seconds from a millisecond ``tmi-sent-ts`` tag"""
     try:
-        if line.startswith("@"):
-            parts = line.split(" ", 1)
-            if len(parts) < 2:
-                return None
-
-            tags_str = parts[0][1:]
-            rest = parts[1]
-
-            tag_dict = {}
-            for tag in tags_str.split(";"):
-                if "=" in tag:
-                    key, value = tag.split("=", 1)
-                    value = (
-                        value.replace("\\s", " ")
-                        .replace("\\:", ";")
-                        .replace("\\\\", "\\")
-                    )
-                    tag_dict[key] = value
+        return int(value) / 1000
+    except (TypeError, ValueError):
+        return None
 
-            match = re.search(
-                r":(\w+)!\w+@\w+\.tmi\.twitch\.tv PRIVMSG #\w+ :(.*)", rest
-            )
 
-            if match:
-                username = match.group(1)
-                message = match.group(2)
-
-                msg_id = tag_dict.get("id")
-                is_member = tag_dict.get("subscriber") == "1"
-                is_mod = tag_dict.get("mod") == "1"
-                is_vip = tag_dict.get("vip") == "1"
-                badges = tag_dict.get("badges", "")
-
-                return {
-                    "id": msg_id,
-                    "username": username,
-                    "message": message,
-                    "subscriber": is_member,
-                    "mod": is_mod,
-                    "vip": is_vip,
-                    "badges": badges,
-                    "tags": tag_dict,
-                }
-
-            if " USERNOTICE " in rest:
-                notice_message = tag_dict.get("system-msg", "")
-                trailing_message = ""
-                split_pos = rest.find(" :")
-                if split_pos != -1:
-                    trailing_message = rest[split_pos + 2 :]
-                if trailing_message:
-                    notice_message = (
-                        f"{notice_message}: {trailing_message}"
-                        if notice_message
-                        else trailing_message
-                    )
+def _split_lines(buffer: bytearray) -> list[str]:
+    """Pop the complete lines off the receive buffer.
 
-                return {
-                    "id": tag_dict.get("id"),
-                    "username": tag_dict.get("display-name")
-                    or tag_dict.get("login")
-                    or "twitch",
-                    "message": notice_message,
-                    "subscriber": tag_dict.get("subscriber") == "1"
-                    or tag_dict.get("msg-id") in DONATION_MSG_IDS,
-                    "mod": tag_dict.get("mod") == "1",
-                    "vip": tag_dict.get("vip") == "1",
-                    "badges": tag_dict.get("badges", ""),
-                    "tags": tag_dict,
-                }
-        else:
-            match = re.search(
-                r":(\w+)!\w+@\w+\.tmi\.twitch\.tv PRIVMSG #\w+ :(.*)", line
-            )
-            if match:
-                username = match.group(1)
-                message = match.group(2)
-                return {
-                    "id": None,
-                    "username": username,
-                    "message": message,
-                    "subscriber": False,
-                    "mod": False,
-                    "vip": False,
-                    "badges": "",
-                    "tags": {},
-                }
-
-    except Exception as e:
-        logger.error("Error parsing message. %s", str(e))
-
-    return None
+    Lines are cut on raw CRLF bytes before decoding. CR and LF never occur
+    inside a multi-byte UTF-8 sequence, so every decoded line is whole even
+    when a character was split between two reads; the partial tail stays in
+    the buffer for the next one.
+    """
+    end = buffer.rfind(b"\r\n")
+    if end == -1:
+        return []
+    text = buffer[:end].decode("utf-8", errors="ignore")
+    del buffer[: end + 2]
+    return text.split("\r\n")
 
 
 def _parse_channel(channel_input):
@@ -501,53 +443,6 @@ def _parse_channel(channel_input):
     return channel_input
 
 
-def _normalize_avatar_url(url: str | None) -> str | None:
-    avatar_url = str(url or "").strip()
-    if not avatar_url:
-        return None
-
-    return avatar_url
-
-
-def _fetch_avatar_url(login: str, client_id: str, access_token: str) -> str | None:
-    login = str(login or "").strip().lower()
-    response = requests.get(
-        "https://api.twitch.tv/helix/users",
-        params={"login": login},
-        headers={
-            "Client-ID": client_id,
-            "Authorization": f"Bearer {access_token}",
-        },
-        timeout=10,
-    )
-
-    if response.status_code != 200:
-        return None
-
-    payload = response.json()
-    for user in payload.get("data", []):
-        original_url = str(user.get("profile_image_url") or "").strip()
-        return _normalize_avatar_url(original_url)
-    return None
-
-
-def _get_avatar_url(username: str, client_id: str, access_token: str) -> str | None:
-    login = str(username or "").strip().lower()
-    if not login:
-        return None
-
-    if login in _avatar_url_cache:
-        return _avatar_url_cache[login]
-
-    try:
-        avatar_url = _fetch_avatar_url(login, client_id, access_token)
-        _avatar_url_cache[login] = avatar_url
-        return avatar_url
-    except Exception:
-        _avatar_url_cache[login] = None
-        return None
-
-
 def _parse_emote_segments(message: str, tags: dict) -> list | None:
     emotes = str(tags.get("emotes", "") or "").strip()
     if not message or not emotes:
@@ -0,0 +1,205 @@
+from collections.abc import Mapping
+from logging import getLogger
+import re
+
+logger = getLogger("main")
+
+DONATION_MSG_IDS = frozenset(
+    {
+        "sub",
+        "resub",
+        "subgift",
+        "anonsubgift",
+        "submysterygift",
+        "anonsubmysterygift",
+        "giftpaidupgrade",
+        "anongiftpaidupgrade",
+        "primepaidupgrade",
+        "standardpayforward",
+        "communitypayforward",
+    }
+)
+CHAT_COMMANDS = frozenset({"PRIVMSG", "USERNOTICE"})
+MODERATION_COMMANDS = frozenset({"CLEARCHAT", "CLEARMSG"})
+
+# IRCv3 message-tags escapes; a backslash before any other character is dropped
+_TAG_ESCAPES = {":": ";", "s": " ", "\\": "\\", "r": "\r", "n": "\n"}
+_TAG_ESCAPE_RE = re.compile(r"\\(.?)", re.DOTALL)
+
+
+def _unescape_match(match: re.Match) -> str:
+    char = match.group(1)
+    return _TAG_ESCAPES.get(char, char)
+
+
+def unescape_tag_value(value: str) -> str:
+    if "\\" not in value:
+        return value
+    return _TAG_ESCAPE_RE.sub(_unescape_match, value)
+
+
+class IrcTags(Mapping):
+    """Read-only view of a raw IRCv3 tag string.
+
+    A tag is located and unescaped only when it is read, so a line whose
+    handler looks at a handful of tags never pays for the other twenty.
+    Iterating parses everything once.
+    """
+
+    __slots__ = ("_raw", "_values", "_is_complete")
+
+    def __init__(self, raw: str = ""):
+        # A leading separator lets every key be found with the same needle
+        self._raw = f";{raw}"
+        self._values: dict[str, str] = {}
+        self._is_complete = not raw
+
+    def get(self, key, default=None):
+        values = self._values
+        if key in values:
+            return values[key]
+        if self._is_complete:
+            return default
+
+        needle = _NEEDLES.get(key)
+        if needle is None:
+            needle = _NEEDLES[key] = f";{key}="
+        raw = self._raw
+        start = raw.find(needle)
+        if start == -1:
+            return default
+        start += len(needle)
+        end = raw.find(";", start)
+        value = unescape_tag_value(raw[start:] if end == -1 else raw[start:end])
+        values[key] = value
+        return value
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __iter__(self):
+        return iter(self._parse_all())
+
+    def __len__(self):
+        return len(self._parse_all())
+
+    def __repr__(self):
+        return f"IrcTags({self._raw[1:]!r})"
+
+    def _parse_all(self) -> dict[str, str]:
+        if not self._is_complete:
+            values = {}
+            for tag in self._raw[1:].split(";"):
+                key, sep, value = tag.partition("=")
+                if sep and key not in values:
+                    values[key] = unescape_tag_value(value)
+            self._values = values
+            self._is_complete = True
+        return self._values
+
+
+_MISSING = object()
+# Search strings per tag key; Twitch uses a few dozen keys
+_NEEDLES: dict[str, str] = {}
+_EMPTY_TAGS = IrcTags()
+
+
+def parse_message(line: str) -> dict | None:
+    """Parse the chat-relevant Twitch IRC lines.
+
+    Returns a dict with a ``command`` key for PRIVMSG, USERNOTICE, CLEARCHAT
+    and CLEARMSG lines and None for anything else.
+    """
+    try:
+        if line.startswith("@"):
+            space = line.find(" ")
+            if space == -1:
+                return None
+            tags = IrcTags(line[1:space])
+            rest = line[space + 1 :]
+        else:
+            tags = _EMPTY_TAGS
+            rest = line
+
+        prefix = ""
+        if rest.startswith(":"):
+            space = rest.find(" ")
+            if space == -1:
+                return None
+            prefix = rest[1:space]
+            rest = rest[space + 1 :]
+
+        trailing_pos = rest.find(" :")
+        if trailing_pos == -1:
+            trailing = None
+            command = rest.partition(" ")[0]
+        else:
+            trailing = rest[trailing_pos + 2 :]
+            command = rest[:trailing_pos].partition(" ")[0]
+
+        if command == "PRIVMSG":
+            username, sep, _ = prefix.partition("!")
+            if not sep or not username or trailing is None:
+                return None
+            return {
+                "command": command,
+                "id": tags.get("id"),
+                "username": username,
+                "message": trailing,
+                "subscriber": tags.get("subscriber") == "1",
+                "mod": tags.get("mod") == "1",
+                "vip": tags.get("vip") == "1",
+                "badges": tags.get("badges", ""),
+                "tags": tags,
+            }
+
+        if command == "USERNOTICE":
+            if tags is _EMPTY_TAGS:
+                return None
+            notice_message = tags.get("system-msg", "")
+            if trailing:
+                notice_message = (
+                    f"{notice_message}: {trailing}" if notice_message else trailing
+                )
+            return {
+                "command": command,
+                "id": tags.get("id"),
+                "username": tags.get("display-name") or tags.get("login") or "twitch",
+                "message": notice_message,
+                "subscriber": tags.get("subscriber") == "1"
+                or tags.get("msg-id") in DONATION_MSG_IDS,
+                "mod": tags.get("mod") == "1",
+                "vip": tags.get("vip") == "1",
+                "badges": tags.get("badges", ""),
+                "tags": tags,
+            }
+
+        if command == "CLEARCHAT":
+            # Without a trailing user the whole chat was cleared
+            return {
+                "command": command,
+                "username": trailing or None,
+                "user_id": tags.get("target-user-id"),
+                "ban_duration": tags.get("ban-duration"),
+                "tags": tags,
+            }
+
+        if command == "CLEARMSG":
+            return {
+                "command": command,
+                "username": tags.get("login"),
+                "target_msg_id": tags.get("target-msg-id"),
+                "message": trailing or "",
+                "tags": tags,
+            }
+
+    except Exception as e:
+        logger.error("Error parsing message. %s", str(e))
+
+    return None
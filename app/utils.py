@@ -16,7 +16,8 @@ from PyQt6.QtGui import QColor
 
 from app.constants import APP_NAME
 from app.constants_qt import COLORS_RGBA
-from app.translations import _
+from app.stop_words import StopWordMatcher
+from app.translations import _, map_symbols
 
 _detoxify_ = None
 _detoxify_impl_ = None
@@ -42,6 +43,44 @@ _EMOJI_NAME_ALIASES = {
 }
 
 
+LINK_HTTPS_RE = re.compile(r"https?://\S+")
+LINK_HTTP_RE = re.compile(r"http?://\S+")
+LINK_WWW_RE = re.compile(r"www\.\S+")
+LINK_PATH_RE = re.compile(r"\S+\.\S+/\S+")
+EMOJI_CUSTOM_RE = re.compile(r"<a?:[A-Za-z0-9_]{2,32}:\d{1,20}>")
+LONG_NUMBER_RE = re.compile(r"\d{8,}")
+NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+NUMBER_TOKEN_RE = re.compile(r"\d+|[.,]")
+DIGIT_RE = re.compile(r"\d")
+SPAM_TOKEN_RE = re.compile(r"\w+|[^\w\s]+", flags=re.UNICODE)
+SYMBOL_RUN_RE = re.compile(r"[^\w\s]+")
+REPEATS_RE = re.compile(r"(.)\1{2,}")
+MESSAGE_GARBAGE_RE = re.compile(r"[^0-9A-Za-zА-Яа-яЁё\s!,-.:?]")
+SPACES_RE = re.compile(r"\s{2,}")
+EN_LETTER_RE = re.compile(r"[A-Za-z]")
+RU_LETTER_RE = re.compile(r"[А-Яа-яЁё]")
+EN_WORD_OR_NUM_RE = re.compile(r"[A-Za-z0-9]")
+RU_WORD_OR_NUM_RE = re.compile(r"[А-Яа-яЁё0-9]")
+ANY_WORD_OR_NUM_RE = re.compile(r"[^\W_]", flags=re.UNICODE)
+
+
+class _CharMap(dict):
+    """str.translate() table filled lazily from a per-character rule"""
+
+    def __init__(self, rule):
+        super().__init__()
+        self._rule = rule
+
+    def __missing__(self, codepoint: int) -> str:
+        value = self._rule(chr(codepoint))
+        self[codepoint] = value
+        return value
+
+
+_PUNCTUATION_MAP = _CharMap(lambda ch: ch if ch.isalpha() or ch.isdigit() else " ")
+_LETTERS_MAP = _CharMap(lambda ch: ch if ch.isalpha() else " ")
+
+
 @lru_cache(maxsize=1024)
 def _lookup_unicode_name(name: str) -> str:
     try:
@@ -148,6 +187,27 @@ def get_emoji_cache_path():
     return _dir
 
 
+def get_tts_cache_path():
+    _dir = get_user_data_dir()
+    _dir = os.path.join(_dir, "tts_cache")
+    os.makedirs(_dir, exist_ok=True)
+    return _dir
+
+
+def get_twitch_avatar_cache_path():
+    _dir = get_user_data_dir()
+    _dir = os.path.join(_dir, "img")
+    os.makedirs(_dir, exist_ok=True)
+    return os.path.join(_dir, "twitch_avatars.json")
+
+
+def get_chat_recordings_path():
+    _dir = get_user_data_dir()
+    _dir = os.path.join(_dir, "recordings")
+    os.makedirs(_dir, exist_ok=True)
+    return _dir
+
+
 def get_banned_list_path():
     _dir = get_user_data_dir()
     _dir = os.path.join(_dir, "spam_filter")
@@ -339,27 +399,21 @@ def clear_cache_detoxify():
 
 
 def clean_punctuation(text: str):
-    _text = ""
-    for symbol in text:
-        if symbol.isalpha() or symbol.isdigit():
-            _text += symbol
-        else:
-            _text += " "
-    return _text
+    return text.translate(_PUNCTUATION_MAP)
 
 
 def clean_symbol_spam(text: str) -> str:
     if not isinstance(text, str) or not text:
         return text
 
-    tokens = re.findall(r"\w+|[^\w\s]+", text, flags=re.UNICODE)
+    tokens = SPAM_TOKEN_RE.findall(text)
     cleaned_tokens: list[str] = []
 
     for tok in tokens:
         if not tok:
             continue
 
-        if re.fullmatch(r"[^\w\s]+", tok):
+        if SYMBOL_RUN_RE.fullmatch(tok):
             cleaned_tokens.append(tok)
             continue
 
@@ -368,7 +422,7 @@ def clean_symbol_spam(text: str) -> str:
                 cleaned_tokens.append(tok)
             continue
 
-        if re.search(r"\d", tok):
+        if DIGIT_RE.search(tok):
             cleaned_tokens.append(tok)
             continue
 
@@ -414,7 +468,7 @@ def _collapse_repeats(s: str) -> str:
     # Keep single and double characters as-is.
     if len(s) < 3:
         return s
-    return re.sub(r"(.)\1{2,}", r"\1", s)
+    return REPEATS_RE.sub(r"\1", s)
 
 
 def _is_repetitive(s: str, min_repeats: int = 3, max_block: int = 4) -> bool:
@@ -451,37 +505,105 @@ def _is_low_diversity(s: str, threshold: float = 0.34, min_len: int = 3) -> bool
 
 
 def clean_emoji(text):
-    _text = re.sub(r"<a?:[A-Za-z0-9_]{2,32}:\d{1,20}>", " ", text)
-    return re.sub(r":[0-9A-Za-z_+-]{1,64}:", " ", _text).strip()
+    # Both patterns need a colon, most messages skip the regex entirely
+    if ":" not in text:
+        return text.strip()
+    _text = EMOJI_CUSTOM_RE.sub(" ", text)
+    return EMOJI_SHORTCODE_RE.sub(" ", _text).strip()
 
 
 def clean_links(text, lang: str = "en"):
-    link_text = _(lang, "Link")
-    _text = re.sub(r"https?://\S+", f" -{link_text}- ", text)
-    _text = re.sub(r"http?://\S+", f" -{link_text}- ", _text)
-    _text = re.sub(r"www\.\S+", f" -{link_text}- ", _text)
-    _text = re.sub(r"\S+\.\S+/\S+", f" -{link_text}- ", _text)
+    # Every link pattern needs "/" or "www."
+    if "/" not in text and "www." not in text:
+        return text
+    link_text = f" -{_(lang, 'Link')}- "
+    _text = LINK_HTTPS_RE.sub(link_text, text)
+    _text = LINK_HTTP_RE.sub(link_text, _text)
+    _text = LINK_WWW_RE.sub(link_text, _text)
+    _text = LINK_PATH_RE.sub(link_text, _text)
     return _text
 
 
 def clean_message(text: str) -> str:
     """Clean message from garbage"""
     _text = str(text or "")
-    _text = re.sub(r"[^0-9A-Za-zА-Яа-яЁё\s!,-.:?]", " ", _text)
-    _text = re.sub(r"\s{2,}", " ", _text)
+    _text = MESSAGE_GARBAGE_RE.sub(" ", _text)
+    _text = SPACES_RE.sub(" ", _text)
     return _text.strip()
 
 
-def load_stop_words(lang):
+def normalize_speech_text(text: str, lang: str) -> str:
+    """Links, emoji, numbers, symbol spam and symbol names in one call.
+
+    Same output as calling clean_links, clean_emoji, convert_numbers_to_words,
+    clean_symbol_spam and map_symbols in turn; each stage skips its pass when
+    the text cannot match.
+    """
+    _text = clean_links(text, lang=lang)
+    _text = clean_emoji(_text)
+    _text = convert_numbers_to_words(_text, lang)
+    _text = clean_symbol_spam(_text)
+    return map_symbols(_text, lang=lang)
+
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…])\s+")
+CLAUSE_SPLIT_RE = re.compile(r"(?<=[,;:])\s+|\s+(?=-\s)")
+
+
+def _pack_parts(parts: list[str], max_length: int) -> list[str]:
+    chunks = []
+    current = ""
+    for part in parts:
+        if current and len(current) + 1 + len(part) > max_length:
+            chunks.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_speech_chunks(
+    text: str, max_length: int = 120, min_length: int = 20
+) -> list[str]:
+    """Split text at sentence, then clause, then word boundaries for streaming synthesis"""
+    text = str(text or "").strip()
+    if len(text) <= max_length:
+        return [text] if text else []
+
+    chunks = []
+    for sentence in SENTENCE_SPLIT_RE.split(text):
+        if len(sentence) <= max_length:
+            chunks.append(sentence)
+            continue
+        for clause in _pack_parts(CLAUSE_SPLIT_RE.split(sentence), max_length):
+            if len(clause) <= max_length:
+                chunks.append(clause)
+            else:
+                chunks.extend(_pack_parts(clause.split(), max_length))
+
+    merged = []
+    for chunk in chunks:
+        if merged and (
+            len(chunk) < min_length or len(merged[-1]) < min_length
+        ) and len(merged[-1]) + 1 + len(chunk) <= max_length:
+            merged[-1] = f"{merged[-1]} {chunk}"
+        else:
+            merged.append(chunk)
+    return merged
+
+
+def load_stop_words(lang) -> StopWordMatcher:
     source_path = resource_path(f"spam_filter/{lang}.txt")
     try:
         with open(source_path, "r", encoding="utf-8") as file:
-            return tuple(line.strip() for line in file if line.strip())
+            return StopWordMatcher(line.strip() for line in file if line.strip())
     except FileNotFoundError:
         pass
     except Exception as e:
         pass
-    return tuple()
+    return StopWordMatcher()
 
 
 def save_stop_words(lang, stop_words):
@@ -493,13 +615,19 @@ def save_stop_words(lang, stop_words):
         f.write("\n".join(stop_words) + "\n")
 
 
+def as_stop_word_matcher(stop_words: Iterable[str]) -> StopWordMatcher:
+    if isinstance(stop_words, StopWordMatcher):
+        return stop_words
+    return StopWordMatcher(stop_words)
+
+
 def contains_stop_words(text: str, stop_words: Iterable[str]) -> bool:
     """
     Check if text contains any stop words.
 
     Args:
         text: Input text to check
-        stop_words: Iterable stop words list
+        stop_words: Stop words, preferably a compiled StopWordMatcher
 
     Returns:
         True if text contains any stop words, False otherwise
@@ -510,28 +638,16 @@ def contains_stop_words(text: str, stop_words: Iterable[str]) -> bool:
     text_lower = text.lower()
     text_lower = text.replace("ё", "е")
     text_lower = clean_punctuation(text_lower)
-    text_words = text_lower.split(" ")
-    text_words_join = "".join(text_words)
 
-    for word in text_words:
-        if word in stop_words:
-            return True
-
-    for stop_word in stop_words:
-        if len(stop_word) >= 4 and (
-            stop_word in text_lower or stop_word in text_words_join
-        ):
-            return True
-
-    return False
+    return as_stop_word_matcher(stop_words).contains(text_lower)
 
 
 def clean_stop_words(text: str, stop_words: Iterable[str]) -> str:
     if not text or not stop_words:
         return text
 
-    stop_words_set = set(stop_words)
-    if not stop_words_set:
+    matcher = as_stop_word_matcher(stop_words)
+    if not matcher:
         return text
 
     normalized_text = text.lower().replace("ё", "е")
@@ -540,35 +656,10 @@ def clean_stop_words(text: str, stop_words: Iterable[str]) -> str:
 
     for match in re.finditer(r"[^\s]+", cleaned_text):
         word = match.group(0)
-        if word in stop_words_set:
+        if word in matcher.word_set:
             spans.append((match.start(), match.end()))
 
-    long_stop_words = [word for word in stop_words_set if len(word) >= 4]
-
-    if long_stop_words:
-        long_stop_words.sort(key=len, reverse=True)
-        overlap_pattern = re.compile(
-            f"(?=({'|'.join(re.escape(word) for word in long_stop_words)}))"
-        )
-
-        for match in overlap_pattern.finditer(cleaned_text):
-            found = match.group(1)
-            spans.append((match.start(), match.start() + len(found)))
-
-        chars = []
-        index_map = []
-        append_char = chars.append
-        append_index = index_map.append
-        for idx, char in enumerate(cleaned_text):
-            if char != " ":
-                append_char(char)
-                append_index(idx)
-        joined_text = "".join(chars)
-
-        for match in overlap_pattern.finditer(joined_text):
-            found = match.group(1)
-            start = match.start()
-            spans.append((index_map[start], index_map[start + len(found) - 1] + 1))
+    spans.extend(matcher.find_spans(cleaned_text))
 
     if not spans:
         return text
@@ -596,22 +687,16 @@ def clean_stop_words(text: str, stop_words: Iterable[str]) -> str:
 
 
 def clean_symbols(text: str):
-    string = ""
-    for ch in text:
-        if ch.isalpha():
-            string += ch
-        else:
-            string += " "
-    return string.strip()
+    return text.translate(_LETTERS_MAP).strip()
 
 
 def all_letters_is(text: str, lang: str = "en") -> bool:
     letters = [ch for ch in text if ch.isalpha()]
 
     if lang == "en":
-        return all(re.match(r"[A-Za-z]", ch) for ch in letters)
+        return all(EN_LETTER_RE.match(ch) for ch in letters)
     if lang == "ru":
-        return all(re.match(r"[А-Яа-яЁё]", ch) for ch in letters)
+        return all(RU_LETTER_RE.match(ch) for ch in letters)
 
     return False
 
@@ -622,11 +707,11 @@ def contain_words_or_nums(text: str, lang: str = "en") -> bool:
         return False
 
     if lang == "en":
-        return bool(re.search(r"[A-Za-z0-9]", value))
+        return bool(EN_WORD_OR_NUM_RE.search(value))
     if lang == "ru":
-        return bool(re.search(r"[А-Яа-яЁё0-9]", value))
+        return bool(RU_WORD_OR_NUM_RE.search(value))
 
-    return bool(re.search(r"[^\W_]", value, flags=re.UNICODE))
+    return bool(ANY_WORD_OR_NUM_RE.search(value))
 
 
 def contrast_color_from_rgb(r, g, b):
@@ -659,29 +744,33 @@ def avatar_colors_from_name(name: str):
     return bg, fg
 
 
+@lru_cache(maxsize=4096)
+def _number_to_words(s: str, lang: str) -> str:
+    """Convert a numeric string (without separators) to words."""
+    if s.startswith("0") and len(s) > 1:
+        zero_word = num2words.num2words(0, lang=lang)
+        rest_word = num2words.num2words(int(s[1:]), lang=lang)
+        return f" {zero_word} {rest_word} "
+    else:
+        return num2words.num2words(int(s), lang=lang)
+
+
 def convert_numbers_to_words(text: str, lang: str) -> str:
     """Convert numbers to text representation"""
-    _text = re.sub(r"\d{8,}", " ", text)
-
-    def to_number(s: str) -> str:
-        """Convert a numeric string (without separators) to words."""
-        if s.startswith("0") and len(s) > 1:
-            zero_word = num2words.num2words(0, lang=lang)
-            rest_word = num2words.num2words(int(s[1:]), lang=lang)
-            return f" {zero_word} {rest_word} "
-        else:
-            return num2words.num2words(int(s), lang=lang)
+    if not DIGIT_RE.search(text):
+        return text
+    _text = LONG_NUMBER_RE.sub(" ", text)
 
     def replace_number(match: re.Match) -> str:
         num_str = match.group()
-        tokens = re.findall(r"\d+|[.,]", num_str)
+        tokens = NUMBER_TOKEN_RE.findall(num_str)
         if not tokens:
             return num_str
 
         result_parts = []
         for token in tokens:
             if token.isdigit():
-                result_parts.append(to_number(token))
+                result_parts.append(_number_to_words(token, lang))
             else:
                 if token == ".":
                     result_parts.append(_(lang, "point"))
@@ -689,9 +778,7 @@ def convert_numbers_to_words(text: str, lang: str) -> str:
                     result_parts.append(_(lang, "comma"))
         return " ".join(result_parts)
 
-    number_pattern = r"\d+(?:[.,]\d+)*"
-    converted_text = re.sub(number_pattern, replace_number, _text)
-    return converted_text
+    return NUMBER_RE.sub(replace_number, _text)
 
 
 def parse_youtube_video_id(url: str) -> str | None:
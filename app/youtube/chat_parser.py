@@ -57,6 +57,7 @@ class YouTubeChatParser:
         on_reconnect,
         on_error,
         lang: str = "en",
+        on_record=None,
     ):
         super().__init__()
         self.url = url
@@ -65,6 +66,7 @@ class YouTubeChatParser:
         self.on_disconnect = on_disconnect
         self.on_reconnect = on_reconnect
         self.on_error = on_error
+        self.on_record = on_record
         self.disconnect_signal = False
         self.is_connected = False
         self.lang = lang
@@ -189,10 +191,17 @@ class YouTubeChatParser:
         else:
             items = data.sync_items()
 
+        self.emit_items(items)
+
+    def emit_items(self, items):
+        """Dispatch pytchat items; replayed recordings come in here as well"""
         for message in items:
             if self.disconnect_signal:
                 return
 
+            if self.on_record is not None:
+                self.on_record("youtube", message)
+
             author_details = getattr(message, "author", None)
             if author_details is None:
                 continue
@@ -217,8 +226,16 @@ class YouTubeChatParser:
                 is_owner=getattr(author_details, "isChatOwner", False),
                 is_donate=payload["is_donate"],
                 avatar_url=self._extract_avatar_url(author_details),
+                sent_at=self._extract_sent_at(message),
             )
 
+    def _extract_sent_at(self, message) -> float | None:
+        # pytchat timestamps are milliseconds since the epoch
+        try:
+            return int(getattr(message, "timestamp", None)) / 1000
+        except (TypeError, ValueError):
+            return None
+
     def _ensure_stream_is_live(self):
         if not self.chat:
             return False
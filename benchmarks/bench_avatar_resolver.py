@@ -0,0 +1,207 @@
+"""Twitch avatar lookups against a local Helix /users stand-in.
+
+Run from the repository root:
+
+    python benchmarks/bench_avatar_resolver.py --logins 251
+
+A local HTTP server answers Helix /users requests for every login except
+a few "missing" ones and records each request. The script checks that:
+
+- get() never waits for the network
+- new logins are batched into requests of at most 100 logins
+- every existing login resolves and missing ones stay None
+- the saved cache serves a fresh resolver without any request
+- a resolver without credentials queues nothing, as during a replay
+
+It exits with status 1 if any check fails.
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import sys
+import tempfile
+import threading
+from time import monotonic, perf_counter, sleep
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.twitch.avatar_resolver import BATCH_SIZE, TwitchAvatarResolver  # noqa: E402
+
+CLIENT_ID = "bench-client"
+ACCESS_TOKEN = "bench-token"
+MISSING_EVERY = 25
+
+
+def avatar_url(login):
+    return f"https://static-cdn.example/{login}-profile_image-300x300.png"
+
+
+class HelixStandIn:
+    """Serves /helix/users and keeps the logins of every request"""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.requests: list[list[str]] = []
+        self.unauthorized = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                logins = query.get("login", [])
+                if (
+                    self.headers.get("Client-ID") != CLIENT_ID
+                    or self.headers.get("Authorization") != f"Bearer {ACCESS_TOKEN}"
+                ):
+                    stand_in.unauthorized += 1
+                    self.send_response(401)
+                    self.end_headers()
+                    return
+                stand_in.requests.append(logins)
+                sleep(stand_in.latency)
+                body = json.dumps(
+                    {
+                        "data": [
+                            {"login": login, "profile_image_url": avatar_url(login)}
+                            for login in logins
+                            if not is_missing(login)
+                        ]
+                    }
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/helix/users"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def is_missing(login):
+    return int(login.removeprefix("viewer")) % MISSING_EVERY == 0
+
+
+def make_resolver(url, cache_path, credentials=True):
+    return TwitchAvatarResolver(
+        client_id=CLIENT_ID if credentials else "",
+        access_token=ACCESS_TOKEN if credentials else "",
+        cache_path=cache_path,
+        url=url,
+    )
+
+
+def wait_until(predicate, timeout):
+    deadline = monotonic() + timeout
+    while not predicate():
+        if monotonic() > deadline:
+            return False
+        sleep(0.01)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=251)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Stand-in response delay, s"
+    )
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--json", action="store_true", help="Print a JSON line")
+    args = parser.parse_args()
+
+    logins = [f"viewer{idx}" for idx in range(1, args.logins + 1)]
+    failures = []
+    stand_in = HelixStandIn(args.latency)
+    stand_in.start()
+    cache_path = os.path.join(tempfile.mkdtemp(prefix="bench_avatars_"), "cache.json")
+
+    resolver = make_resolver(stand_in.url, cache_path)
+    resolver.start()
+    started = perf_counter()
+    for login in logins:
+        resolver.get(login)
+    lookup_ms = (perf_counter() - started) * 1000
+
+    is_resolved = wait_until(lambda: resolver.stats()["pending"] == 0, args.timeout)
+    resolved = {login: resolver.get(login) for login in logins}
+    resolver.stop()
+    resolver._thread.join(args.timeout)
+
+    batch_sizes = [len(batch) for batch in stand_in.requests]
+    if not is_resolved:
+        failures.append("logins still pending after the timeout")
+    if any(size > BATCH_SIZE for size in batch_sizes):
+        failures.append(f"a request asked for more than {BATCH_SIZE} logins")
+    requested = sorted(login for batch in stand_in.requests for login in batch)
+    if requested != sorted(logins):
+        failures.append("every login must be requested exactly once")
+    wrong = [
+        login
+        for login, url in resolved.items()
+        if url != (None if is_missing(login) else avatar_url(login))
+    ]
+    if wrong:
+        failures.append(f"{len(wrong)} logins resolved wrong, e.g. {wrong[0]}")
+
+    requests_before = len(stand_in.requests)
+    reloaded = make_resolver(stand_in.url, cache_path)
+    reloaded.start()
+    cached = sum(1 for login in logins if reloaded.get(login) == resolved[login])
+    sleep(0.5)
+    reloaded.stop()
+    if len(stand_in.requests) != requests_before or cached != len(logins):
+        failures.append("the saved cache must serve a fresh resolver offline")
+
+    offline = make_resolver(stand_in.url, None, credentials=False)
+    offline.start()
+    for login in logins:
+        offline.get(f"replay_{login}")
+    sleep(0.5)
+    offline_pending = offline.stats()["pending"]
+    offline.stop()
+    if offline_pending or stand_in.unauthorized:
+        failures.append("a resolver without credentials must not queue lookups")
+
+    stand_in.stop()
+    row = {
+        "logins": len(logins),
+        "lookup_ms": round(lookup_ms, 2),
+        "lookup_us_per_login": round(lookup_ms * 1000 / len(logins), 2),
+        "requests": len(batch_sizes),
+        "batch_sizes": batch_sizes,
+        "missing": sum(1 for url in resolved.values() if url is None),
+        "reloaded_from_cache": cached,
+        "failures": failures,
+    }
+    if args.json:
+        print(json.dumps(row), flush=True)
+    else:
+        print(
+            f"{row['logins']} logins | get() {row['lookup_ms']} ms total, "
+            f"{row['lookup_us_per_login']} us each | {row['requests']} requests "
+            f"{batch_sizes} | {row['missing']} missing | "
+            f"{cached} served from the saved cache",
+            flush=True,
+        )
+        for failure in failures:
+            print(f"FAIL: {failure}", flush=True)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
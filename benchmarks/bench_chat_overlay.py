@@ -0,0 +1,349 @@
+"""Chat overlay frame times while scrolling, resizing and appending.
+
+Run from the repository root:
+
+    python benchmarks/bench_chat_overlay.py --messages 2000 --frames 200
+    python benchmarks/bench_chat_overlay.py --scenarios append
+
+An offscreen QListView set up like the chat overlay is filled with
+synthetic messages. Every frame either moves the scroll bar by a third of
+the viewport or changes the view width, then relayouts and paints the
+viewport into a pixmap. Each scenario runs with the delegate layout cache
+and with ``layout_cache_size=0``, which measures every row on every
+sizeHint and paint as before the cache existed. Layouts are kept for one
+width, so in the resize scenario, which changes the width every frame,
+the cache only saves the repeated sizeHint calls within a frame.
+
+The append scenario adds --append-messages messages one by one with
+system messages hidden, as the overlay does, and lets the event loop run
+after every --batch of them. It is repeated for --rescan-messages with
+every insert and removal also rescanning the whole model for hidden rows,
+the way the delegate used to. With --burst every batch is one add_messages
+call, as the main window delivers messages from the chat threads.
+
+The flood scenario starts from --messages rows and delivers --flood-rate
+msg/s for --flood-seconds while the event loop runs. It reports every event
+loop pass as a frame, so max is the longest the UI thread was blocked. It
+runs as before, with every pass inserting what arrived and relaying out the
+whole list, and as the overlay does now, with a batched layout, inserts at
+most every INSERT_INTERVAL_MS and the view following the bottom as the
+layout grows.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication, QListView  # noqa: E402
+
+from app.chat_message import (  # noqa: E402
+    LAYOUT_CACHE_SIZE,
+    ChatMessage,
+    ChatMessageDelegate,
+    ChatMessageListModel,
+)
+from app.chat_overlay import INSERT_INTERVAL_MS, LAYOUT_BATCH_SIZE  # noqa: E402
+
+TEXTS = [
+    "Привет всем, как дела?",
+    "gg wp 🎉🎉🎉",
+    "Ёжик в тумане 🦔 и лошадка",
+    "simple ascii message",
+    "Смешанный text с эмодзи 😀 и числами 12345",
+    "Очень длинное сообщение, которое точно не поместится в одну строку "
+    "и будет перенесено на несколько строк в узком окне чата",
+]
+PLATFORMS = ["twitch", "youtube", "system"]
+COLORS = ["#ff4500", "#1e90ff", "#9acd32", None]
+WIDTHS = [320, 360, 420, 480]
+VIEW_HEIGHT = 720
+
+
+def make_message(idx, rng):
+    text = rng.choice(TEXTS)
+    return ChatMessage(
+        time=f"{idx // 3600 % 24:02}:{idx // 60 % 60:02}:{idx % 60:02}",
+        platform=rng.choice(PLATFORMS),
+        author=f"viewer{rng.randrange(500)}",
+        text=text,
+        color=rng.choice(COLORS),
+        background=None,
+        segments=[text],
+        avatar_url=None,
+    )
+
+
+def make_messages(count, rng):
+    return [make_message(idx, rng) for idx in range(count)]
+
+
+def make_view(
+    messages, layout_cache_size=LAYOUT_CACHE_SIZE, batched=False, **delegate_kwargs
+):
+    model = ChatMessageListModel(spill_to_disk=False)
+    model.add_messages(messages)
+    view = QListView()
+    view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+    view.setWordWrap(True)
+    view.setUniformItemSizes(False)
+    if batched:
+        view.setLayoutMode(QListView.LayoutMode.Batched)
+        view.setBatchSize(LAYOUT_BATCH_SIZE)
+    view.setSpacing(4)
+    view.setModel(model)
+    view.setItemDelegate(
+        ChatMessageDelegate(
+            view, layout_cache_size=layout_cache_size, **delegate_kwargs
+        )
+    )
+    view.resize(WIDTHS[0], VIEW_HEIGHT)
+    view.show()
+    view.doItemsLayout()
+    paint_viewport(view)
+    return view, model
+
+
+def paint_viewport(view):
+    # repaint() does nothing until the offscreen window has been exposed
+    view.viewport().grab()
+
+
+def scroll_frames(view, frames):
+    scroll_bar = view.verticalScrollBar()
+    step = max(1, view.viewport().height() // 3)
+    durations = []
+    for _ in range(frames):
+        value = scroll_bar.value() + step
+        if value > scroll_bar.maximum():
+            value = 0
+        started = perf_counter()
+        scroll_bar.setValue(value)
+        paint_viewport(view)
+        durations.append(perf_counter() - started)
+    return durations
+
+
+def resize_frames(view, frames):
+    durations = []
+    for idx in range(frames):
+        started = perf_counter()
+        view.resize(WIDTHS[(idx + 1) % len(WIDTHS)], VIEW_HEIGHT)
+        view.doItemsLayout()
+        paint_viewport(view)
+        durations.append(perf_counter() - started)
+    return durations
+
+
+def append_batches(app, count, batch, rescan, rng, burst=False):
+    """Per-batch durations of appending ``count`` messages to a fresh overlay"""
+    view, model = make_view([], hide_system_msg=True)
+    if rescan:
+        delegate = view.itemDelegate()
+        model.rowsInserted.connect(delegate._sync_hidden_rows)
+        model.rowsRemoved.connect(delegate._sync_hidden_rows)
+
+    durations = []
+    started = perf_counter()
+    for first in range(0, count, batch):
+        batch_started = perf_counter()
+        batch_messages = [
+            make_message(idx, rng) for idx in range(first, min(count, first + batch))
+        ]
+        if burst:
+            model.add_messages(batch_messages)
+        else:
+            for message in batch_messages:
+                model.add_message(message)
+        view.scrollToBottom()
+        app.processEvents()
+        durations.append(perf_counter() - batch_started)
+    elapsed = perf_counter() - started
+
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    return durations, elapsed
+
+
+def flood_frames(app, messages, rate, seconds, batched, rng):
+    """Event loop pass durations while ``rate`` msg/s arrive"""
+    view, model = make_view(messages, batched=batched, hide_system_msg=True)
+    scroll_bar = view.verticalScrollBar()
+    if batched:
+        scroll_bar.rangeChanged.connect(
+            lambda _minimum, maximum: scroll_bar.setValue(maximum)
+        )
+    view.scrollToBottom()
+    app.processEvents()
+
+    interval = INSERT_INTERVAL_MS / 1000 if batched else 0
+    durations = []
+    delivered = 0
+    idx = len(messages)
+    started = last_insert = perf_counter()
+    while perf_counter() - started < seconds:
+        pass_started = perf_counter()
+        count = int((pass_started - started) * rate) - delivered
+        if count > 0 and pass_started - last_insert >= interval:
+            model.add_messages(
+                [make_message(idx + offset, rng) for offset in range(count)]
+            )
+            idx += count
+            delivered += count
+            last_insert = pass_started
+            if not batched:
+                view.scrollToBottom()
+        app.processEvents()
+        durations.append(perf_counter() - pass_started)
+
+    # Let the batched layout finish before checking the view followed
+    for _ in range(100):
+        app.processEvents()
+    at_bottom = scroll_bar.value() == scroll_bar.maximum()
+    view.close()
+    view.deleteLater()
+    app.processEvents()
+    return durations, delivered, at_bottom
+
+
+def summarize(durations):
+    durations = sorted(durations)
+    return {
+        "frames": len(durations),
+        "mean_ms": round(sum(durations) / len(durations) * 1000, 2),
+        "p50_ms": round(durations[len(durations) // 2] * 1000, 2),
+        "p95_ms": round(durations[int(len(durations) * 0.95)] * 1000, 2),
+        "max_ms": round(durations[-1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=("scroll", "resize", "append", "flood"),
+        default=("scroll", "resize"),
+    )
+    parser.add_argument("--append-messages", type=int, default=100_000)
+    parser.add_argument(
+        "--rescan-messages",
+        type=int,
+        default=10_000,
+        help="Appends with the old full rescan, 0 to skip",
+    )
+    parser.add_argument("--batch", type=int, default=100)
+    parser.add_argument(
+        "--burst", action="store_true", help="Insert each batch at once"
+    )
+    parser.add_argument("--flood-rate", type=int, default=3000, help="msg/s")
+    parser.add_argument("--flood-seconds", type=float, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print JSON lines")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    messages = make_messages(args.messages, random.Random(args.seed))
+    scenarios = {"scroll": scroll_frames, "resize": resize_frames}
+
+    for name in args.scenarios:
+        if name == "append":
+            for rescan, count in (
+                (False, args.append_messages),
+                (True, args.rescan_messages),
+            ):
+                if count <= 0:
+                    continue
+                durations, elapsed = append_batches(
+                    app,
+                    count,
+                    args.batch,
+                    rescan,
+                    random.Random(args.seed),
+                    burst=args.burst,
+                )
+                report(
+                    {
+                        "scenario": name,
+                        "rescan": rescan,
+                        "burst": args.burst,
+                        "messages": count,
+                        "messages_per_s": round(count / elapsed, 1),
+                        **summarize(durations),
+                    },
+                    args,
+                )
+            continue
+
+        if name == "flood":
+            for batched in (False, True):
+                durations, delivered, at_bottom = flood_frames(
+                    app,
+                    messages,
+                    args.flood_rate,
+                    args.flood_seconds,
+                    batched,
+                    random.Random(args.seed),
+                )
+                report(
+                    {
+                        "scenario": name,
+                        "batched": batched,
+                        "messages": delivered,
+                        "messages_per_s": round(delivered / args.flood_seconds, 1),
+                        "at_bottom": at_bottom,
+                        **summarize(durations),
+                    },
+                    args,
+                )
+            continue
+
+        for cache_size in (LAYOUT_CACHE_SIZE, 0):
+            view, _model = make_view(messages, cache_size)
+            # One warm-up pass fills the cache like a session that already scrolled
+            scenarios[name](view, min(len(WIDTHS), args.frames))
+            row = {
+                "scenario": name,
+                "cache": bool(cache_size),
+                "messages": args.messages,
+                **summarize(scenarios[name](view, args.frames)),
+            }
+            view.close()
+            view.deleteLater()
+            app.processEvents()
+            report(row, args)
+
+
+def report(row, args):
+    if args.json:
+        print(json.dumps(row), flush=True)
+        return
+    if row["scenario"] == "append":
+        mode = f"{'rescan' if row['rescan'] else 'ranges'}"
+        mode += f"{' burst' if row['burst'] else ''} | {row['messages']} msgs"
+        rate = f" | {row['messages_per_s']:>9.1f} msg/s"
+    elif row["scenario"] == "flood":
+        mode = f"{'batched' if row['batched'] else 'single '} | {row['messages']} msgs"
+        rate = f" | {row['messages_per_s']:>9.1f} msg/s"
+        rate += f" | at bottom {row['at_bottom']}"
+    else:
+        mode = f"cache {'on ' if row['cache'] else 'off'}"
+        rate = ""
+    print(
+        f"{row['scenario']:<7} | {mode} | {row['frames']} frames | "
+        f"mean {row['mean_ms']:>8.2f} ms | p50 {row['p50_ms']:>8.2f} | "
+        f"p95 {row['p95_ms']:>8.2f} | max {row['max_ms']:>8.2f} ms{rate}",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Twitch IRC ingest latency against a local fake IRC server.
+
+Run from the repository root:
+
+    python benchmarks/bench_irc_ingest.py
+
+The server streams tagged PRIVMSG lines with Cyrillic and emoji text in
+chunks cut at random byte offsets, including inside multi-byte characters.
+Latency is measured from the moment the last byte of a line is written to
+the moment TwitchChatListener hands the message to on_message; every
+received text is compared with the text that was sent.
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import sys
+import threading
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.twitch import chat_listener  # noqa: E402
+
+CHANNEL = "bench"
+NICKNAME = "justinfan1"
+TEXTS = [
+    "Привет всем, как дела?",
+    "gg wp 🎉🎉🎉",
+    "Ёжик в тумане 🦔 и лошадка",
+    "simple ascii message",
+    "Смешанный text с эмодзи 😀 и числами 12345",
+    "日本語のテキスト",
+]
+
+
+class FakeIrcServer:
+    def __init__(self, messages, rate, rng):
+        self.messages = messages
+        self.rate = rate
+        self.rng = rng
+        self.sent_at: dict[str, float] = {}
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(1)
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _serve(self):
+        conn, _ = self.sock.accept()
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        handshake = b""
+        while b"JOIN" not in handshake:
+            handshake += conn.recv(4096)
+            if b"NICK" in handshake and b"001" not in handshake:
+                conn.sendall(f":tmi.twitch.tv 001 {NICKNAME} :Welcome\r\n".encode())
+                handshake += b"001"
+        conn.sendall(
+            f":{NICKNAME}!{NICKNAME}@{NICKNAME}.tmi.twitch.tv JOIN #{CHANNEL}\r\n".encode()
+        )
+        threading.Thread(target=self._drain, args=(conn,), daemon=True).start()
+        # Let the listener finish its join handshake
+        sleep(1)
+
+        interval = 1 / self.rate
+        pending = b""
+        for msg_id, text in self.messages:
+            line = (
+                f"@id={msg_id};display-name=user;badges= "
+                f":user!user@user.tmi.twitch.tv PRIVMSG #{CHANNEL} :{text}\r\n"
+            ).encode("utf-8")
+            pending += line
+            # Cut the stream at an arbitrary byte, possibly inside a character
+            cut = self.rng.randrange(1, len(pending) + 1)
+            if cut < len(pending):
+                conn.sendall(pending[:cut])
+                pending = pending[cut:]
+                sleep(interval / 2)
+            self.sent_at[msg_id] = perf_counter()
+            conn.sendall(pending)
+            pending = b""
+            sleep(interval)
+
+    def _drain(self, conn):
+        try:
+            while conn.recv(4096):
+                pass
+        except OSError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--rate", type=float, default=100, help="Messages per second")
+    parser.add_argument("--json", action="store_true", help="Print a JSON line")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    messages = [
+        (f"m{idx}", rng.choice(TEXTS)) for idx in range(args.messages)
+    ]
+    expected = dict(messages)
+    server = FakeIrcServer(messages, args.rate, rng)
+    server.start()
+
+    received_at: dict[str, float] = {}
+    corrupted = []
+    done = threading.Event()
+
+    def on_message(msg_id, msg, **kwargs):
+        received_at[msg_id] = perf_counter()
+        if msg != expected.get(msg_id):
+            corrupted.append((msg_id, msg))
+        if len(received_at) == len(messages):
+            done.set()
+
+    chat_listener.SERVER = "127.0.0.1"
+    chat_listener.PORT = server.port
+    listener = chat_listener.TwitchChatListener(
+        client_id="",
+        access="",
+        refresh="",
+        channel=CHANNEL,
+        nickname=NICKNAME,
+        on_message=on_message,
+        on_connect=lambda: None,
+        on_disconnect=lambda: None,
+        on_error=lambda err: print(f"error: {err}", file=sys.stderr),
+        on_reconnect=lambda: None,
+        on_expiries_access=lambda access, refresh: None,
+        on_expiries_refresh=lambda: None,
+    )
+    # No Helix lookups against the real API from a benchmark
+    listener.avatar_resolver.get = lambda username: None
+    listener.run()
+
+    done.wait(timeout=args.messages / args.rate + 30)
+    listener.disconnect()
+
+    latencies = sorted(
+        (received_at[msg_id] - server.sent_at[msg_id]) * 1000
+        for msg_id in received_at
+        if msg_id in server.sent_at
+    )
+    if not latencies:
+        print("No messages received", file=sys.stderr)
+        sys.exit(1)
+
+    def quantile(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    row = {
+        "messages": len(messages),
+        "received": len(received_at),
+        "corrupted": len(corrupted),
+        "p50_ms": round(quantile(0.5), 3),
+        "p95_ms": round(quantile(0.95), 3),
+        "p99_ms": round(quantile(0.99), 3),
+        "max_ms": round(latencies[-1], 3),
+    }
+    if args.json:
+        print(json.dumps(row))
+    else:
+        print(
+            f"received {row['received']}/{row['messages']} | "
+            f"corrupted {row['corrupted']} | "
+            f"latency p50 {row['p50_ms']:.3f} ms, p95 {row['p95_ms']:.3f} ms, "
+            f"p99 {row['p99_ms']:.3f} ms, max {row['max_ms']:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
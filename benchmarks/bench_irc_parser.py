@@ -0,0 +1,191 @@
+"""Twitch IRC line parser: eager regex parser vs. lazy-tag parser.
+
+Run from the repository root:
+
+    python benchmarks/bench_irc_parser.py
+
+The corpus in irc_corpus.txt is shaped like a busy channel: tagged
+PRIVMSG lines with replies, bits and emotes, USERNOTICE subs and raids,
+CLEARCHAT/CLEARMSG, membership and room-state noise, and a few lines with
+every IRCv3 tag escape.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.twitch.irc_parser import (  # noqa: E402
+    CHAT_COMMANDS,
+    DONATION_MSG_IDS,
+    parse_message,
+)
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "irc_corpus.txt")
+# Tags the chat listener reads for every chat line
+LISTENER_TAGS = (
+    "user-id",
+    "room-id",
+    "subscriber",
+    "bits",
+    "pinned-chat-paid-amount",
+    "msg-id",
+    "emotes",
+)
+
+
+def legacy_parse_message(line):
+    """The parser that split and unescaped every tag up front"""
+    if line.startswith("@"):
+        parts = line.split(" ", 1)
+        if len(parts) < 2:
+            return None
+
+        tags_str = parts[0][1:]
+        rest = parts[1]
+
+        tag_dict = {}
+        for tag in tags_str.split(";"):
+            if "=" in tag:
+                key, value = tag.split("=", 1)
+                value = (
+                    value.replace("\\s", " ").replace("\\:", ";").replace("\\\\", "\\")
+                )
+                tag_dict[key] = value
+
+        match = re.search(r":(\w+)!\w+@\w+\.tmi\.twitch\.tv PRIVMSG #\w+ :(.*)", rest)
+        if match:
+            return {
+                "id": tag_dict.get("id"),
+                "username": match.group(1),
+                "message": match.group(2),
+                "subscriber": tag_dict.get("subscriber") == "1",
+                "mod": tag_dict.get("mod") == "1",
+                "vip": tag_dict.get("vip") == "1",
+                "badges": tag_dict.get("badges", ""),
+                "tags": tag_dict,
+            }
+
+        if " USERNOTICE " in rest:
+            notice_message = tag_dict.get("system-msg", "")
+            trailing_message = ""
+            split_pos = rest.find(" :")
+            if split_pos != -1:
+                trailing_message = rest[split_pos + 2 :]
+            if trailing_message:
+                notice_message = (
+                    f"{notice_message}: {trailing_message}"
+                    if notice_message
+                    else trailing_message
+                )
+            return {
+                "id": tag_dict.get("id"),
+                "username": tag_dict.get("display-name")
+                or tag_dict.get("login")
+                or "twitch",
+                "message": notice_message,
+                "subscriber": tag_dict.get("subscriber") == "1"
+                or tag_dict.get("msg-id") in DONATION_MSG_IDS,
+                "mod": tag_dict.get("mod") == "1",
+                "vip": tag_dict.get("vip") == "1",
+                "badges": tag_dict.get("badges", ""),
+                "tags": tag_dict,
+            }
+    else:
+        match = re.search(r":(\w+)!\w+@\w+\.tmi\.twitch\.tv PRIVMSG #\w+ :(.*)", line)
+        if match:
+            return {
+                "id": None,
+                "username": match.group(1),
+                "message": match.group(2),
+                "subscriber": False,
+                "mod": False,
+                "vip": False,
+                "badges": "",
+                "tags": {},
+            }
+    return None
+
+
+def read_listener_tags(msg_data):
+    if msg_data:
+        tags = msg_data["tags"]
+        for key in LISTENER_TAGS:
+            tags.get(key)
+
+
+def check(lines):
+    fields = ("id", "username", "message", "subscriber", "mod", "vip", "badges")
+    for line in lines:
+        new = parse_message(line)
+        old = legacy_parse_message(line)
+        if old is None:
+            assert new is None or new["command"] not in CHAT_COMMANDS, line
+            continue
+        assert new is not None and new["command"] in CHAT_COMMANDS, line
+        if "\\" in line.split(" ", 1)[0]:
+            # The old chained replace mangled escapes; compare the rest only
+            continue
+        for field in fields:
+            assert new[field] == old[field], (field, line)
+        assert dict(new["tags"]) == old["tags"], line
+
+    new = parse_message(
+        r"@id=e;system-msg=a\\sb\:c\sd\\\\e\rf\ng\x\;login=x "
+        ":tmi.twitch.tv USERNOTICE #streamer :tail"
+    )
+    assert new["tags"]["system-msg"] == "a\\sb;c d\\\\e\rf\ngx", new
+    assert new["message"] == "a\\sb;c d\\\\e\rf\ngx: tail", new
+
+
+def measure(func, lines, min_seconds, with_access):
+    count = 0
+    started = perf_counter()
+    while True:
+        for line in lines:
+            msg_data = func(line)
+            if with_access:
+                read_listener_tags(msg_data)
+        count += len(lines)
+        elapsed = perf_counter() - started
+        if elapsed >= min_seconds:
+            return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    parser.add_argument("--json", action="store_true", help="Print JSON lines")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as file:
+        lines = [line.rstrip("\n") for line in file if line.strip()]
+
+    check(lines)
+
+    for mode, with_access in (("parse", False), ("parse+listener tags", True)):
+        legacy = measure(legacy_parse_message, lines, args.min_seconds, with_access)
+        lazy = measure(parse_message, lines, args.min_seconds, with_access)
+        row = {
+            "mode": mode,
+            "lines": len(lines),
+            "legacy_lines_per_s": round(legacy),
+            "lazy_lines_per_s": round(lazy),
+            "speedup": round(lazy / legacy, 2),
+        }
+        if args.json:
+            print(json.dumps(row))
+        else:
+            print(
+                f"{mode:<20} | legacy {row['legacy_lines_per_s']:>9,} lines/s | "
+                f"lazy {row['lazy_lines_per_s']:>9,} lines/s | x{row['speedup']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
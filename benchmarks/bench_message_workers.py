@@ -0,0 +1,184 @@
+"""Message worker throughput before and after the event-driven loop.
+
+Run from the repository root:
+
+    python benchmarks/bench_message_workers.py --workers 2 3 4
+
+MainWindow.process_messages_loop runs on a small harness instead of a
+window: process_chat_message is replaced by a stub that spends --work-ms
+per message, so only the worker loop itself is measured. Every step queues
+--messages messages at once and reports msg/s until the last one is
+processed, for the current loop and for the old one, which polled the queue
+with get(timeout=0.2) and slept 0.1 s after every message.
+"""
+
+import argparse
+import json
+import os
+from queue import Empty, Queue
+import sys
+import threading
+from time import perf_counter, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main as app_main  # noqa: E402
+
+
+class WorkerHarness:
+    """The MainWindow attributes process_messages_loop touches"""
+
+    def __init__(self, count, work):
+        self.language = "en"
+        self.process_message_queue = Queue()
+        self._stop_event = threading.Event()
+        self.count = count
+        self.work = work
+        self.processed = 0
+        self.errors = []
+        self._lock = threading.Lock()
+        self.done = threading.Event()
+
+    def _is_active_connection_token(self, platform, connection_token):
+        return True
+
+    def process_chat_message(self, **kwargs):
+        if self.work:
+            sleep(self.work)
+        with self._lock:
+            self.processed += 1
+            if self.processed >= self.count:
+                self.done.set()
+
+    def add_sys_message(self, author, text, status=None):
+        self.errors.append(text)
+
+
+def legacy_messages_loop(self):
+    """The polling loop this benchmark compares against"""
+    while not self._stop_event.is_set():
+        try:
+            try:
+                msg_data = self.process_message_queue.get(timeout=0.2)
+            except Empty:
+                continue
+
+            if not self._is_active_connection_token(
+                msg_data["platform"], msg_data["connection_token"]
+            ):
+                continue
+
+            self.process_chat_message(
+                msg_id=msg_data["msg_id"],
+                platform=msg_data["platform"],
+                author=msg_data["author"],
+                message=msg_data["message"],
+                message_ex=msg_data["message_ex"],
+                avatar_url=msg_data["avatar_url"],
+                is_sponsor=msg_data["is_sponsor"],
+                is_staff=msg_data["is_staff"],
+                is_owner=msg_data["is_owner"],
+                is_donate=msg_data["is_donate"],
+            )
+
+        except Exception as e:
+            self.add_sys_message(author="legacy_messages_loop()", text=str(e))
+
+        sleep(0.1)
+
+
+def make_message(idx):
+    return {
+        "msg_id": f"bench-{idx}",
+        "platform": "twitch",
+        "author": f"viewer{idx % 200}",
+        "message": f"message number {idx}",
+        "message_ex": None,
+        "avatar_url": None,
+        "is_sponsor": False,
+        "is_staff": False,
+        "is_owner": False,
+        "is_donate": False,
+        "received_at": None,
+        "connection_token": 1,
+        "trace": None,
+    }
+
+
+def run_step(loop, workers, count, work, timeout):
+    harness = WorkerHarness(count, work)
+    threads = [
+        threading.Thread(target=loop, args=(harness,), daemon=True)
+        for _ in range(workers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    started = perf_counter()
+    for idx in range(count):
+        harness.process_message_queue.put_nowait(make_message(idx))
+    is_done = harness.done.wait(timeout)
+    elapsed = perf_counter() - started
+
+    harness._stop_event.set()
+    for _ in threads:
+        harness.process_message_queue.put_nowait(None)
+    for thread in threads:
+        thread.join(1)
+    return {
+        "workers": workers,
+        "messages": count,
+        "processed": harness.processed,
+        "completed": is_done,
+        "elapsed_s": round(elapsed, 3),
+        "messages_per_s": round(harness.processed / elapsed, 1),
+        "errors": len(harness.errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument(
+        "--work-ms", type=float, default=2, help="Stub time per message, ms"
+    )
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument(
+        "--loops",
+        nargs="+",
+        choices=("legacy", "current"),
+        default=("legacy", "current"),
+    )
+    parser.add_argument("--json", action="store_true", help="Print JSON lines")
+    args = parser.parse_args()
+
+    loops = {
+        "legacy": legacy_messages_loop,
+        "current": app_main.MainWindow.process_messages_loop,
+    }
+    for workers in args.workers:
+        for name in args.loops:
+            row = {
+                "loop": name,
+                **run_step(
+                    loops[name],
+                    workers,
+                    args.messages,
+                    args.work_ms / 1000,
+                    args.timeout,
+                ),
+            }
+            if args.json:
+                print(json.dumps(row), flush=True)
+                continue
+            print(
+                f"{row['loop']:<7} | {workers} workers | {row['processed']}/"
+                f"{row['messages']} msgs in {row['elapsed_s']:>7.3f} s | "
+                f"{row['messages_per_s']:>8.1f} msg/s",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
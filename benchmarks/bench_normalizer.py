@@ -0,0 +1,156 @@
+"""Speech text normalizer: per-stage timings and a golden-output check.
+
+Run from the repository root:
+
+    python benchmarks/bench_normalizer.py
+
+The golden file holds the output of the previous stage-by-stage pipeline on
+the generated corpus; any difference fails the run before timing starts.
+Pass --write-golden to regenerate it after an intended behaviour change.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.translations import map_symbols, transliteration  # noqa: E402
+from app.utils import (  # noqa: E402
+    clean_emoji,
+    clean_links,
+    clean_message,
+    clean_punctuation,
+    clean_symbol_spam,
+    clean_symbols,
+    convert_numbers_to_words,
+    normalize_speech_text,
+)
+
+GOLDEN_PATH = os.path.join(ROOT, "benchmarks", "normalizer_golden.json")
+LANGUAGES = ("ru", "en")
+
+SAMPLES = [
+    "Привет всем!!! Как дела? 😀😀😀",
+    "check https://example.com/path?x=1 and www.site.ru ok",
+    "ahahahahahahahaha LOL 100% +1",
+    "Стрим топ 12345678901 рублей за 3.14 и 2,5",
+    "<:Kappa:123456789> :smile: :+1: hi",
+    "ааааааааааааа ооооочень круто",
+    "Tom & Jerry = best 5+5",
+    "Ёлка Ёжик ЁЁЁ ёё",
+    "Shchuka SHCH tion nation XX qu queen",
+    "007 agent 0.5 cost 1,000,000",
+    "   spaces   everywhere   ",
+    "!!!???...",
+    "@user check this out lmaooooo",
+    "ПРИВЕТ ЧАТ КАК ДЕЛА",
+    "gg wp 1v1 me bro 2023",
+]
+ALPHABET = (
+    "abcdefghijklmnopqrstuvwxyzABCXYZабвгдеёжзийклмнопрстуфхцчшщъыьэюяАБВЁЯ"
+    "0123456789 .,:;!?%+=&/-_<>@#()'\"😀"
+)
+
+STAGES = {
+    "clean_links": lambda text, lang: clean_links(text, lang=lang),
+    "clean_emoji": lambda text, lang: clean_emoji(text),
+    "convert_numbers_to_words": convert_numbers_to_words,
+    "clean_symbol_spam": lambda text, lang: clean_symbol_spam(text),
+    "map_symbols": lambda text, lang: map_symbols(text, lang=lang),
+    "transliteration": lambda text, lang: transliteration(text, lang=lang),
+    "clean_message": lambda text, lang: clean_message(text),
+    "clean_symbols": lambda text, lang: clean_symbols(text),
+    "clean_punctuation": lambda text, lang: clean_punctuation(text),
+    "normalize_speech_text": normalize_speech_text,
+}
+
+
+def make_corpus(count, seed=7):
+    rng = random.Random(seed)
+    words = [word for sample in SAMPLES for word in sample.split()]
+    corpus = list(SAMPLES)
+    for _ in range(count):
+        if rng.random() < 0.5:
+            length = rng.randint(0, 60)
+            corpus.append("".join(rng.choice(ALPHABET) for _ in range(length)))
+        else:
+            corpus.append(" ".join(rng.choice(words) for _ in range(rng.randint(1, 12))))
+    return corpus
+
+
+def run_stages(corpus):
+    return {
+        lang: {name: [stage(text, lang) for text in corpus] for name, stage in STAGES.items()}
+        for lang in LANGUAGES
+    }
+
+
+def measure(stage, corpus, lang, min_seconds):
+    calls = 0
+    started = perf_counter()
+    while True:
+        for text in corpus:
+            stage(text, lang)
+        calls += len(corpus)
+        elapsed = perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--min-seconds", type=float, default=0.5)
+    parser.add_argument("--json", action="store_true", help="Print JSON lines")
+    parser.add_argument(
+        "--write-golden", action="store_true", help="Store the current output"
+    )
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.messages)
+    outputs = run_stages(corpus)
+
+    if args.write_golden:
+        with open(GOLDEN_PATH, "w", encoding="utf-8") as file:
+            json.dump(
+                {"messages": args.messages, "outputs": outputs},
+                file,
+                ensure_ascii=False,
+            )
+        print(f"Golden output written to {GOLDEN_PATH}")
+        return
+
+    if os.path.exists(GOLDEN_PATH):
+        with open(GOLDEN_PATH, encoding="utf-8") as file:
+            golden = json.load(file)
+        if golden["messages"] == args.messages:
+            golden_corpus = corpus
+        else:
+            golden_corpus = make_corpus(golden["messages"])
+            outputs = run_stages(golden_corpus)
+        for lang, stages in golden["outputs"].items():
+            for name, expected in stages.items():
+                actual = outputs[lang][name]
+                for text, want, got in zip(golden_corpus, expected, actual):
+                    assert got == want, (lang, name, text, want, got)
+
+    for lang in LANGUAGES:
+        for name, stage in STAGES.items():
+            row = {
+                "lang": lang,
+                "stage": name,
+                "us_per_msg": round(measure(stage, corpus, lang, args.min_seconds), 2),
+            }
+            if args.json:
+                print(json.dumps(row))
+            else:
+                print(f"{lang} | {name:<26} | {row['us_per_msg']:>9.2f} us/msg")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+"""End-to-end chat-to-speech benchmark with a headless audio sink.
+
+Run from the repository root:
+
+    python benchmarks/bench_pipeline.py --rates 1 5 20 --seconds 30
+    python benchmarks/bench_pipeline.py --recording chat.jsonl.gz --speeds 1 4 0
+
+MainWindow runs offscreen with its real message workers, Detoxify and
+Silero models; only the sounddevice stream is replaced by a
+HeadlessOutputStream that consumes audio in real time (--sink realtime) or
+as fast as it is written (--sink instant). Messages are synthetic chat at a
+fixed rate or a recording made with File > Chat recording, replayed at the
+given speeds (0 is as fast as possible).
+
+Every step drains the pipeline before the next one starts and reports
+accepted and spoken msg/s, time to first audio from arrival to the first
+played frame, drop counts and peak RSS. --json prints one JSON line per
+step after a "meta" line; --output appends the same lines to a file so
+runs of different releases on one machine can be compared.
+
+The TTS cache is disabled unless --tts-cache is given, so every message
+is synthesized by Silero instead of being served from memory or disk;
+each step reports the cache hits and misses it caused either way.
+
+The user's settings file is neither read nor written and bans are not
+saved; the models come from the usual torch hub cache.
+"""
+
+import argparse
+from functools import partial
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+from time import monotonic, sleep
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import main as app_main  # noqa: E402
+from app.audio_player import HeadlessOutputStream  # noqa: E402
+from app.utils import load_stop_words  # noqa: E402
+
+TEXTS = {
+    "ru": [
+        "Привет всем, как дела?",
+        "Сегодня отличный стрим, спасибо!",
+        "А когда будет следующая игра?",
+        "Купил 3 билета за 1500 рублей 🎉",
+        "Кто смотрел вчерашний матч? Было 2:1",
+        "Ну это было очень неожиданно",
+        "Стример, передай привет маме 😀",
+        "Какой у тебя микрофон?",
+        "ахахаха это лучшее что я видел за неделю",
+        "Подскажите, где найти запись прошлого эфира?",
+    ],
+    "en": [
+        "Hello everyone, how is it going?",
+        "Great stream today, thanks!",
+        "When is the next game?",
+        "Bought 3 tickets for $15 🎉",
+        "Did anyone watch the match yesterday? It was 2:1",
+        "Well that was unexpected",
+        "Say hi to my mom 😀",
+        "What microphone do you use?",
+        "hahaha best thing I have seen all week",
+        "Where can I find the last stream recording?",
+    ],
+}
+AUTHORS = 200
+DONATION_SHARE = 0.02
+SPONSOR_SHARE = 0.1
+POLL_INTERVAL = 0.01
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        memory_info = psutil.Process().memory_info()
+        return round(getattr(memory_info, "peak_wset", memory_info.rss) / 2**20, 1)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def quantile_ms(values, q):
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 1)
+
+
+class PipelineProbe:
+    """Counts messages in flight and collects the accepted speech items"""
+
+    def __init__(self, window):
+        self.window = window
+        self.items = []
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+        process_chat_message = window.process_chat_message
+        track_speech_item = window._track_speech_item
+
+        def process(*args, **kwargs):
+            with self._lock:
+                self.in_flight += 1
+            try:
+                return process_chat_message(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+        def track(item):
+            is_tracked = track_speech_item(item)
+            if is_tracked:
+                with self._lock:
+                    self.items.append(item)
+            return is_tracked
+
+        window.process_chat_message = process
+        window._track_speech_item = track
+
+    def reset(self):
+        with self._lock:
+            self.items = []
+        with self.window.stats_lock:
+            self.window.messages_stats.clear()
+
+    def is_idle(self) -> bool:
+        window = self.window
+        with window.audio_ready:
+            is_playing = bool(window.playback_queue)
+        return (
+            self.in_flight == 0
+            and window.process_message_queue.empty()
+            and not is_playing
+            and not window.speech_scheduler.has_pending()
+            and window._current_speech_item is None
+            and window.audio_player.buffered_seconds() == 0
+        )
+
+
+def wait_until(app, predicate, timeout):
+    deadline = monotonic() + timeout
+    while not predicate():
+        if monotonic() > deadline:
+            return False
+        app.processEvents()
+        sleep(POLL_INTERVAL)
+    return True
+
+
+def feed_synthetic(window, rate, seconds, rng, language):
+    """Push chat at a steady rate through the replay connection; returns the count"""
+    token = window._open_connection_token("replay")
+    on_msg = window._chat_message_callback("twitch", token)
+    texts = TEXTS.get(language, TEXTS["en"])
+    total = max(1, int(rate * seconds))
+    started = monotonic()
+    for idx in range(total):
+        delay = started + idx / rate - monotonic()
+        if delay > 0:
+            sleep(delay)
+        roll = rng.random()
+        on_msg(
+            msg_id=f"bench-{token}-{idx}",
+            author=f"viewer{rng.randrange(AUTHORS)}",
+            msg=rng.choice(texts),
+            is_donate=roll < DONATION_SHARE,
+            is_sponsor=DONATION_SHARE <= roll < DONATION_SHARE + SPONSOR_SHARE,
+        )
+    return total
+
+
+def replay(window, path, speed):
+    """Replay a recording through the listeners; returns the replayed event count"""
+    chat_replay = window.start_chat_replay(path, speed)
+    chat_replay.join()
+    return chat_replay.count
+
+
+def run_step(app, window, probe, feed, drain_timeout):
+    probe.reset()
+    result = {}
+    cache_before = window.tts_cache.stats()
+
+    def run_feed():
+        result["injected"] = feed()
+
+    started = monotonic()
+    feeder = threading.Thread(target=run_feed, daemon=True)
+    feeder.start()
+    wait_until(app, lambda: not feeder.is_alive(), float("inf"))
+    feed_seconds = monotonic() - started
+    is_drained = wait_until(app, probe.is_idle, drain_timeout)
+    elapsed = monotonic() - started
+
+    with window.stats_lock:
+        stats = dict(window.messages_stats)
+    cache_after = window.tts_cache.stats()
+    items = list(probe.items)
+    ttfa = sorted(
+        item.audio_started_at - item.received_at
+        for item in items
+        if item.audio_started_at is not None
+    )
+    spoken = stats.get("spoken_count", 0)
+    return {
+        "injected": result.get("injected", 0),
+        "accepted": len(items),
+        "spoken": spoken,
+        "accepted_per_s": round(len(items) / feed_seconds, 2),
+        "spoken_per_s": round(spoken / elapsed, 2),
+        "ttfa_p50_ms": quantile_ms(ttfa, 0.5),
+        "ttfa_p95_ms": quantile_ms(ttfa, 0.95),
+        "ttfa_p99_ms": quantile_ms(ttfa, 0.99),
+        "ttfa_max_ms": round(ttfa[-1] * 1000, 1) if ttfa else None,
+        "dropped": sum(1 for item in items if item.audio_started_at is None),
+        "filtered": stats.get("filtered_count", 0),
+        "stale": stats.get("stale_count", 0),
+        "shed": stats.get("shed_count", 0),
+        "purged": stats.get("purged_count", 0),
+        "tts_hits": cache_after["hits"] - cache_before["hits"],
+        "tts_disk_hits": cache_after["disk_hits"] - cache_before["disk_hits"],
+        "tts_misses": cache_after["misses"] - cache_before["misses"],
+        "drained": is_drained,
+        "feed_s": round(feed_seconds, 2),
+        "elapsed_s": round(elapsed, 2),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def emit(row, args):
+    line = json.dumps(row, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as file:
+            file.write(line + "\n")
+    if args.json:
+        print(line, flush=True)
+        return
+    if row["kind"] == "meta":
+        print(
+            f"{row['revision'] or '-'} | {row['platform']} | {row['cpus']} CPUs | "
+            f"sink {row['sink']} | {row['language']} | "
+            f"{row['tts_replicas']} TTS replicas | toxicity {row['toxicity']} | "
+            f"TTS cache {row['tts_cache']}",
+            flush=True,
+        )
+        return
+    print(
+        f"{row['step']:<10} | in {row['injected']:>5} | "
+        f"accepted {row['accepted_per_s']:>6.2f}/s | spoken {row['spoken_per_s']:>6.2f}/s | "
+        f"TTFA p50 {row['ttfa_p50_ms']} p95 {row['ttfa_p95_ms']} p99 {row['ttfa_p99_ms']} ms | "
+        f"dropped {row['dropped']} (stale {row['stale']}, shed {row['shed']}, "
+        f"filtered {row['filtered']}) | TTS cache hits {row['tts_hits']} "
+        f"misses {row['tts_misses']} | RSS {row['peak_rss_mb']} MB"
+        + ("" if row["drained"] else " | NOT DRAINED"),
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rates", type=float, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--seconds", type=float, default=30, help="Per synthetic step")
+    parser.add_argument("--recording", help="Replay a chat recording instead")
+    parser.add_argument("--speeds", type=float, nargs="+", default=[1, 4, 0])
+    parser.add_argument("--sink", choices=("realtime", "instant"), default="realtime")
+    parser.add_argument("--language", choices=sorted(TEXTS), default="ru")
+    parser.add_argument("--no-toxicity", action="store_true", help="Skip Detoxify")
+    parser.add_argument(
+        "--tts-cache", action="store_true", help="Keep the TTS cache enabled"
+    )
+    parser.add_argument("--model-timeout", type=float, default=600)
+    parser.add_argument("--drain-timeout", type=float, default=300)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", action="store_true", help="Print JSON lines")
+    parser.add_argument("--output", help="Append JSON lines to this file")
+    args = parser.parse_args()
+
+    settings_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    app_main.get_settings_path = lambda: os.path.join(settings_dir, "settings.json")
+
+    app = QApplication(sys.argv)
+    window = app_main.MainWindow()
+    window.save_settings = lambda: None
+    window.save_banned_list = lambda: None
+    window.banned_set = set()
+    window.voice_language = args.language
+    window.stop_words = load_stop_words(args.language)
+    if args.no_toxicity:
+        window.toxic_sense = 1.0
+    if not args.tts_cache:
+        # Fixed texts would otherwise be synthesized once and then served
+        window.tts_cache.resize(0)
+        window.tts_cache.set_cache_dir(None)
+        window.tts_cache.clear()
+    window.audio_player.stream_factory = partial(
+        HeadlessOutputStream, realtime=args.sink == "realtime"
+    )
+    probe = PipelineProbe(window)
+
+    def models_ready():
+        return window.silero_model is not None and (
+            args.no_toxicity or window.toxicity_batcher is not None
+        )
+
+    if not wait_until(app, models_ready, args.model_timeout):
+        print("Models did not load in time", file=sys.stderr)
+        window.stop_background_services()
+        sys.exit(1)
+
+    emit(
+        {
+            "kind": "meta",
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sink": args.sink,
+            "language": args.language,
+            "tts_replicas": window.tts_replicas,
+            "message_workers": window.message_workers,
+            "toxicity": not args.no_toxicity,
+            "tts_cache": args.tts_cache,
+            "seconds": args.seconds,
+            "recording": args.recording,
+        },
+        args,
+    )
+
+    rng = random.Random(args.seed)
+    if args.recording:
+        steps = [
+            (
+                f"x{speed:g}" if speed else "max",
+                lambda speed=speed: replay(window, args.recording, speed),
+            )
+            for speed in args.speeds
+        ]
+    else:
+        steps = [
+            (
+                f"{rate:g}/s",
+                lambda rate=rate: feed_synthetic(
+                    window, rate, args.seconds, rng, args.language
+                ),
+            )
+            for rate in args.rates
+        ]
+
+    for step, feed in steps:
+        row = run_step(app, window, probe, feed, args.drain_timeout)
+        emit({"kind": "step", "step": step, **row}, args)
+        # Drop whatever a step that did not drain left behind
+        window._close_connection_token("replay")
+
+    window.stop_background_services()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Stop-word cleaning: per-call regex vs. compiled StopWordMatcher.
+
+Run from the repository root:
+
+    python benchmarks/bench_stop_words.py
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.stop_words import StopWordMatcher  # noqa: E402
+from app.utils import clean_stop_words, clean_symbols  # noqa: E402
+
+ALPHABET = "абвгдеежзийклмнопрстуфхцчшщъыьэюя"
+SIZES = (100, 1_000, 10_000, 100_000)
+
+
+def legacy_clean_stop_words(text, stop_words):
+    """The implementation that compiled the overlap regex on every call"""
+    if not text or not stop_words:
+        return text
+
+    stop_words_set = set(stop_words)
+    normalized_text = text.lower().replace("ё", "е")
+    cleaned_text = clean_symbols(normalized_text)
+    spans = []
+
+    for match in re.finditer(r"[^\s]+", cleaned_text):
+        if match.group(0) in stop_words_set:
+            spans.append((match.start(), match.end()))
+
+    long_stop_words = [word for word in stop_words_set if len(word) >= 4]
+    if long_stop_words:
+        long_stop_words.sort(key=len, reverse=True)
+        overlap_pattern = re.compile(
+            f"(?=({'|'.join(re.escape(word) for word in long_stop_words)}))"
+        )
+        for match in overlap_pattern.finditer(cleaned_text):
+            spans.append((match.start(), match.start() + len(match.group(1))))
+
+        chars = []
+        index_map = []
+        for idx, char in enumerate(cleaned_text):
+            if char != " ":
+                chars.append(char)
+                index_map.append(idx)
+        joined_text = "".join(chars)
+        for match in overlap_pattern.finditer(joined_text):
+            start = match.start()
+            end = index_map[start + len(match.group(1)) - 1] + 1
+            spans.append((index_map[start], end))
+
+    if not spans:
+        return text
+
+    spans.sort()
+    merged_spans = []
+    current_start, current_end = spans[0]
+    for start, end in spans[1:]:
+        if start <= current_end:
+            current_end = max(current_end, end)
+        else:
+            merged_spans.append((current_start, current_end))
+            current_start, current_end = start, end
+    merged_spans.append((current_start, current_end))
+
+    result = []
+    last_end = 0
+    for start, end in merged_spans:
+        result.append(text[last_end:start])
+        result.append("-_-")
+        last_end = end
+    result.append(text[last_end:])
+    return "".join(result)
+
+
+def random_word(rng, min_len=3, max_len=10):
+    return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(min_len, max_len)))
+
+
+def make_messages(rng, stop_words, count):
+    messages = []
+    for _ in range(count):
+        words = [random_word(rng, 2, 8) for _ in range(rng.randint(3, 15))]
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(stop_words))
+        messages.append(" ".join(words))
+    return messages
+
+
+def measure(func, messages, stop_words, min_seconds):
+    calls = 0
+    started = perf_counter()
+    while True:
+        for message in messages:
+            func(message, stop_words)
+        calls += len(messages)
+        elapsed = perf_counter() - started
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="*", default=SIZES)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    parser.add_argument("--json", action="store_true", help="Print JSON lines")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for size in args.sizes:
+        words = sorted({random_word(rng) for _ in range(size)})
+        messages = make_messages(rng, words, args.messages)
+
+        started = perf_counter()
+        matcher = StopWordMatcher(words)
+        build_ms = (perf_counter() - started) * 1000
+
+        for message in messages:
+            assert clean_stop_words(message, matcher) == legacy_clean_stop_words(
+                message, words
+            )
+
+        legacy_us = measure(legacy_clean_stop_words, messages, words, args.min_seconds)
+        matcher_us = measure(clean_stop_words, messages, matcher, args.min_seconds)
+        row = {
+            "stop_words": len(words),
+            "build_ms": round(build_ms, 2),
+            "legacy_us_per_msg": round(legacy_us, 2),
+            "matcher_us_per_msg": round(matcher_us, 2),
+            "speedup": round(legacy_us / matcher_us, 1),
+        }
+        if args.json:
+            print(json.dumps(row))
+        else:
+            print(
+                f"{row['stop_words']:>7} words | build {row['build_ms']:>9.2f} ms | "
+                f"legacy {row['legacy_us_per_msg']:>11.2f} us/msg | "
+                f"matcher {row['matcher_us_per_msg']:>8.2f} us/msg | "
+                f"x{row['speedup']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,19 @@
 import csv
+from functools import partial
 from logging import DEBUG, Formatter, Logger, StreamHandler
 import os
-from random import randint
+from random import choice
 import sys
 from collections import defaultdict, deque
-from queue import Empty, Full, Queue
+from queue import Queue
 from datetime import datetime
 import gc
 import json
 import html
 import threading
-from time import sleep
+from time import monotonic
 from typing import Iterable, TypedDict
 
-import sounddevice as sd
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -40,21 +40,42 @@ from PyQt6.QtCore import (
     QTimer,
     QFile,
     QIODevice,
+    pyqtSignal,
 )
 from PyQt6.QtGui import QFont, QAction, QPalette, QIcon, QShortcut, QKeySequence
 import numpy as np
 
+from app.audio_player import AudioPlayer
 from app.chat_message import ChatMessage, ChatMessageListModel
-from app.chat_overlay import ChatOverlayWindow
+from app.chat_recording import (
+    RECORDING_SUFFIX,
+    ChatRecorder,
+    ChatReplay,
+    from_record_data,
+)
+from app.chat_overlay import INSERT_INTERVAL_MS, ChatOverlayWindow
+from app.dedup import DEDUP_WINDOW_SECONDS, RecentIds
 from app.constants_qt import COLORS_RGBA, COLORS_SOLID
 from app.menu_combo_check_box import MenuComboCheckBox
 from app.schema import MessageStatsTD, TwitchCredentialsTD
+from app.silero_pool import SileroPool
+from app.speech import SpeechDurationEstimator, SpeechIndex, SpeechItem
+from app.stop_words import StopWordMatcher
+from app.speech_scheduler import (
+    SPEECH_TIER_NAMES,
+    SPEECH_TIERS,
+    SpeechScheduler,
+    speech_tier,
+    tier_settings,
+)
+from app.toxicity import ToxicityBatcher
+from app.tracing import LatencyTracer, MessageTrace
+from app.tts_cache import TTSCache, tts_cache_key
 from app.message_widget import MSG_STATUS_COLOR, MessageWidget
 from app.translations import (
     DEFAULT_LANGUAGE,
     TRANSLATIONS,
     _,
-    map_symbols,
     translate_segments,
     translate_text,
     transliteration,
@@ -82,21 +103,24 @@ from app.utils import (
     clear_cache_silero,
     configure_torch_hub_cache,
     contain_words_or_nums,
-    convert_numbers_to_words,
     detoxify_get_model_and_tokenizer_local_only,
     find_cached_detoxify_checkpoint,
     find_cached_silero_repo,
     get_banned_list_path,
+    get_chat_recordings_path,
     get_detoxify,
     get_detoxify_impl,
     get_settings_path,
     get_torch_hub,
+    get_tts_cache_path,
+    get_twitch_avatar_cache_path,
     icon_path,
     all_letters_is,
     load_stop_words,
+    normalize_speech_text,
     resource_path,
     save_stop_words,
-    torch_no_grad,
+    split_speech_chunks,
 )
 from app.youtube.chat_parser import YouTubeChatParser
 from app.banned_list_widget import BannedListDialog
@@ -140,9 +164,14 @@ class PlatformMessage(TypedDict):
     is_staff: bool
     is_owner: bool
     is_donate: bool
+    received_at: float
+    trace: MessageTrace | None
 
 
 class MainWindow(QMainWindow):
+    # Wakes the UI thread to drain the _pending_* queues filled by workers
+    ui_flush_requested = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle(APP_NAME)
@@ -168,12 +197,25 @@ class MainWindow(QMainWindow):
         self.volume = DEFAULTS["volume"]
         self.speech_rate = DEFAULTS["speech_rate"]
         self.speech_delay = DEFAULTS["speech_delay"]
+        self.tts_cache_mb = DEFAULTS["tts_cache_mb"]
+        self.tts_disk_cache = DEFAULTS["tts_disk_cache"]
+        self.record_chat = DEFAULTS["record_chat"]
+        self.latency_tracing = DEFAULTS["latency_tracing"]
+        self.tts_replicas = DEFAULTS["tts_replicas"]
+        self.speech_max_wait = DEFAULTS["speech_max_wait"]
+        self.max_backlog_seconds = DEFAULTS["max_backlog_seconds"]
+        self.speech_tier_weights = dict(DEFAULTS["speech_tier_weights"])
+        self.speech_tier_caps = dict(DEFAULTS["speech_tier_caps"])
+        self.stream_synthesis = DEFAULTS["stream_synthesis"]
+        self.speculative_synthesis = DEFAULTS["speculative_synthesis"]
         self.min_text_length = DEFAULTS["min_text_length"]
         self.max_text_length = DEFAULTS["max_text_length"]
         self.toxic_sense = DEFAULTS["toxic_sense"]
+        self.toxic_batch_size = DEFAULTS["toxic_batch_size"]
+        self.toxic_batch_wait_ms = DEFAULTS["toxic_batch_wait_ms"]
         self.ban_limit = DEFAULTS["ban_limit"]
 
-        self.stop_words = tuple()
+        self.stop_words = StopWordMatcher()
         self.is_paused = False
 
         self.chat_model = ChatMessageListModel()
@@ -204,7 +246,10 @@ class MainWindow(QMainWindow):
 
         # Connections
         self._connection_token_seq = 0
-        self._active_connection_tokens = {"youtube": None, "twitch": None}
+        self._active_connection_tokens = {"youtube": None, "twitch": None, "replay": None}
+        self.chat_recorder: ChatRecorder | None = None
+        self._chat_recorder_lock = threading.Lock()
+        self.chat_replay: ChatReplay | None = None
 
         self.youtube = None
         self.yt_credentials = None
@@ -223,24 +268,64 @@ class MainWindow(QMainWindow):
         self._pending_status_messages = deque()
         self._pending_ui_calls = deque()
         self._pending_stats_update = False
+        # At most one flush is queued at a time, so a burst is drained at once
+        self._ui_flush_lock = threading.Lock()
+        self._ui_flush_scheduled = False
+        self.ui_flush_requested.connect(
+            self._flush_pending_messages, Qt.ConnectionType.QueuedConnection
+        )
+        # Chat inserts closer than INSERT_INTERVAL_MS wait for this timer and
+        # go into the model together
+        self._last_chat_insert_at = 0.0
+        self._chat_insert_timer = QTimer(self)
+        self._chat_insert_timer.setSingleShot(True)
+        self._chat_insert_timer.timeout.connect(self._flush_pending_messages)
         self.toxic_dict = defaultdict(float)
         self.banned_set = set()
-        self.processed_messages = set()
+        self.processed_messages = RecentIds()
+        self.deleted_messages = RecentIds()
+        # (connection token, "platform:author" or "platform") -> moment its
+        # earlier messages were purged
+        self._purged_before: dict[tuple, float] = {}
+        self.speech_index = SpeechIndex()
         self.message_state_lock = threading.Lock()
         self.stats_lock = threading.Lock()
         self.message_workers = min(4, max(2, os.cpu_count() or 2))
         self._cache_clear_in_progress = False
 
         self.load_settings()
+        self.message_workers = max(self.message_workers, self.tts_replicas)
+        self.latency_tracer = LatencyTracer(enabled=self.latency_tracing)
 
-        self.audio_queue = Queue(maxsize=self.buffer_maxsize)
-        self.donation_audio_queue = Queue()
+        self.speech_scheduler = SpeechScheduler(
+            weights=self.speech_tier_weights,
+            caps={**self.speech_tier_caps, "regular": self.buffer_maxsize},
+        )
+        self.playback_queue: deque[SpeechItem] = deque()
+        self.speech_estimator = SpeechDurationEstimator()
+        # Indices of running render workers; those >= tts_replicas retire
+        self._render_worker_ids: set[int] = set()
         self.process_message_queue = Queue()
+        self.audio_ready = threading.Condition()
+        self._stop_event = threading.Event()
+        self.tts_cache = TTSCache(
+            max_bytes=self.tts_cache_mb * 1024 * 1024,
+            cache_dir=get_tts_cache_path() if self.tts_disk_cache else None,
+            max_disk_bytes=DEFAULTS["tts_disk_cache_mb"] * 1024 * 1024,
+        )
+        self.audio_player = AudioPlayer(
+            samplerate=SAMPLE_RATE,
+            on_clip_start=self._on_clip_start,
+            on_clip_end=self._on_clip_end,
+        )
+        self._current_speech_item: SpeechItem | None = None
 
         self.setup_ui()
 
         self.detox_model = None
+        self.toxicity_batcher: ToxicityBatcher | None = None
         self.silero_model = None
+        self.silero_pool = SileroPool(replicas=self.tts_replicas)
         self.model_lock = threading.Lock()
 
         QTimer.singleShot(0, self.start_background_services)
@@ -250,6 +335,8 @@ class MainWindow(QMainWindow):
             self.on_disconnect_twitch()
         if self.youtube:
             self.on_disconnect_yt()
+        self.stop_chat_replay()
+        self._close_chat_recorder()
         if self.chat_overlay is not None:
             self.chat_overlay.close()
 
@@ -257,17 +344,14 @@ class MainWindow(QMainWindow):
         #     self.game_overlay_bridge.set_enabled(False)
 
         self.save_settings()
-        sd.stop()
+        self.stop_background_services()
         super().closeEvent(event)
 
     def start_background_services(self):
         threading.Thread(target=self.process_audio_loop, daemon=True).start()
         for worker_idx in range(self.message_workers):
-            threading.Thread(
-                target=self.process_messages_loop,
-                daemon=True,
-                name=f"process_messages_loop_{worker_idx}",
-            ).start()
+            self.start_message_worker(worker_idx)
+        self.start_render_workers()
         threading.Thread(
             target=lambda: self.init_silero(self.voice_language), daemon=True
         ).start()
@@ -282,6 +366,38 @@ class MainWindow(QMainWindow):
         else:
             threading.Thread(target=self.init_detoxify, daemon=True).start()
 
+    def start_message_worker(self, worker_idx):
+        threading.Thread(
+            target=self.process_messages_loop,
+            daemon=True,
+            name=f"process_messages_loop_{worker_idx}",
+        ).start()
+
+    def start_render_workers(self):
+        with self.audio_ready:
+            for worker_idx in range(self.tts_replicas):
+                if worker_idx in self._render_worker_ids:
+                    continue
+                self._render_worker_ids.add(worker_idx)
+                threading.Thread(
+                    target=self.process_render_loop,
+                    args=(worker_idx,),
+                    daemon=True,
+                    name=f"process_render_loop_{worker_idx}",
+                ).start()
+
+    def stop_background_services(self):
+        self._stop_event.set()
+        for _worker_idx in range(self.message_workers):
+            self.process_message_queue.put_nowait(None)
+        self._notify_audio_ready()
+        current_item = self._current_speech_item
+        if current_item is not None:
+            current_item.cancel()
+        self.audio_player.close()
+        if self.toxicity_batcher is not None:
+            self.toxicity_batcher.stop()
+
     # === UI setup ===
 
     def setup_menu_bar(self):
@@ -341,6 +457,44 @@ class MainWindow(QMainWindow):
         )
         export_log_action.addAction(msg_log_merge_recalc_action)
 
+        chat_recording_menu = QMenu(_(self.language, "Chat recording"), file_menu)
+        file_menu.addMenu(chat_recording_menu)
+        record_chat_action = QAction(_(self.language, "Record chat"), chat_recording_menu)
+        record_chat_action.setCheckable(True)
+        record_chat_action.setChecked(self.record_chat)
+        record_chat_action.triggered.connect(self.toggle_record_chat)
+        chat_recording_menu.addAction(record_chat_action)
+        replay_menu = QMenu(_(self.language, "Replay recording"), chat_recording_menu)
+        chat_recording_menu.addMenu(replay_menu)
+        for label, speed in (("1x", 1.0), ("4x", 4.0), ("16x", 16.0), ("Max", 0.0)):
+            replay_action = QAction(_(self.language, label), replay_menu)
+            replay_action.triggered.connect(
+                lambda checked, s=speed: self.on_replay_chat_action(s)
+            )
+            replay_menu.addAction(replay_action)
+        stop_replay_action = QAction(_(self.language, "Stop replay"), chat_recording_menu)
+        stop_replay_action.triggered.connect(self.stop_chat_replay)
+        chat_recording_menu.addAction(stop_replay_action)
+
+        latency_tracing_menu = QMenu(_(self.language, "Latency tracing"), file_menu)
+        file_menu.addMenu(latency_tracing_menu)
+        latency_tracing_action = QAction(
+            _(self.language, "Trace latency"), latency_tracing_menu
+        )
+        latency_tracing_action.setCheckable(True)
+        latency_tracing_action.setChecked(self.latency_tracing)
+        latency_tracing_action.triggered.connect(self.toggle_latency_tracing)
+        latency_tracing_menu.addAction(latency_tracing_action)
+        for minutes in (1, 5, 10):
+            export_trace_action = QAction(
+                f"{_(self.language, 'Export trace')} ({minutes} {_(self.language, 'min')})",
+                latency_tracing_menu,
+            )
+            export_trace_action.triggered.connect(
+                lambda checked, m=minutes: self.export_latency_trace(m * 60)
+            )
+            latency_tracing_menu.addAction(export_trace_action)
+
         load_models_action = QAction(_(self.language, "Load models"), file_menu)
         load_models_action.triggered.connect(self.on_load_models_action)
         file_menu.addAction(load_models_action)
@@ -418,6 +572,32 @@ class MainWindow(QMainWindow):
         auto_translate_action.triggered.connect(self.toggle_auto_translate)
         self.voice_menu.addAction(auto_translate_action)
 
+        tts_disk_cache_action = QAction(
+            _(self.language, "Cache speech on disk"), self.voice_menu
+        )
+        tts_disk_cache_action.setCheckable(True)
+        tts_disk_cache_action.setChecked(self.tts_disk_cache)
+        tts_disk_cache_action.triggered.connect(self.toggle_tts_disk_cache)
+        self.voice_menu.addAction(tts_disk_cache_action)
+
+        stream_synthesis_action = QAction(
+            _(self.language, "Stream speech by sentences"), self.voice_menu
+        )
+        stream_synthesis_action.setCheckable(True)
+        stream_synthesis_action.setChecked(self.stream_synthesis)
+        stream_synthesis_action.triggered.connect(self.toggle_stream_synthesis)
+        self.voice_menu.addAction(stream_synthesis_action)
+
+        speculative_synthesis_action = QAction(
+            _(self.language, "Synthesize during toxicity check"), self.voice_menu
+        )
+        speculative_synthesis_action.setCheckable(True)
+        speculative_synthesis_action.setChecked(self.speculative_synthesis)
+        speculative_synthesis_action.triggered.connect(
+            self.toggle_speculative_synthesis
+        )
+        self.voice_menu.addAction(speculative_synthesis_action)
+
     def setup_chat_overlay_menu(self, menu_bar):
         chat_overlay_menu = menu_bar.addMenu(_(self.language, "Chat settings"))
 
@@ -594,11 +774,6 @@ class MainWindow(QMainWindow):
         self.msg_box = MessageWidget(font_size=self.font_size)
         self.root_layout.addWidget(self.msg_box)
 
-        # Timer to flush messages added from background threads
-        self._flush_timer = QTimer(self)
-        self._flush_timer.timeout.connect(self._flush_pending_messages)
-        self._flush_timer.start(100)
-
     def setup_status_bar(self):
         self.statusBar().setStyleSheet("QStatusBar::item { border: none; }")
 
@@ -697,6 +872,8 @@ class MainWindow(QMainWindow):
 
     def on_pause_clicked(self):
         self.is_paused = not self.is_paused
+        self.audio_player.set_paused(self.is_paused)
+        self._notify_audio_ready()
         self.update_pause_button_text()
         self.setup_pause_button_color()
         if self.is_paused:
@@ -749,6 +926,7 @@ class MainWindow(QMainWindow):
             self.voice_language = lang
             with self.model_lock:
                 self.silero_model = None
+                self.silero_pool.set_model(None)
             threading.Thread(
                 target=lambda: self.init_silero(self.voice_language), daemon=True
             ).start()
@@ -947,35 +1125,7 @@ class MainWindow(QMainWindow):
 
                 self.save_settings()
 
-            def on_msg(
-                msg_id,
-                author,
-                msg,
-                msg_ex=None,
-                avatar_url=None,
-                is_sponsor=False,
-                is_staff=False,
-                is_owner=False,
-                is_donate=False,
-            ):
-                if not self._is_active_connection_token("twitch", connection_token):
-                    return
-
-                self.process_message_queue.put_nowait(
-                    PlatformMessage(
-                        msg_id=msg_id,
-                        platform="twitch",
-                        author=author,
-                        message=msg,
-                        message_ex=msg_ex,
-                        avatar_url=avatar_url,
-                        connection_token=connection_token,
-                        is_sponsor=is_sponsor,
-                        is_staff=is_staff,
-                        is_owner=is_owner,
-                        is_donate=is_donate,
-                    )
-                )
+            on_msg = self._chat_message_callback("twitch", connection_token)
 
             def on_error(err):
                 self.add_sys_message(author="Twitch", text=err, status="error")
@@ -992,6 +1142,7 @@ class MainWindow(QMainWindow):
                 on_disconnect=lambda: self._run_on_ui_thread(self.on_disconnect_twitch),
                 on_error=on_error,
                 on_message=on_msg,
+                on_purge=self._chat_purge_callback("twitch", connection_token),
                 on_reconnect=lambda: self._run_on_ui_thread(self.on_reconnect_twitch),
                 on_expiries_access=lambda access, refresh: self._run_on_ui_thread(
                     on_expiries_access, access, refresh
@@ -1000,6 +1151,8 @@ class MainWindow(QMainWindow):
                     self._start_twitch_device_auth
                 ),
                 lang=self.language,
+                avatar_cache_path=get_twitch_avatar_cache_path(),
+                on_record=self._record_chat_event,
             )
             self.twitch.run()
 
@@ -1105,35 +1258,7 @@ class MainWindow(QMainWindow):
 
             connection_token = self._open_connection_token("youtube")
 
-            def on_msg(
-                msg_id,
-                author,
-                msg,
-                msg_ex=None,
-                avatar_url=None,
-                is_sponsor=False,
-                is_staff=False,
-                is_owner=False,
-                is_donate=False,
-            ):
-                if not self._is_active_connection_token("youtube", connection_token):
-                    return
-
-                self.process_message_queue.put_nowait(
-                    PlatformMessage(
-                        msg_id=msg_id,
-                        platform="youtube",
-                        author=author,
-                        message=msg,
-                        message_ex=msg_ex,
-                        avatar_url=avatar_url,
-                        connection_token=connection_token,
-                        is_sponsor=is_sponsor,
-                        is_staff=is_staff,
-                        is_owner=is_owner,
-                        is_donate=is_donate,
-                    )
-                )
+            on_msg = self._chat_message_callback("youtube", connection_token)
 
             def on_error(err):
                 self.add_sys_message(author="YouTube", text=err, status="error")
@@ -1148,6 +1273,7 @@ class MainWindow(QMainWindow):
                 on_error=on_error,
                 on_reconnect=lambda: self._run_on_ui_thread(self.on_reconnect_yt),
                 lang=self.language,
+                on_record=self._record_chat_event,
             )
             self.youtube.run()
 
@@ -1223,8 +1349,10 @@ class MainWindow(QMainWindow):
 
     def on_save_stop_words(self):
         content = self.stop_words_text.toPlainText().strip()
-        self.stop_words = sorted(
-            tuple(set([w.lower().strip() for w in content.splitlines() if w.strip()]))
+        self.stop_words = StopWordMatcher(
+            sorted(
+                set([w.lower().strip() for w in content.splitlines() if w.strip()])
+            )
         )
 
         save_stop_words(self.voice_language, self.stop_words)
@@ -1256,6 +1384,18 @@ class MainWindow(QMainWindow):
         self.toxic_sense = value / 100.0
         self.toxic_sense_label_value.setText(f"{self.toxic_sense:.2f}")
 
+    def on_change_toxic_batch_size(self, value):
+        self.toxic_batch_size = value
+        self.toxic_batch_size_label_value.setText(str(self.toxic_batch_size))
+        if self.toxicity_batcher is not None:
+            self.toxicity_batcher.max_batch_size = self.toxic_batch_size
+
+    def on_change_toxic_batch_wait(self, value):
+        self.toxic_batch_wait_ms = value
+        self.toxic_batch_wait_label_value.setText(str(self.toxic_batch_wait_ms))
+        if self.toxicity_batcher is not None:
+            self.toxicity_batcher.max_wait_ms = self.toxic_batch_wait_ms
+
     def on_change_ban_limit(self, value):
         self.ban_limit = value
         self.ban_limit_label_value.setText(str(self.ban_limit))
@@ -1291,6 +1431,54 @@ class MainWindow(QMainWindow):
         self.toxic_sense_label_value = QLabel(str(self.toxic_sense))
         toxic_sense_layout.addWidget(self.toxic_sense_label_value)
 
+        # Toxicity batch size
+
+        toxic_batch_size_v_layout = QVBoxLayout()
+        toxic_batch_size_v_layout.setContentsMargins(0, 0, 0, PADDING)
+        root_layout.addLayout(toxic_batch_size_v_layout)
+
+        self.toxic_batch_size_label_desc = QLabel(
+            _(self.language, "Toxicity batch size")
+        )
+        toxic_batch_size_v_layout.addWidget(self.toxic_batch_size_label_desc)
+
+        toxic_batch_size_layout = QHBoxLayout()
+        toxic_batch_size_v_layout.addLayout(toxic_batch_size_layout)
+
+        toxic_batch_size_slider = QSlider(Qt.Orientation.Horizontal)
+        toxic_batch_size_layout.addWidget(toxic_batch_size_slider)
+        toxic_batch_size_slider.setMinimum(1)
+        toxic_batch_size_slider.setMaximum(32)
+        toxic_batch_size_slider.setValue(self.toxic_batch_size)
+        toxic_batch_size_slider.valueChanged.connect(self.on_change_toxic_batch_size)
+
+        self.toxic_batch_size_label_value = QLabel(str(self.toxic_batch_size))
+        toxic_batch_size_layout.addWidget(self.toxic_batch_size_label_value)
+
+        # Toxicity batch wait
+
+        toxic_batch_wait_v_layout = QVBoxLayout()
+        toxic_batch_wait_v_layout.setContentsMargins(0, 0, 0, PADDING)
+        root_layout.addLayout(toxic_batch_wait_v_layout)
+
+        self.toxic_batch_wait_label_desc = QLabel(
+            _(self.language, "Toxicity batch wait (ms)")
+        )
+        toxic_batch_wait_v_layout.addWidget(self.toxic_batch_wait_label_desc)
+
+        toxic_batch_wait_layout = QHBoxLayout()
+        toxic_batch_wait_v_layout.addLayout(toxic_batch_wait_layout)
+
+        toxic_batch_wait_slider = QSlider(Qt.Orientation.Horizontal)
+        toxic_batch_wait_layout.addWidget(toxic_batch_wait_slider)
+        toxic_batch_wait_slider.setMinimum(0)
+        toxic_batch_wait_slider.setMaximum(200)
+        toxic_batch_wait_slider.setValue(self.toxic_batch_wait_ms)
+        toxic_batch_wait_slider.valueChanged.connect(self.on_change_toxic_batch_wait)
+
+        self.toxic_batch_wait_label_value = QLabel(str(self.toxic_batch_wait_ms))
+        toxic_batch_wait_layout.addWidget(self.toxic_batch_wait_label_value)
+
         # Toxicity level for user ban
 
         ban_limit_v_layout = QVBoxLayout()
@@ -1405,15 +1593,142 @@ class MainWindow(QMainWindow):
         self.speech_delay_label_value = QLabel(str(self.speech_delay))
         speech_delay_layout.addWidget(self.speech_delay_label_value)
 
+        # Max wait in queue
+
+        speech_max_wait_v_layout = QVBoxLayout()
+        speech_max_wait_v_layout.setContentsMargins(0, PADDING, 0, 0)
+        root_layout.addLayout(speech_max_wait_v_layout)
+
+        self.speech_max_wait_label_desc = QLabel(
+            _(self.language, "Skip messages waiting longer than (s)")
+        )
+        speech_max_wait_v_layout.addWidget(self.speech_max_wait_label_desc)
+
+        speech_max_wait_layout = QHBoxLayout()
+        speech_max_wait_v_layout.addLayout(speech_max_wait_layout)
+
+        speech_max_wait_slider = QSlider(Qt.Orientation.Horizontal)
+        speech_max_wait_layout.addWidget(speech_max_wait_slider)
+        speech_max_wait_slider.setMinimum(0)
+        speech_max_wait_slider.setMaximum(600)
+        speech_max_wait_slider.setValue(int(self.speech_max_wait))
+        speech_max_wait_slider.valueChanged.connect(self.on_change_speech_max_wait)
+
+        self.speech_max_wait_label_value = QLabel(self.speech_max_wait_text())
+        speech_max_wait_layout.addWidget(self.speech_max_wait_label_value)
+
+        # Maximum backlog
+
+        max_backlog_v_layout = QVBoxLayout()
+        max_backlog_v_layout.setContentsMargins(0, PADDING, 0, 0)
+        root_layout.addLayout(max_backlog_v_layout)
+
+        self.max_backlog_label_desc = QLabel(
+            _(self.language, "Maximum backlog (s)")
+        )
+        max_backlog_v_layout.addWidget(self.max_backlog_label_desc)
+
+        max_backlog_layout = QHBoxLayout()
+        max_backlog_v_layout.addLayout(max_backlog_layout)
+
+        max_backlog_slider = QSlider(Qt.Orientation.Horizontal)
+        max_backlog_layout.addWidget(max_backlog_slider)
+        max_backlog_slider.setMinimum(0)
+        max_backlog_slider.setMaximum(600)
+        max_backlog_slider.setValue(int(self.max_backlog_seconds))
+        max_backlog_slider.valueChanged.connect(self.on_change_max_backlog)
+
+        self.max_backlog_label_value = QLabel(self.max_backlog_text())
+        max_backlog_layout.addWidget(self.max_backlog_label_value)
+
+        # Speech cache size
+
+        tts_cache_v_layout = QVBoxLayout()
+        tts_cache_v_layout.setContentsMargins(0, PADDING, 0, 0)
+        root_layout.addLayout(tts_cache_v_layout)
+
+        self.tts_cache_label_desc = QLabel(_(self.language, "Speech cache size (MB)"))
+        tts_cache_v_layout.addWidget(self.tts_cache_label_desc)
+
+        tts_cache_layout = QHBoxLayout()
+        tts_cache_v_layout.addLayout(tts_cache_layout)
+
+        tts_cache_slider = QSlider(Qt.Orientation.Horizontal)
+        tts_cache_layout.addWidget(tts_cache_slider)
+        tts_cache_slider.setMinimum(0)
+        tts_cache_slider.setMaximum(512)
+        tts_cache_slider.setValue(self.tts_cache_mb)
+        tts_cache_slider.valueChanged.connect(self.on_change_tts_cache_size)
+
+        self.tts_cache_label_value = QLabel(str(self.tts_cache_mb))
+        tts_cache_layout.addWidget(self.tts_cache_label_value)
+
+        # Speech synthesis replicas
+
+        tts_replicas_v_layout = QVBoxLayout()
+        tts_replicas_v_layout.setContentsMargins(0, PADDING, 0, 0)
+        root_layout.addLayout(tts_replicas_v_layout)
+
+        self.tts_replicas_label_desc = QLabel(
+            _(self.language, "Speech synthesis replicas")
+        )
+        tts_replicas_v_layout.addWidget(self.tts_replicas_label_desc)
+
+        tts_replicas_layout = QHBoxLayout()
+        tts_replicas_v_layout.addLayout(tts_replicas_layout)
+
+        tts_replicas_slider = QSlider(Qt.Orientation.Horizontal)
+        tts_replicas_layout.addWidget(tts_replicas_slider)
+        tts_replicas_slider.setMinimum(1)
+        tts_replicas_slider.setMaximum(max(1, os.cpu_count() or 1))
+        tts_replicas_slider.setValue(self.tts_replicas)
+        tts_replicas_slider.valueChanged.connect(self.on_change_tts_replicas)
+
+        self.tts_replicas_label_value = QLabel(str(self.tts_replicas))
+        tts_replicas_layout.addWidget(self.tts_replicas_label_value)
+
         dlg.adjustSize()
         dlg.setFixedSize(dlg.sizeHint())
         dlg.finished.connect(self.save_settings)
         dlg.exec()
 
+    def speech_max_wait_text(self):
+        if not self.speech_max_wait:
+            return "∞"
+        return str(self.speech_max_wait)
+
+    def on_change_speech_max_wait(self, value):
+        self.speech_max_wait = value
+        self.speech_max_wait_label_value.setText(self.speech_max_wait_text())
+
+    def max_backlog_text(self):
+        if not self.max_backlog_seconds:
+            return "∞"
+        return str(self.max_backlog_seconds)
+
+    def on_change_max_backlog(self, value):
+        self.max_backlog_seconds = value
+        self.max_backlog_label_value.setText(self.max_backlog_text())
+
     def on_change_queue_speech_delay(self, value):
         self.speech_delay = value / 10
         self.speech_delay_label_value.setText(f"{float(self.speech_delay):.2f}")
 
+    def on_change_tts_cache_size(self, value):
+        self.tts_cache_mb = value
+        self.tts_cache_label_value.setText(str(self.tts_cache_mb))
+        self.tts_cache.resize(self.tts_cache_mb * 1024 * 1024)
+
+    def on_change_tts_replicas(self, value):
+        self.tts_replicas = value
+        self.tts_replicas_label_value.setText(str(self.tts_replicas))
+        self.silero_pool.resize(self.tts_replicas)
+        while self.message_workers < self.tts_replicas:
+            self.start_message_worker(self.message_workers)
+            self.message_workers += 1
+        self.start_render_workers()
+        self._notify_audio_ready()
+
     def on_change_min_msg_len(self, value):
         self.min_text_length = value
         self.min_msg_len_label_value.setText(str(self.min_text_length))
@@ -1425,29 +1740,38 @@ class MainWindow(QMainWindow):
     def on_change_queue_depth(self, value):
         self.buffer_maxsize = value
         self.queue_depth_label_value.setText(str(self.buffer_maxsize))
-        old_queue = self.audio_queue
-        self.audio_queue = Queue(maxsize=self.buffer_maxsize)
-        old_items = []
-        while True:
-            try:
-                old_items.append(old_queue.get_nowait())
-            except Empty:
-                break
-        for item in old_items[-self.buffer_maxsize :]:
-            self.audio_queue.put_nowait(item)
+        for item in self.speech_scheduler.set_cap("regular", self.buffer_maxsize):
+            item.cancel()
+        self._notify_audio_ready()
 
     def on_change_stats(self):
         if threading.current_thread() is threading.main_thread():
             self.stats_label.setText(self.stats_text())
+            self.stats_label.setToolTip(self.stats_tooltip_text())
             return
         self._pending_stats_update = True
+        self._schedule_ui_flush()
+
+    def _cancel_playback_queue(self):
+        with self.audio_ready:
+            while self.playback_queue:
+                self.playback_queue.popleft().cancel()
+            self.audio_ready.notify_all()
+
+    def _clear_speech_queue(self):
+        """Drop queued speech except donations"""
+        for item in self.speech_scheduler.clear(
+            [tier for tier in SPEECH_TIERS if tier != "donation"]
+        ):
+            item.cancel()
 
     def on_clear_queue(self):
-        while True:
-            try:
-                self.audio_queue.get_nowait()
-            except Empty:
-                break
+        self._clear_speech_queue()
+        self._cancel_playback_queue()
+        current_item = self._current_speech_item
+        if current_item is not None:
+            current_item.cancel()
+        self.audio_player.clear()
         self.on_change_stats()
         self.statusBar().showMessage(_(self.language, "Queue cleared"), 3000)
 
@@ -1463,6 +1787,27 @@ class MainWindow(QMainWindow):
     def toggle_auto_translate(self, checked):
         self.auto_translate = checked
 
+    def toggle_tts_disk_cache(self, checked):
+        self.tts_disk_cache = checked
+        self.tts_cache.set_cache_dir(get_tts_cache_path() if checked else None)
+
+    def toggle_record_chat(self, checked):
+        self.record_chat = checked
+        if not checked:
+            self._close_chat_recorder()
+
+    def toggle_latency_tracing(self, checked):
+        self.latency_tracing = checked
+        self.latency_tracer.enabled = checked
+        if not checked:
+            self.latency_tracer.clear()
+
+    def toggle_stream_synthesis(self, checked):
+        self.stream_synthesis = checked
+
+    def toggle_speculative_synthesis(self, checked):
+        self.speculative_synthesis = checked
+
     def update_pause_button_text(self):
         self.pause_button.setText(
             _(self.language, "Stopped")
@@ -1493,6 +1838,7 @@ class MainWindow(QMainWindow):
                 show_sys_msg=self.chat_overlay_show_sys_msg,
                 is_transparent=self.chat_overlay_is_transparent,
             )
+            self.chat_overlay.set_follow_bottom(self.chat_overlay_autoscroll)
 
             self.chat_overlay.show()
 
@@ -1511,6 +1857,8 @@ class MainWindow(QMainWindow):
 
     def on_chat_overlay_autoscroll(self, checked):
         self.chat_overlay_autoscroll = checked
+        if hasattr(self, "chat_overlay") and self.chat_overlay:
+            self.chat_overlay.set_follow_bottom(checked)
 
     def on_chat_overlay_is_transparent(self, checked):
         self.chat_overlay_is_transparent = checked
@@ -1586,9 +1934,22 @@ class MainWindow(QMainWindow):
         self.volume = DEFAULTS["volume"]
         self.speech_rate = DEFAULTS["speech_rate"]
         self.speech_delay = DEFAULTS["speech_delay"]
+        self.tts_cache_mb = DEFAULTS["tts_cache_mb"]
+        self.tts_disk_cache = DEFAULTS["tts_disk_cache"]
+        self.record_chat = DEFAULTS["record_chat"]
+        self.latency_tracing = DEFAULTS["latency_tracing"]
+        self.tts_replicas = DEFAULTS["tts_replicas"]
+        self.speech_max_wait = DEFAULTS["speech_max_wait"]
+        self.max_backlog_seconds = DEFAULTS["max_backlog_seconds"]
+        self.speech_tier_weights = dict(DEFAULTS["speech_tier_weights"])
+        self.speech_tier_caps = dict(DEFAULTS["speech_tier_caps"])
+        self.stream_synthesis = DEFAULTS["stream_synthesis"]
+        self.speculative_synthesis = DEFAULTS["speculative_synthesis"]
         self.min_text_length = DEFAULTS["min_text_length"]
         self.max_text_length = DEFAULTS["max_text_length"]
         self.toxic_sense = DEFAULTS["toxic_sense"]
+        self.toxic_batch_size = DEFAULTS["toxic_batch_size"]
+        self.toxic_batch_wait_ms = DEFAULTS["toxic_batch_wait_ms"]
         self.ban_limit = DEFAULTS["ban_limit"]
         self.buffer_maxsize = DEFAULTS["buffer_maxsize"]
         self.chat_overlay_autoscroll = DEFAULTS["chat_overlay_autoscroll"]
@@ -1600,14 +1961,19 @@ class MainWindow(QMainWindow):
         self.yt_credentials = None
         self.twitch_credentials = twitch_default_credentials
         self.stop_words = load_stop_words(self.voice_language)
-
-        old_queue = self.audio_queue
-        self.audio_queue = Queue(maxsize=self.buffer_maxsize)
-        while True:
-            try:
-                old_queue.get_nowait()
-            except Empty:
-                break
+        self.tts_cache.resize(self.tts_cache_mb * 1024 * 1024)
+        self.tts_cache.set_cache_dir(None)
+        self.silero_pool.resize(self.tts_replicas)
+        self.latency_tracer.enabled = self.latency_tracing
+
+        self._clear_speech_queue()
+        for tier, weight in self.speech_tier_weights.items():
+            self.speech_scheduler.set_weight(tier, weight)
+        for tier, cap in self.speech_tier_caps.items():
+            for item in self.speech_scheduler.set_cap(tier, cap):
+                item.cancel()
+        self.on_change_queue_depth(self.buffer_maxsize)
+        self._cancel_playback_queue()
 
         self.setup_menu_bar()
         self.read_filter_combo.setItems(
@@ -1644,13 +2010,13 @@ class MainWindow(QMainWindow):
 
     def export_log(self, choice):
         if choice == "html":
-            log = self.chat_model_to_html()
+            log = self.chat_model_to_html
             res = "Html Files (*.html);;All Files (*)"
         elif choice == "md":
-            log = self.chat_model_to_markdown()
+            log = self.chat_model_to_markdown
             res = "Markdown Files (*.md);;All Files (*)"
         else:
-            log = self.chat_model_to_text()
+            log = self.chat_model_to_text
             res = "Text Files (*.txt);;All Files (*)"
 
         file_path, _ = QFileDialog.getSaveFileName(self, "Save File", "", res)
@@ -1660,36 +2026,36 @@ class MainWindow(QMainWindow):
             if file.open(
                 QIODevice.OpenModeFlag.WriteOnly | QIODevice.OpenModeFlag.Text
             ):
-                file.write(log.encode("utf-8"))
+                # Streamed, the archived history may not fit in memory as one string
+                for part in log():
+                    file.write(part.encode("utf-8"))
                 file.close()
                 self.statusBar().showMessage(
                     f"{_(self.language, 'File saved')}: {file_path}", 3000
                 )
 
     def chat_model_to_text(self):
-        lines = []
+        separator = ""
         for message in self.chat_model.messages():
             text = str(message.get("text", "")).replace("\r\n", "\n")
-            lines.append(
-                f"[{message.get('time', '')}] [{message.get('platform', '')}] "
+            yield (
+                f"{separator}[{message.get('time', '')}] [{message.get('platform', '')}] "
                 f"{message.get('author', '')}: {text}"
             )
-        return "\n".join(lines)
+            separator = "\n"
 
     def chat_model_to_markdown(self):
-        lines = []
+        separator = ""
         for message in self.chat_model.messages():
             time_str = message.get("time", "")
             platform = message.get("platform", "")
             author = message.get("author", "")
             text = str(message.get("text", "")).replace("\r\n", "\n")
-            lines.append(f"- **{author}** [{time_str}] [{platform}]: {text}")
-        return "\n".join(lines)
+            yield f"{separator}- **{author}** [{time_str}] [{platform}]: {text}"
+            separator = "\n"
 
     def chat_model_to_html(self):
-        rows = [
-            "<html><body style='background:#222;color:#fff;font-family:Arial,sans-serif;'>"
-        ]
+        yield "<html><body style='background:#222;color:#fff;font-family:Arial,sans-serif;'>"
         for message in self.chat_model.messages():
             author = html.escape(str(message.get("author", "")))
             platform = html.escape(str(message.get("platform", "")))
@@ -1697,14 +2063,13 @@ class MainWindow(QMainWindow):
             text = html.escape(str(message.get("text", ""))).replace("\n", "<br>")
             color = html.escape(str(message.get("color", "#fff")))
             background = html.escape(str(message.get("background", "#444")))
-            rows.append(
+            yield (
                 "<div style='margin:8px 0;padding:10px;border-radius:8px;"
                 f"background:{background};color:{color};'>"
                 f"<b>{author}</b> <span style='font-size:12px;'>[{time_str}] [{platform}]</span><br>"
                 f"{text}</div>"
             )
-        rows.append("</body></html>")
-        return "".join(rows)
+        yield "</body></html>"
 
     def export_chat_csv(self):
         path, __ = QFileDialog.getSaveFileName(
@@ -1716,16 +2081,7 @@ class MainWindow(QMainWindow):
         if not path:
             return
 
-        messages = self.chat_model.messages()
         seen = set()
-        rows = []
-        for msg in messages:
-            text = str(msg.get("text", "")).strip()
-            if not text or text in seen:
-                continue
-            seen.add(text)
-            rows.append(text)
-
         try:
             with open(path, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
@@ -1741,8 +2097,14 @@ class MainWindow(QMainWindow):
                         "identity_hate",
                     ]
                 )
-                for i, text in enumerate(rows, start=1):
-                    writer.writerow([i, text, 0, 0, 0, 0, 0, 0])
+                row_id = 0
+                for msg in self.chat_model.messages():
+                    text = str(msg.get("text", "")).strip()
+                    if not text or text in seen:
+                        continue
+                    seen.add(text)
+                    row_id += 1
+                    writer.writerow([row_id, text, 0, 0, 0, 0, 0, 0])
             self.statusBar().showMessage(
                 f"{_(self.language, 'File saved')}: {path}", 3000
             )
@@ -1751,6 +2113,30 @@ class MainWindow(QMainWindow):
                 f"{_(self.language, 'Failed to save file')}: {e}", 3000
             )
 
+    def export_latency_trace(self, seconds: float):
+        path, __ = QFileDialog.getSaveFileName(
+            self,
+            _(self.language, "Export trace"),
+            f"latency_trace_{datetime.now():%Y%m%d_%H%M%S}.json",
+            "Chrome trace (*.json)",
+        )
+        if not path:
+            return
+        try:
+            count = self.latency_tracer.export_chrome_trace(path, seconds)
+        except Exception as e:
+            self.add_sys_message(
+                author="LatencyTracer",
+                text=f"{_(self.language, 'Trace export error')}. {translate_text(str(e), self.language)}",
+                status="error",
+            )
+            return
+        self.add_sys_message(
+            author="LatencyTracer",
+            text=f"{_(self.language, 'Trace exported')}: {path} ({count})",
+            status="success",
+        )
+
     def merge_chat_csv(self, with_recalculate_toxicity=False):
 
         paths, __ = QFileDialog.getOpenFileNames(
@@ -1832,6 +2218,20 @@ class MainWindow(QMainWindow):
         if not save_path:
             return
 
+        texts = []
+        for r in rows:
+            cleaned_text = clean_links(
+                r.get("comment_text", ""), lang=self.voice_language
+            )
+            cleaned_text = clean_emoji(cleaned_text)
+            texts.append(clean_message(cleaned_text))
+
+        toxic_values = [None] * len(texts)
+        if with_recalculate_toxicity:
+            toxic_values = self.calc_toxicity_many([t for t in texts if t])
+            toxic_values_iter = iter(toxic_values)
+            toxic_values = [next(toxic_values_iter) if t else None for t in texts]
+
         try:
 
             with open(save_path, "w", newline="", encoding="utf-8") as f:
@@ -1839,22 +2239,17 @@ class MainWindow(QMainWindow):
                 writer = csv.DictWriter(f, fieldnames=header)
                 writer.writeheader()
 
-                for i, r in enumerate(rows, start=1):
+                for i, (r, text, toxic_val) in enumerate(
+                    zip(rows, texts, toxic_values), start=1
+                ):
 
-                    cleaned_text = clean_links(
-                        r.get("comment_text", ""), lang=self.voice_language
-                    )
-                    cleaned_text = clean_emoji(cleaned_text)
-                    text = clean_message(cleaned_text)
                     if not text:
                         continue
 
                     r["id"] = str(i)
 
                     if with_recalculate_toxicity:
-                        toxic_val = self.calc_toxicity(text)
-
-                        for t in toxic_val:
+                        for t in toxic_val or {}:
                             r[t] = f"{toxic_val[t]:.2f}"
 
                     else:
@@ -1887,13 +2282,97 @@ class MainWindow(QMainWindow):
     # === Helper methods ===
 
     def stats_text(self):
+        cache_stats = self.tts_cache.stats()
         return (
             f"{_(self.language, 'Messages')}: {self.messages_stats['messages_count']} | "
             f"{_(self.language, 'Spoken')}: {self.messages_stats['spoken_count']} | "
             f"{_(self.language, 'Filtered')}: {self.messages_stats['filtered_count']} | "
-            f"{_(self.language, 'In queue')}: {self.audio_queue.qsize()}"
+            f"{_(self.language, 'In queue')}: {self.speech_scheduler.depth() + len(self.playback_queue)} "
+            f"(~{self.projected_wait_seconds():.0f} {_(self.language, 'sec')}) | "
+            f"{_(self.language, 'Cache')}: {cache_stats['hits']} {_(self.language, 'hits')}, "
+            f"{cache_stats['misses']} {_(self.language, 'misses')}, "
+            f"{cache_stats['evictions']} {_(self.language, 'evicted')}"
         )
 
+    def stats_tooltip_text(self):
+        player_stats = self.audio_player.stats()
+        lines = [
+            f"{_(self.language, 'Playback')}: {_(self.language, 'start latency')} "
+            f"{player_stats['avg_start_latency_ms']:.0f} ms "
+            f"({_(self.language, 'last')} {player_stats['last_start_latency_ms']:.0f} ms, "
+            f"{_(self.language, 'max')} {player_stats['max_start_latency_ms']:.0f} ms, "
+            f"{_(self.language, 'buffer')} {player_stats['block_ms']:.0f} ms)"
+        ]
+        cache_stats = self.tts_cache.stats()
+        lines.append(
+            f"{_(self.language, 'Speech cache')}: {cache_stats['items']} "
+            f"({cache_stats['bytes'] / (1024 * 1024):.1f}/{self.tts_cache_mb} MB), "
+            f"{_(self.language, 'from disk')} {cache_stats['disk_hits']}, "
+            f"{_(self.language, 'on disk')} {cache_stats['disk_bytes'] / (1024 * 1024):.1f} MB"
+        )
+        for replica in self.silero_pool.stats():
+            lines.append(
+                f"{_(self.language, 'Synthesis')}: {_(self.language, 'replica')} "
+                f"{replica['index'] + 1} ({_(self.language, 'threads')} {replica['threads']}), "
+                f"RTF {replica['rtf']:.2f}, {_(self.language, 'clips')} {replica['clips']}"
+            )
+        for tier, tier_stats in self.speech_scheduler.stats().items():
+            if not tier_stats["served"] and not tier_stats["depth"]:
+                continue
+            lines.append(
+                f"{_(self.language, SPEECH_TIER_NAMES[tier])}: "
+                f"{_(self.language, 'in queue')} {tier_stats['depth']}, "
+                f"{_(self.language, 'wait')} p50 ≤ {tier_stats['wait_p50']:g} {_(self.language, 'sec')}, "
+                f"p95 ≤ {tier_stats['wait_p95']:g} {_(self.language, 'sec')} "
+                f"({_(self.language, 'played')} {tier_stats['served']})"
+            )
+        with self.stats_lock:
+            stale_count = self.messages_stats["stale_count"]
+            shed_count = self.messages_stats["shed_count"]
+            purged_count = self.messages_stats["purged_count"]
+        lines.append(
+            f"{_(self.language, 'Skipped as stale')}: {stale_count}, "
+            f"{_(self.language, 'over backlog')}: {shed_count}, "
+            f"{_(self.language, 'removed')}: {purged_count}"
+        )
+        with self.message_state_lock:
+            dedup_stats = self.processed_messages.stats()
+        lines.append(
+            f"{_(self.language, 'Duplicates')}: {dedup_stats['duplicates']}, "
+            f"{_(self.language, 'remembered IDs')} {dedup_stats['size']}/{dedup_stats['max_ids']} "
+            f"({dedup_stats['window_seconds'] / 60:g} {_(self.language, 'min')}), "
+            f"{_(self.language, 'false positives')} {dedup_stats['false_positive_rate']:.0%}"
+        )
+        if self.speculative_synthesis:
+            with self.stats_lock:
+                speculative_count = self.messages_stats["speculative_count"]
+                wasted_count = self.messages_stats["speculative_wasted_count"]
+                wasted_seconds = self.messages_stats["speculative_wasted_seconds"]
+                saved_count = self.messages_stats["speculative_saved_count"]
+            lines.append(
+                f"{_(self.language, 'Speculative synthesis')}: {speculative_count}, "
+                f"{_(self.language, 'wasted')} {wasted_count} ({wasted_seconds:.1f} s), "
+                f"{_(self.language, 'skipped')} {saved_count}"
+            )
+        if self.latency_tracing:
+            for span, span_stats in self.latency_tracer.stats().items():
+                lines.append(
+                    f"{_(self.language, 'Latency')} {_(self.language, span)}: "
+                    f"p50 ≤ {span_stats['p50'] * 1000:g} ms, "
+                    f"p95 ≤ {span_stats['p95'] * 1000:g} ms, "
+                    f"p99 ≤ {span_stats['p99'] * 1000:g} ms ({span_stats['count']})"
+                )
+        if self.toxicity_batcher is not None:
+            toxic_stats = self.toxicity_batcher.stats()
+            lines.append(
+                f"Detoxify: {_(self.language, 'batches')} {toxic_stats['batches']}, "
+                f"{_(self.language, 'avg batch')} {toxic_stats['avg_batch_size']:.1f} "
+                f"({_(self.language, 'max')} {toxic_stats['max_batch_size']}), "
+                f"{_(self.language, 'latency')} {toxic_stats['avg_latency_ms']:.0f} ms, "
+                f"{_(self.language, 'inference')} {toxic_stats['avg_inference_ms']:.0f} ms"
+            )
+        return "\n".join(lines)
+
     def status_voice_text(self):
         return f"{_(self.language, 'Voice')}: {_(self.language, self.voice_language)} - {self.voice}"
 
@@ -1922,29 +2401,41 @@ class MainWindow(QMainWindow):
             self.messages_stats["messages_count"] += 1
         self.on_change_stats()
 
-        # If called from a non-main thread, enqueue for the GUI flush timer
+        pending = (platform, author, text, color, background, segments, avatar_url)
+        # If called from a non-main thread, enqueue for the next UI flush
         if threading.current_thread() is not threading.main_thread():
-            self._pending_messages.append(
-                (platform, author, text, color, background, segments, avatar_url)
-            )
+            self._pending_messages.append(pending)
+            self._schedule_ui_flush()
             return
 
         # On main thread, insert immediately
-        self._insert_message(
-            platform, author, text, color, background, segments, avatar_url
-        )
+        self._insert_messages([pending])
+
+    def _schedule_ui_flush(self):
+        with self._ui_flush_lock:
+            if self._ui_flush_scheduled:
+                return
+            self._ui_flush_scheduled = True
+        self.ui_flush_requested.emit()
 
     def _flush_pending_messages(self):
+        # Anything queued from here on schedules the next flush
+        with self._ui_flush_lock:
+            self._ui_flush_scheduled = False
         while len(self._pending_ui_calls) > 0:
             callback, args, kwargs = self._pending_ui_calls.popleft()
             callback(*args, **kwargs)
-        while len(self._pending_messages) > 0:
-            platform, author, text, color, background, segments, avatar_url = (
-                self._pending_messages.popleft()
-            )
-            self._insert_message(
-                platform, author, text, color, background, segments, avatar_url
-            )
+        since_insert_ms = (monotonic() - self._last_chat_insert_at) * 1000
+        wait_ms = INSERT_INTERVAL_MS - since_insert_ms
+        if len(self._pending_messages) > 0 and wait_ms > 0:
+            if not self._chat_insert_timer.isActive():
+                self._chat_insert_timer.start(max(1, int(wait_ms)))
+        elif len(self._pending_messages) > 0:
+            pending_messages = []
+            while len(self._pending_messages) > 0:
+                pending_messages.append(self._pending_messages.popleft())
+            self._last_chat_insert_at = monotonic()
+            self._insert_messages(pending_messages)
         while len(self._pending_ui_updates) > 0:
             indicator_text = self._pending_ui_updates.popleft()
             self.audio_indicator.setText(indicator_text)
@@ -1956,52 +2447,60 @@ class MainWindow(QMainWindow):
             stats_label = getattr(self, "stats_label", None)
             if stats_label is not None:
                 stats_label.setText(self.stats_text())
+                stats_label.setToolTip(self.stats_tooltip_text())
 
     def _set_audio_indicator(self, indicator_text):
         if threading.current_thread() is threading.main_thread():
             self.audio_indicator.setText(indicator_text)
             return
         self._pending_ui_updates.append(indicator_text)
+        self._schedule_ui_flush()
 
     def _show_status_message(self, text, timeout_ms=3000):
         if threading.current_thread() is threading.main_thread():
             self.statusBar().showMessage(text, timeout_ms)
             return
         self._pending_status_messages.append((text, timeout_ms))
+        self._schedule_ui_flush()
 
-    def _insert_message(
-        self,
-        platform: str,
-        author: str,
-        text: str,
-        color: str | None = None,
-        background: str | None = None,
-        segments: list | None = None,
-        avatar_url: str | None = None,
-    ):
+    def _insert_messages(self, pending_messages: list[tuple]):
+        """A burst of add_message tuples as one model insert and one scroll"""
         if self.chat_overlay is not None:
             scrollbar = self.chat_overlay.chat_view.verticalScrollBar()
             prev_scroll_value = scrollbar.value()
 
-        msg = ChatMessage(
-            time=datetime.now().strftime("%H:%M:%S"),
-            platform=platform,
-            author=author,
-            text=text,
-            color=color,
-            background=background,
-            segments=segments,
-            avatar_url=avatar_url,
-        )
+        now = datetime.now().strftime("%H:%M:%S")
+        messages = [
+            ChatMessage(
+                time=now,
+                platform=platform,
+                author=author,
+                text=text,
+                color=color,
+                background=background,
+                segments=segments,
+                avatar_url=avatar_url,
+            )
+            for (
+                platform,
+                author,
+                text,
+                color,
+                background,
+                segments,
+                avatar_url,
+            ) in pending_messages
+        ]
 
         try:
-            self.chat_model.add_message(msg)
+            self.chat_model.add_messages(messages)
 
-            if self.chat_overlay_autoscroll:
-                if self.chat_overlay is not None:
-                    self.chat_overlay.chat_view.scrollToBottom()
-            else:
-                scrollbar.setValue(prev_scroll_value)
+            # The batched layout keeps growing after this returns, so the
+            # overlay follows the bottom as the scroll range changes
+            if self.chat_overlay is not None:
+                self.chat_overlay.set_follow_bottom(self.chat_overlay_autoscroll)
+                if not self.chat_overlay_autoscroll:
+                    scrollbar.setValue(prev_scroll_value)
 
         except Exception:
             logger.error("Failed insert message to self.chat_model")
@@ -2015,12 +2514,25 @@ class MainWindow(QMainWindow):
             "volume": self.volume,
             "speech_rate_ssml": self.speech_rate,
             "speech_delay": self.speech_delay,
+            "tts_cache_mb": self.tts_cache_mb,
+            "tts_disk_cache": self.tts_disk_cache,
+            "record_chat": self.record_chat,
+            "latency_tracing": self.latency_tracing,
+            "stream_synthesis": self.stream_synthesis,
+            "speculative_synthesis": self.speculative_synthesis,
+            "tts_replicas": self.tts_replicas,
+            "speech_max_wait": self.speech_max_wait,
+            "max_backlog_seconds": self.max_backlog_seconds,
+            "speech_tier_weights": self.speech_tier_weights,
+            "speech_tier_caps": self.speech_tier_caps,
             "add_accents": self.add_accents,
             "read_author_names": self.read_author_names,
             "read_platform_names": self.read_platform_names,
             "read_filter": self.read_filter,
             "font_size": self.font_size,
             "toxic_sense": self.toxic_sense,
+            "toxic_batch_size": self.toxic_batch_size,
+            "toxic_batch_wait_ms": self.toxic_batch_wait_ms,
             "ban_limit": self.ban_limit,
             "auto_translate": self.auto_translate,
             "min_text_length": self.min_text_length,
@@ -2066,6 +2578,30 @@ class MainWindow(QMainWindow):
             self.volume = settings.get("volume", self.volume)
             self.speech_rate = settings.get("speech_rate_ssml", self.speech_rate)
             self.speech_delay = settings.get("speech_delay", self.speech_delay)
+            self.tts_cache_mb = settings.get("tts_cache_mb", self.tts_cache_mb)
+            self.tts_disk_cache = settings.get("tts_disk_cache", self.tts_disk_cache)
+            self.record_chat = settings.get("record_chat", self.record_chat)
+            self.latency_tracing = settings.get("latency_tracing", self.latency_tracing)
+            self.stream_synthesis = settings.get(
+                "stream_synthesis", self.stream_synthesis
+            )
+            self.tts_replicas = settings.get("tts_replicas", self.tts_replicas)
+            self.speech_max_wait = settings.get("speech_max_wait", self.speech_max_wait)
+            self.max_backlog_seconds = settings.get(
+                "max_backlog_seconds", self.max_backlog_seconds
+            )
+            self.speech_tier_weights = tier_settings(
+                settings.get("speech_tier_weights"),
+                DEFAULTS["speech_tier_weights"],
+                minimum=1,
+            )
+            # The regular tier is capped by buffer_maxsize, so it has no entry here
+            self.speech_tier_caps = tier_settings(
+                settings.get("speech_tier_caps"), DEFAULTS["speech_tier_caps"]
+            )
+            self.speculative_synthesis = settings.get(
+                "speculative_synthesis", self.speculative_synthesis
+            )
             self.add_accents = settings.get("add_accents", self.add_accents)
             self.read_author_names = settings.get(
                 "read_author_names", self.read_author_names
@@ -2075,6 +2611,12 @@ class MainWindow(QMainWindow):
             )
             self.read_filter = settings.get("read_filter", self.read_filter)
             self.toxic_sense = settings.get("toxic_sense", self.toxic_sense)
+            self.toxic_batch_size = settings.get(
+                "toxic_batch_size", self.toxic_batch_size
+            )
+            self.toxic_batch_wait_ms = settings.get(
+                "toxic_batch_wait_ms", self.toxic_batch_wait_ms
+            )
             self.ban_limit = settings.get("ban_limit", self.ban_limit)
             self.auto_translate = settings.get("auto_translate", self.auto_translate)
             self.buffer_maxsize = settings.get("buffer_maxsize", self.buffer_maxsize)
@@ -2201,6 +2743,12 @@ class MainWindow(QMainWindow):
                 )
 
         if self.detox_model and getattr(self.detox_model, "predict"):
+            if self.toxicity_batcher is None:
+                self.toxicity_batcher = ToxicityBatcher(
+                    self.detox_model,
+                    max_batch_size=self.toxic_batch_size,
+                    max_wait_ms=self.toxic_batch_wait_ms,
+                )
             self.add_sys_message(
                 author="Detoxify",
                 text=_(self.language, "detoxify_loaded"),
@@ -2222,6 +2770,7 @@ class MainWindow(QMainWindow):
 
         with self.model_lock:
             self.silero_model = None
+            self.silero_pool.set_model(None)
 
             self.add_sys_message(
                 author="Silero", text=_(self.language, "silero_loading")
@@ -2275,6 +2824,8 @@ class MainWindow(QMainWindow):
                     except Exception:
                         pass
 
+            self.silero_pool.set_model(self.silero_model)
+
         if self.silero_model and getattr(self.silero_model, "apply_tts"):
             self.add_sys_message(
                 author="Silero",
@@ -2337,12 +2888,18 @@ class MainWindow(QMainWindow):
                     color=MSG_STATUS_COLOR["error"],
                 )
                 self.save_banned_list()
+                self.purge_messages(platform, author=author)
 
         self.on_change_stats()
 
     def calc_toxicity(self, text):
-        if self.detox_model and getattr(self.detox_model, "predict"):
-            return self.detox_model.predict(text.lower())
+        if self.toxicity_batcher is not None:
+            return self.toxicity_batcher.predict(text.lower())
+
+    def calc_toxicity_many(self, texts):
+        if self.toxicity_batcher is not None:
+            return self.toxicity_batcher.predict_many([t.lower() for t in texts])
+        return [None] * len(texts)
 
     def process_chat_message(
         self,
@@ -2356,6 +2913,9 @@ class MainWindow(QMainWindow):
         is_staff=False,
         is_owner=False,
         is_donate=False,
+        received_at=None,
+        connection_token=None,
+        trace: MessageTrace | None = None,
     ):
         logger.debug(
             "process_chat_message(): msg_id=%s platform=%s author=%s is_sponsor=%s is_staff=%s is_owner=%s is_donate=%s",
@@ -2372,11 +2932,13 @@ class MainWindow(QMainWindow):
 
         platform_author = f"{platform}:{cleaned_author}"
         msg_id = str(msg_id)
+        if received_at is None:
+            received_at = monotonic()
         with self.message_state_lock:
-            is_banned = platform_author in self.banned_set
-            is_processed = msg_id in self.processed_messages
-            if not is_processed:
-                self.processed_messages.add(msg_id)
+            is_banned = self._is_purged(
+                platform, platform_author, msg_id, received_at, connection_token
+            )
+            is_processed = self.processed_messages.add(msg_id)
 
         if is_processed:
             return
@@ -2417,11 +2979,9 @@ class MainWindow(QMainWindow):
             ),
         )
 
-        cleaned_text = clean_links(cleaned_text, lang=self.voice_language)
-        cleaned_text = clean_emoji(cleaned_text)
-        cleaned_text = convert_numbers_to_words(cleaned_text, self.voice_language)
-        cleaned_text = clean_symbol_spam(cleaned_text)
-        cleaned_text = map_symbols(cleaned_text, lang=self.voice_language)
+        cleaned_text = normalize_speech_text(cleaned_text, self.voice_language)
+        if trace is not None:
+            trace.mark("normalized")
 
         if not contain_words_or_nums(cleaned_text, lang=self.voice_language):
             cleaned_text = transliteration(cleaned_text, self.voice_language)
@@ -2442,21 +3002,114 @@ class MainWindow(QMainWindow):
         elif _(self.language, "Regular") not in read_filter:
             return
 
-        if not is_staff and not is_owner:
-            toxic_val = self.calc_toxicity(cleaned_text)
-            if toxic_val:
-                detox_key = max(toxic_val, key=toxic_val.get)
-                detox_value = toxic_val[detox_key]
-                if detox_value >= self.toxic_sense:
-                    self.process_toxic_message(
-                        platform=platform,
-                        author=cleaned_author,
-                        reason=str(detox_key).replace("_", " ").capitalize(),
-                        is_staff=is_staff,
-                        is_owner=is_owner,
-                        severity=detox_value,
-                    )
+        toxic_request = None
+        if not is_staff and not is_owner and self.toxicity_batcher is not None:
+            toxic_request = self.toxicity_batcher.submit(cleaned_text.lower())
+            if not self.speculative_synthesis:
+                toxic_val = toxic_request.wait()
+                if trace is not None:
+                    trace.mark("classified")
+                if self.reject_toxic_message(
+                    toxic_val, platform, cleaned_author, is_staff, is_owner
+                ):
                     return
+                toxic_request = None
+
+        speech_item = self.build_speech_item(
+            platform,
+            cleaned_author,
+            cleaned_text,
+            is_donate=is_donate,
+            is_transliterated=is_transliterated,
+            is_stop_words_cleaned=is_stop_words_cleaned,
+            received_at=received_at,
+            tier=speech_tier(
+                is_donate=is_donate,
+                is_owner=is_owner,
+                is_staff=is_staff,
+                is_sponsor=is_sponsor,
+            ),
+            msg_id=msg_id,
+            author_key=platform_author,
+            connection_token=connection_token,
+            trace=trace,
+        )
+        if speech_item is not None and not self._track_speech_item(speech_item):
+            return
+
+        if toxic_request is None:
+            if speech_item is not None:
+                self.speak(speech_item)
+            return
+
+        if speech_item is None:
+            self.reject_toxic_message(
+                toxic_request.wait(), platform, cleaned_author, is_staff, is_owner
+            )
+            return
+
+        verdict = []
+
+        def admit(block):
+            if not verdict:
+                if not block and not toxic_request.done.is_set():
+                    return None
+                try:
+                    toxic_val = toxic_request.wait()
+                except Exception as e:
+                    # Unchecked speech is never played
+                    logger.error("Toxicity check failed. %s", str(e))
+                    verdict.append(False)
+                    return False
+                if trace is not None:
+                    trace.mark("classified")
+                verdict.append(
+                    not self.reject_toxic_message(
+                        toxic_val, platform, cleaned_author, is_staff, is_owner
+                    )
+                )
+            return verdict[0]
+
+        with self.stats_lock:
+            self.messages_stats["speculative_count"] += 1
+        self.speak(speech_item, admit=admit)
+
+    def reject_toxic_message(self, toxic_val, platform, author, is_staff, is_owner):
+        """Count a toxic message against its author; returns True if it must not be spoken"""
+        if not toxic_val:
+            return False
+        detox_key = max(toxic_val, key=toxic_val.get)
+        detox_value = toxic_val[detox_key]
+        if detox_value < self.toxic_sense:
+            return False
+        self.process_toxic_message(
+            platform=platform,
+            author=author,
+            reason=str(detox_key).replace("_", " ").capitalize(),
+            is_staff=is_staff,
+            is_owner=is_owner,
+            severity=detox_value,
+        )
+        return True
+
+    def build_speech_item(
+        self,
+        platform,
+        author,
+        text,
+        is_donate=False,
+        is_transliterated=False,
+        is_stop_words_cleaned=False,
+        received_at=None,
+        tier="regular",
+        msg_id="",
+        author_key="",
+        connection_token=None,
+        trace: MessageTrace | None = None,
+    ):
+        """Finish normalization of an accepted message, SSML is built at render time"""
+        cleaned_text = text
+        cleaned_author = author
 
         if not is_transliterated:
             cleaned_text = transliteration(cleaned_text, self.voice_language)
@@ -2465,15 +3118,15 @@ class MainWindow(QMainWindow):
             cleaned_text = clean_stop_words(cleaned_text, stop_words=self.stop_words)
 
         if not contain_words_or_nums(cleaned_text, lang=self.voice_language):
-            return
+            return None
 
         cleaned_text = clean_message(cleaned_text)
 
         if not cleaned_text:
-            return
+            return None
 
         if len(cleaned_text) < self.min_text_length:
-            return
+            return None
 
         if len(cleaned_text) > self.max_text_length:
             cleaned_text = cleaned_text[: self.max_text_length] + "..."
@@ -2488,12 +3141,20 @@ class MainWindow(QMainWindow):
             cleaned_author = transliteration(cleaned_author, self.voice_language)
         cleaned_author = clean_stop_words(cleaned_author, stop_words=self.stop_words)
 
-        cleaned_text = self.cleaned_text_to_ssml(
-            platform, cleaned_author, cleaned_text, is_donate=is_donate
+        return SpeechItem(
+            platform=platform,
+            author=cleaned_author,
+            text=cleaned_text,
+            is_donate=is_donate,
+            received_at=received_at,
+            max_wait=0 if is_donate else self.speech_max_wait,
+            tier=tier,
+            msg_id=msg_id,
+            author_key=author_key,
+            connection_token=connection_token,
+            trace=trace,
         )
 
-        self.speak(cleaned_text, is_donate=is_donate)
-
     def cleaned_text_to_text(self, platform, author, text, is_donate=False):
         if (self.read_author_names and self.read_platform_names) or is_donate:
             cleaned_text = f"{_(self.voice_language, 'Message on')} {_(self.voice_language, str(platform).lower())} {_(self.voice_language, 'from')} {author}: {text}"
@@ -2530,10 +3191,30 @@ class MainWindow(QMainWindow):
         elif self.read_platform_names:
             cleaned_text = self.text_read_platform_names(platform, text)
         else:
-            cleaned_text = f'<speak><prosody rate="{self.speech_rate}" pitch="medium">{text}</prosody></speak>'
+            cleaned_text = self.text_to_ssml(text)
 
         return cleaned_text
 
+    def cleaned_text_to_ssml_chunks(self, platform, author, text, is_donate=False):
+        """Split a message into SSML chunks that are synthesized one by one.
+
+        The author/platform header stays with the first chunk, every chunk
+        gets its own prosody so the rate survives the split.
+        """
+        if not self.stream_synthesis:
+            return [self.cleaned_text_to_ssml(platform, author, text, is_donate)]
+
+        chunks = split_speech_chunks(
+            text, max_length=DEFAULTS["speech_chunk_length"]
+        ) or [text]
+        return [
+            self.cleaned_text_to_ssml(platform, author, chunks[0], is_donate),
+            *(self.text_to_ssml(chunk) for chunk in chunks[1:]),
+        ]
+
+    def text_to_ssml(self, text):
+        return f'<speak><prosody rate="{self.speech_rate}" pitch="medium">{text}</prosody></speak>'
+
     def text_read_platform_names(self, platform, text):
         return f"""
 <speak>
@@ -2543,50 +3224,84 @@ class MainWindow(QMainWindow):
 
     # == Audio processing ==
 
-    def text_to_speech(self, text, is_ssml=True):
+    def _tts_cache_key(self, text, speaker, voice_language, add_accents):
+        return tts_cache_key(
+            ssml_text=text,
+            speaker=speaker,
+            language=voice_language,
+            add_accents=add_accents,
+            speech_rate=self.speech_rate,
+            sample_rate=SAMPLE_RATE,
+        )
+
+    def _select_voice(self, text, voice_language, add_accents):
+        """Pick a speaker, preferring an already cached clip in random mode"""
+        available_voices = VOICES.get(voice_language) or []
+        if not available_voices:
+            raise RuntimeError(f"No voices configured for language '{voice_language}'")
+
+        selected_voice = self.voice
+        if selected_voice != "random" and selected_voice not in available_voices:
+            selected_voice = "random"
+
+        if selected_voice != "random":
+            return selected_voice
+
+        cached_voices = [
+            voice
+            for voice in available_voices
+            if self.tts_cache.contains(
+                self._tts_cache_key(text, voice, voice_language, add_accents)
+            )
+        ]
+        return choice(cached_voices or available_voices)
+
+    def apply_tts(self, text, speaker, voice_language, add_accents):
+        if voice_language == "ru":
+            return self.silero_pool.apply_tts(
+                ssml_text=text,
+                speaker=speaker,
+                sample_rate=SAMPLE_RATE,
+                put_accent=add_accents,
+                put_yo=True,
+                put_stress_homo=True,
+                put_yo_homo=True,
+            )
+        else:
+            return self.silero_pool.apply_tts(
+                ssml_text=text,
+                speaker=speaker,
+                sample_rate=SAMPLE_RATE,
+                put_accent=add_accents,
+            )
+
+    def text_to_speech(
+        self, text, is_ssml=True, speaker=None, voice_language=None, add_accents=None
+    ):
         """Convert text to speech using Silero"""
         logger.debug("text_to_speech(): %s", text)
         try:
+            if voice_language is None:
+                voice_language = self.voice_language
+            if add_accents is None:
+                add_accents = self.add_accents
+            if speaker is None:
+                speaker = self._select_voice(text, voice_language, add_accents)
+            cache_key = self._tts_cache_key(text, speaker, voice_language, add_accents)
+
+            audio = self.tts_cache.get(cache_key)
+            if audio is not None:
+                return audio
+
             if self.silero_model is not None and getattr(
                 self.silero_model, "apply_tts"
             ):
-                with self.model_lock:
-                    no_grad = torch_no_grad()
-                    with no_grad():
-                        available_voices = VOICES.get(self.voice_language) or []
-                        if not available_voices:
-                            raise RuntimeError(
-                                f"No voices configured for language '{self.voice_language}'"
-                            )
-
-                        selected_voice = self.voice
-                        if (
-                            selected_voice != "random"
-                            and selected_voice not in available_voices
-                        ):
-                            selected_voice = "random"
-
-                        if selected_voice == "random":
-                            num = randint(0, len(available_voices) - 1)
-                            selected_voice = available_voices[num]
-
-                        if self.voice_language == "ru":
-                            return self.silero_model.apply_tts(
-                                ssml_text=text,
-                                speaker=selected_voice,
-                                sample_rate=SAMPLE_RATE,
-                                put_accent=self.add_accents,
-                                put_yo=True,
-                                put_stress_homo=True,
-                                put_yo_homo=True,
-                            )
-                        else:
-                            return self.silero_model.apply_tts(
-                                ssml_text=text,
-                                speaker=selected_voice,
-                                sample_rate=SAMPLE_RATE,
-                                put_accent=self.add_accents,
-                            )
+                audio = self.apply_tts(text, speaker, voice_language, add_accents)
+                if audio is None:
+                    return None
+                if hasattr(audio, "cpu"):
+                    audio = audio.cpu().numpy()
+                return self.tts_cache.put(cache_key, audio)
 
             else:
                 self.add_sys_message(
@@ -2644,21 +3359,75 @@ class MainWindow(QMainWindow):
 
         return audio
 
-    def speak(self, text, is_donate=False):
-        """Main TTS method"""
-        logger.debug("speak(): %s", text)
+    def speak(self, item: SpeechItem, admit=None):
+        """Main TTS method.
+
+        The item is queued as text and rendered just in time by a render
+        worker, so settings changed meanwhile still apply to it. With
+        ``admit`` the synthesis is speculative: it starts right away,
+        ``admit(False)`` returns None until the decision is known,
+        ``admit(True)`` blocks for it, and the item is queued only if it
+        returns True.
+        """
+        logger.debug("speak(): %s", item.text)
+        if admit is None:
+            self._enqueue_speech(item)
+            return True
+        return self.render_speech(item, admit=admit)
+
+    def render_speech(self, item: SpeechItem, admit=None):
+        """Synthesize an item chunk by chunk while the player is already speaking"""
+        logger.debug("render_speech(): %s", item.text)
+        item.is_rendering = True
+        if item.trace is not None:
+            item.trace.mark("rendering")
+        is_queued = admit is None
+        rendered_seconds = 0.0
         try:
-            audio = self.text_to_speech(text)
-            if audio is None:
-                return False
-            audio_numpy = self.postprocess_audio(audio)
-            if len(audio_numpy) > 0:
-                if is_donate:
-                    self._put_donation_audio_latest(audio_numpy)
-                else:
-                    self._put_audio_latest(audio_numpy)
-                return True
-            return False
+            ssml_chunks = self.cleaned_text_to_ssml_chunks(
+                item.platform, item.author, item.text, is_donate=item.is_donate
+            )
+            voice_language = self.voice_language
+            add_accents = self.add_accents
+            speaker = self._select_voice(ssml_chunks[0], voice_language, add_accents)
+            for chunk in ssml_chunks:
+                if item.cancelled or self._stop_event.is_set():
+                    break
+                if not is_queued and admit(False) is False:
+                    with self.stats_lock:
+                        self.messages_stats["speculative_saved_count"] += 1
+                    break
+                audio = self.text_to_speech(
+                    chunk,
+                    speaker=speaker,
+                    voice_language=voice_language,
+                    add_accents=add_accents,
+                )
+                if audio is None:
+                    break
+                audio_numpy = self.postprocess_audio(audio)
+                if len(audio_numpy) == 0:
+                    continue
+                if not is_queued and not admit(True):
+                    with self.stats_lock:
+                        self.messages_stats["speculative_wasted_count"] += 1
+                        self.messages_stats["speculative_wasted_seconds"] += (
+                            len(audio_numpy) / SAMPLE_RATE
+                        )
+                    item.cancel()
+                    break
+                item.push(audio_numpy)
+                if item.trace is not None:
+                    item.trace.mark_once("synthesized")
+                rendered_seconds += len(audio_numpy) / SAMPLE_RATE
+                if not is_queued:
+                    self._enqueue_speech(item)
+                    is_queued = True
+            if not item.cancelled and rendered_seconds:
+                self.speech_estimator.observe(
+                    item.text_length, voice_language, self.speech_rate, rendered_seconds
+                )
+            return is_queued
 
         except Exception as e:
             self.add_sys_message(
@@ -2666,112 +3435,307 @@ class MainWindow(QMainWindow):
                 text=f"{_(self.language, 'Audio playback error')}. {translate_text(str(e), self.language)}",
                 status="error",
             )
-            return False
+            return is_queued
+        finally:
+            item.close()
+            if not is_queued:
+                item.cancel()
+            if admit is not None:
+                # Rejected messages must be counted even if synthesis failed
+                admit(True)
+
+    def _enqueue_speech(self, item: SpeechItem):
+        logger.debug("_enqueue_speech(): %s", item.tier)
+        if item.trace is not None:
+            item.trace.mark("enqueued")
+        item.estimated_seconds = self.speech_estimator.estimate(
+            item.text_length, self.voice_language, self.speech_rate
+        )
+        for dropped_item in self.speech_scheduler.put(item, item.tier):
+            dropped_item.cancel()
+        if item.tier == "regular":
+            self._shed_backlog()
+        self._notify_audio_ready()
+
+    def projected_wait_seconds(self):
+        """Seconds until a message queued now would start playing"""
+        with self.audio_ready:
+            items = list(self.playback_queue)
+        items.extend(self.speech_scheduler.items())
+        return self.audio_player.buffered_seconds() + sum(
+            item.estimated_seconds + self.speech_delay for item in items
+        )
 
-    def _put_donation_audio_latest(self, audio_numpy):
-        logger.debug("_put_donation_audio_latest()")
-        while True:
-            try:
-                self.donation_audio_queue.put_nowait(audio_numpy)
-                return
-            except Full:
-                try:
-                    self.donation_audio_queue.get_nowait()
-                except Empty:
-                    continue
+    def _shed_backlog(self):
+        """Drop the oldest regular messages while the projected wait is over budget"""
+        if not self.max_backlog_seconds:
+            return
+        backlog = self.projected_wait_seconds()
+        shed_count = 0
+        while (
+            backlog > self.max_backlog_seconds
+            and self.speech_scheduler.depth("regular") > 1
+        ):
+            item = self.speech_scheduler.drop_oldest("regular")
+            if item is None:
+                break
+            item.cancel()
+            backlog -= item.estimated_seconds + self.speech_delay
+            shed_count += 1
+        if shed_count:
+            with self.stats_lock:
+                self.messages_stats["shed_count"] += shed_count
+
+    def purge_messages(self, platform, connection_token=None, author=None, msg_id=None):
+        """Drop pending speech of a deleted message, of an author or of a whole chat.
+
+        Messages still waiting for processing are caught when they are
+        picked up; queued, rendering and playing speech is found through the
+        speech index. Author and chat purges only touch the connection that
+        reported them; a ban passes no connection and purges the author on
+        every open one.
+        """
+        now = monotonic()
+        with self.message_state_lock:
+            if msg_id:
+                self.deleted_messages.add(f"{connection_token}:{msg_id}")
+                keys = [("message", connection_token, platform, str(msg_id))]
+            else:
+                if connection_token is None:
+                    tokens = [
+                        token
+                        for token in self._active_connection_tokens.values()
+                        if token is not None
+                    ]
+                else:
+                    tokens = [connection_token]
+                purge_key = f"{platform}:{author}" if author else platform
+                self._purged_before = {
+                    k: purged_at
+                    for k, purged_at in self._purged_before.items()
+                    if now - purged_at < DEDUP_WINDOW_SECONDS
+                }
+                keys = []
+                for token in tokens:
+                    self._purged_before[(token, purge_key)] = now
+                    keys.append(
+                        ("author", token, purge_key)
+                        if author
+                        else ("platform", token, platform)
+                    )
+            items = set()
+            for key in keys:
+                items |= self.speech_index.pop(key)
+        self._drop_purged_speech(items)
+
+    def _is_purged(self, platform, platform_author, msg_id, received_at, token):
+        """Whether a message was removed before it was spoken; needs message_state_lock"""
+        if platform_author in self.banned_set:
+            return True
+        if f"{token}:{msg_id}" in self.deleted_messages:
+            return True
+        if token is not None and not self._is_active_connection_token(platform, token):
+            return True
+        for purge_key in (platform_author, platform):
+            purged_at = self._purged_before.get((token, purge_key))
+            if purged_at is not None and received_at <= purged_at:
+                return True
+        return False
 
-    def _put_audio_latest(self, audio_numpy):
-        logger.debug("_put_audio_latest()")
-        while True:
-            try:
-                self.audio_queue.put_nowait(audio_numpy)
-                return
-            except Full:
-                try:
-                    self.audio_queue.get_nowait()
-                except Empty:
-                    continue
+    def _track_speech_item(self, item: SpeechItem) -> bool:
+        """Index an item for purges unless it was purged while being processed"""
+        item.on_finish = self._forget_speech_item
+        with self.message_state_lock:
+            if self._is_purged(
+                item.platform,
+                item.author_key,
+                item.msg_id,
+                item.received_at,
+                item.connection_token,
+            ):
+                return False
+            self.speech_index.add(item)
+        return True
 
-    def play_audio(self, audio_to_play):
+    def _forget_speech_item(self, item: SpeechItem):
+        with self.message_state_lock:
+            self.speech_index.discard(item)
+
+    def _drop_purged_speech(self, items):
+        if not items:
+            return
+        self.speech_scheduler.remove(items)
+        with self.audio_ready:
+            kept = [item for item in self.playback_queue if item not in items]
+            self.playback_queue.clear()
+            self.playback_queue.extend(kept)
+            self.audio_ready.notify_all()
+        current_item = self._current_speech_item
+        for item in items:
+            item.cancel()
+        if current_item in items:
+            self.audio_player.clear()
+        with self.stats_lock:
+            self.messages_stats["purged_count"] += len(items)
+        self.on_change_stats()
+
+    def play_audio(self, audio_to_play, dequeued_at=None, on_start=None):
         logger.debug("play_audio()")
         try:
-            self._set_audio_indicator("🔴")
-
-            with sd.OutputStream(
-                samplerate=SAMPLE_RATE,
-                channels=1 if audio_to_play.ndim == 1 else audio_to_play.shape[1],
-                dtype="float32",
-                blocksize=0,
-                latency="high",
-            ) as stream:
-                stream.write(audio_to_play)
-
-            # sd.play(audio_to_play, device=sd.default.device, blocking=True, samplerate=SAMPLE_RATE, latency="high")
-            # sd.wait()
+            if audio_to_play.ndim == 2:
+                audio_to_play = audio_to_play.mean(axis=1)
+            return self.audio_player.write_clip(
+                audio_to_play, dequeued_at, on_start=on_start
+            )
         except Exception as e:
             self.add_sys_message(
                 author="play_audio()",
                 text=f"{_(self.language, 'Audio playback error')}. {translate_text(str(e), self.language)}",
                 status="error",
             )
-        finally:
-            self._set_audio_indicator("🟢")
+            return False
+
+    def _on_clip_start(self, clip_id):
+        self._set_audio_indicator("🔴")
+
+    def _on_clip_end(self, clip_id, completed):
+        self._set_audio_indicator("🟢")
+
+    def _on_message_played(self, trace, completed):
+        """Count the message as spoken once its last clip has been played"""
+        if not completed:
+            return
+        with self.stats_lock:
+            self.messages_stats["spoken_count"] += 1
+        if trace is not None:
+            trace.mark("playback_end")
+        self.on_change_stats()
+
+    def _notify_audio_ready(self):
+        with self.audio_ready:
+            self.audio_ready.notify_all()
+
+    def _has_pending_audio(self):
+        return self.speech_scheduler.has_pending()
+
+    def _pop_pending_speech(self):
+        return self.speech_scheduler.pop()
+
+    def _wait_render(self, worker_idx=0):
+        """Block until the player's lookahead has room for another item.
+
+        Items are moved to the playback queue in order before rendering
+        starts, so parallel render workers never reorder messages. Stale
+        items are dropped here, before any model is invoked.
+        """
+        with self.audio_ready:
+            while not self._stop_event.is_set():
+                if worker_idx >= self.tts_replicas:
+                    return None
+                if (
+                    not self.is_paused
+                    and len(self.playback_queue) < max(1, self.tts_replicas)
+                    and self._has_pending_audio()
+                ):
+                    item = self._pop_pending_speech()
+                    if item is None:
+                        continue
+                    if item.is_stale():
+                        item.cancel()
+                        with self.stats_lock:
+                            self.messages_stats["stale_count"] += 1
+                        self.on_change_stats()
+                        continue
+                    self.playback_queue.append(item)
+                    self.audio_ready.notify_all()
+                    return item
+                self.audio_ready.wait()
+            return None
+
+    def _wait_audio(self):
+        """Block until there is an item to play, or return None on shutdown"""
+        with self.audio_ready:
+            while not self._stop_event.is_set() and (
+                self.is_paused or not self.playback_queue
+            ):
+                self.audio_ready.wait()
+            if self._stop_event.is_set():
+                return None
+            item = self.playback_queue.popleft()
+            self.audio_ready.notify_all()
+            return item
+
+    def process_render_loop(self, worker_idx=0):
+        logger.debug("process_render_loop()")
+        while not self._stop_event.is_set():
+            item = self._wait_render(worker_idx)
+            if item is None:
+                with self.audio_ready:
+                    # Fewer replicas now; the surplus worker exits
+                    if worker_idx >= self.tts_replicas:
+                        self._render_worker_ids.discard(worker_idx)
+                        return
+                continue
+            if item.is_rendering:
+                continue
+            self.render_speech(item)
 
     def process_audio_loop(self):
         logger.debug("process_audio_loop()")
         """Main loop to process audio queue"""
-        while True:
-            played_message = False
+        while not self._stop_event.is_set():
             try:
-                if self.is_paused:
-                    sleep(0.1)
+                item = self._wait_audio()
+                if item is None:
                     continue
 
-                try:
-                    audio_data = self.donation_audio_queue.get(timeout=0.2)
-                except Empty:
-
-                    try:
-                        audio_data = self.audio_queue.get(timeout=0.2)
-                    except Empty:
-                        continue
-
-                self.play_audio(audio_data)
-                played_message = True
+                self._current_speech_item = item
+                is_played = False
+                for audio_data in item.chunks():
+                    is_played = self.play_audio(
+                        audio_data,
+                        dequeued_at=monotonic(),
+                        on_start=item.mark_audio_started,
+                    )
+                    if not is_played:
+                        item.cancel()
+                        break
+                self._current_speech_item = None
+
+                if is_played:
+                    self.audio_player.mark_end(
+                        partial(self._on_message_played, item.trace)
+                    )
+                    self.audio_player.write_silence(self.speech_delay)
 
-                del audio_data
+                del item
                 gc.collect()
 
-                with self.stats_lock:
-                    self.messages_stats["spoken_count"] += 1
-                self.on_change_stats()
-
             except Exception as e:
                 self.add_sys_message(
                     author="process_audio_loop()",
                     text=f"{_(self.language, 'Audio queue error')}. {translate_text(str(e), self.language)}",
                     status="error",
                 )
-            if played_message:
-                sleep(self.speech_delay)
 
     def process_messages_loop(self):
         logger.debug("process_messages_loop()")
 
         while True:
-            try:
-                try:
-                    msg_data: PlatformMessage = self.process_message_queue.get(
-                        timeout=0.2
-                    )
-                except Empty:
-                    continue
+            msg_data: PlatformMessage | None = self.process_message_queue.get()
+            if msg_data is None or self._stop_event.is_set():
+                return
 
+            try:
                 if not self._is_active_connection_token(
                     msg_data["platform"], msg_data["connection_token"]
                 ):
                     continue
 
+                trace = msg_data["trace"]
+                if trace is not None:
+                    trace.mark("dequeued")
+
                 self.process_chat_message(
                     msg_id=msg_data["msg_id"],
                     platform=msg_data["platform"],
@@ -2783,6 +3747,9 @@ class MainWindow(QMainWindow):
                     is_staff=msg_data["is_staff"],
                     is_owner=msg_data["is_owner"],
                     is_donate=msg_data["is_donate"],
+                    received_at=msg_data["received_at"],
+                    connection_token=msg_data["connection_token"],
+                    trace=trace,
                 )
 
             except Exception as e:
@@ -2792,24 +3759,217 @@ class MainWindow(QMainWindow):
                     status="error",
                 )
 
-            sleep(0.1)
-
     def _open_connection_token(self, platform: str) -> int:
+        self._close_connection_token(platform)
         self._connection_token_seq += 1
         token = self._connection_token_seq
         self._active_connection_tokens[platform] = token
         return token
 
     def _close_connection_token(self, platform: str):
-        self._active_connection_tokens[platform] = None
+        with self.message_state_lock:
+            token = self._active_connection_tokens[platform]
+            self._active_connection_tokens[platform] = None
+            if token is None:
+                return
+            items = self.speech_index.pop(("connection", token))
+        self._drop_purged_speech(items)
 
     def _is_active_connection_token(self, platform: str, token: int) -> bool:
-        return self._active_connection_tokens.get(platform) == token
+        # Replayed messages keep their platform but belong to the replay token
+        return token is not None and token in (
+            self._active_connection_tokens.get(platform),
+            self._active_connection_tokens["replay"],
+        )
+
+    def _chat_message_callback(
+        self, platform: str, connection_token: int, platform_timestamps: bool = True
+    ):
+        def on_msg(
+            msg_id,
+            author,
+            msg,
+            msg_ex=None,
+            avatar_url=None,
+            is_sponsor=False,
+            is_staff=False,
+            is_owner=False,
+            is_donate=False,
+            sent_at=None,
+        ):
+            if not self._is_active_connection_token(platform, connection_token):
+                return
+
+            received_at = monotonic()
+            trace = self.latency_tracer.start(
+                msg_id,
+                platform,
+                received_at,
+                # A replay would report how old the recording is
+                sent_at if platform_timestamps else None,
+            )
+            self.process_message_queue.put_nowait(
+                PlatformMessage(
+                    msg_id=msg_id,
+                    platform=platform,
+                    author=author,
+                    message=msg,
+                    message_ex=msg_ex,
+                    avatar_url=avatar_url,
+                    connection_token=connection_token,
+                    is_sponsor=is_sponsor,
+                    is_staff=is_staff,
+                    is_owner=is_owner,
+                    is_donate=is_donate,
+                    received_at=received_at,
+                    trace=trace,
+                )
+            )
+
+        return on_msg
+
+    def _chat_purge_callback(self, platform: str, connection_token: int):
+        def on_purge(author=None, msg_id=None):
+            if not self._is_active_connection_token(platform, connection_token):
+                return
+            self.purge_messages(
+                platform, connection_token, author=author, msg_id=msg_id
+            )
+
+        return on_purge
+
+    # === Chat recording ===
+
+    def _record_chat_event(self, source: str, data):
+        if not self.record_chat:
+            return
+        recorder = self.chat_recorder
+        if recorder is None:
+            with self._chat_recorder_lock:
+                recorder = self.chat_recorder
+                if recorder is None and self.record_chat:
+                    path = os.path.join(
+                        get_chat_recordings_path(),
+                        f"chat_{datetime.now():%Y%m%d_%H%M%S}{RECORDING_SUFFIX}",
+                    )
+                    try:
+                        recorder = self.chat_recorder = ChatRecorder(path)
+                    except Exception as e:
+                        self.record_chat = False
+                        self.add_sys_message(
+                            author="ChatRecorder",
+                            text=f"{_(self.language, 'Chat recording error')}. {translate_text(str(e), self.language)}",
+                            status="error",
+                        )
+                        return
+        if recorder is not None:
+            recorder.record(source, data)
+
+    def _close_chat_recorder(self):
+        with self._chat_recorder_lock:
+            recorder = self.chat_recorder
+            self.chat_recorder = None
+        if recorder is not None:
+            recorder.close()
+            self.add_sys_message(
+                author="ChatRecorder",
+                text=f"{_(self.language, 'Chat recording saved')}: {recorder.path} ({recorder.count})",
+                status="success",
+            )
+
+    def on_replay_chat_action(self, speed: float):
+        path, __ = QFileDialog.getOpenFileName(
+            self,
+            _(self.language, "Replay recording"),
+            get_chat_recordings_path(),
+            f"Chat recording (*{RECORDING_SUFFIX})",
+        )
+        if path:
+            self.start_chat_replay(path, speed)
+
+    def start_chat_replay(self, path: str, speed: float = 1.0) -> ChatReplay:
+        """Feed a recording through the Twitch and YouTube parsing code"""
+        self.stop_chat_replay()
+        connection_token = self._open_connection_token("replay")
+
+        on_msg = self._chat_message_callback(
+            "twitch", connection_token, platform_timestamps=False
+        )
+        twitch = TwitchChatListener(
+            client_id=str(self.twitch_credentials.get("client_id") or ""),
+            access=str(self.twitch_credentials.get("access") or ""),
+            refresh="",
+            nickname="",
+            channel="",
+            on_connect=lambda: None,
+            on_disconnect=lambda: None,
+            on_error=lambda err: None,
+            on_message=on_msg,
+            on_purge=self._chat_purge_callback("twitch", connection_token),
+            on_reconnect=lambda: None,
+            on_expiries_access=lambda access, refresh: None,
+            on_expiries_refresh=lambda: None,
+            lang=self.language,
+            avatar_cache_path=get_twitch_avatar_cache_path(),
+        )
+        youtube = YouTubeChatParser(
+            url="",
+            on_message=self._chat_message_callback(
+                "youtube", connection_token, platform_timestamps=False
+            ),
+            on_connect=lambda: None,
+            on_disconnect=lambda: None,
+            on_reconnect=lambda: None,
+            on_error=lambda err: None,
+            lang=self.language,
+        )
+
+        def on_finish(replay: ChatReplay):
+            twitch.avatar_resolver.stop()
+            self._run_on_ui_thread(self._on_chat_replay_finished, replay)
+
+        self.chat_replay = ChatReplay(
+            path,
+            handlers={
+                "twitch": twitch.handle_line,
+                "youtube": lambda data: youtube.emit_items([from_record_data(data)]),
+            },
+            speed=speed,
+            on_finish=on_finish,
+        )
+        self.add_sys_message(
+            author="ChatReplay",
+            text=f"{_(self.language, 'Replay started')}: {os.path.basename(path)}",
+            status="success",
+        )
+        # The listener is never run(), so its avatar lookups start here
+        twitch.avatar_resolver.start()
+        self.chat_replay.run()
+        return self.chat_replay
+
+    def stop_chat_replay(self):
+        replay = self.chat_replay
+        self.chat_replay = None
+        if replay is not None:
+            replay.stop()
+        # Also drops speech left over from a replay that already finished
+        self._close_connection_token("replay")
+
+    def _on_chat_replay_finished(self, replay: ChatReplay):
+        if self.chat_replay is not replay:
+            return
+        self.chat_replay = None
+        self.add_sys_message(
+            author="ChatReplay",
+            text=f"{_(self.language, 'Replay finished')}: {replay.count} / {replay.elapsed:.1f} s",
+            status="success",
+        )
 
     def _run_on_ui_thread(self, callback, *args, **kwargs):
         if threading.current_thread() is threading.main_thread():
             return callback(*args, **kwargs)
         self._pending_ui_calls.append((callback, args, kwargs))
+        self._schedule_ui_flush()
 
 
 def message_color(